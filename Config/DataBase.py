@@ -1,9 +1,14 @@
-﻿from flask_sqlalchemy import SQLAlchemy
+﻿from flask import current_app
+from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 import os
+import socket
 import logging
+import time
+import threading
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.exc import OperationalError
+from sqlalchemy import create_engine, event, make_url
+from Utils.pool_stats import QueuePoolInstrumentado, instrumentar_engine
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -11,16 +16,199 @@ logger = logging.getLogger(__name__)
 
 load_dotenv()
 
-db = SQLAlchemy()
+# Backend de base de datos:
+# - 'auto': MySQL si responde (sondeo rápido), si no SQLite local
+# - 'mysql': MySQL sin sondeo (si no está disponible, fallará al usarse)
+# - 'sqlite': SQLite local sin intentar MySQL
+DB_BACKEND = os.getenv("DB_BACKEND", "auto").lower()
+
+# Segundos máximos del sondeo TCP a MySQL en modo 'auto'. Un puerto cerrado
+# responde al instante; este límite solo se agota si el host no contesta.
+DB_PROBE_TIMEOUT = float(os.getenv("DB_PROBE_TIMEOUT", 0.5))
+
+# Pool de conexiones por worker (MySQL). Conexiones simultáneas máximas:
+# DB_POOL_SIZE + DB_MAX_OVERFLOW
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+
+# Segundos que una petición espera por una conexión libre antes de fallar
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+
+# Segundos tras los que una conexión se recicla (menor que el wait_timeout de
+# MySQL y que el límite de inactividad de proxies y balanceadores)
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+
+# Comprobar la conexión antes de prestarla (evita errores por conexiones caídas)
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+# Perfil de rendimiento de SQLite (fallback local), aplicado a cada conexión nueva.
+# WAL deja leer mientras otra conexión escribe; con WAL, synchronous=NORMAL solo
+# sincroniza el disco en los checkpoints y no en cada commit.
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "true").lower() in ("1", "true", "yes")
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", 65536))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 268435456))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+SQLITE_TEMP_STORE = os.getenv("SQLITE_TEMP_STORE", "MEMORY")
+
+# Engine aparte, de solo lectura (query_only), para los endpoints de lectura sobre
+# un archivo SQLite: sus conexiones no compiten en el pool con las de escritura y
+# una escritura accidental falla. Con WAL el rendimiento apenas cambia
+# (Scripts/bench_sqlite.py), por eso es opcional.
+SQLITE_READONLY_READS = os.getenv("SQLITE_READONLY_READS", "false").lower() in ("1", "true", "yes")
+
+# Engines creados al sondear MySQL, pendientes de entregarse a Flask-SQLAlchemy
+_engines_sondeados = {}
+
+def _clave_engine(url):
+    # Sin la query: Flask-SQLAlchemy añade parámetros propios (p. ej. charset)
+    return make_url(url).set(query={}).render_as_string(hide_password=False)
+
+def pragmas_sqlite(solo_lectura=False, perfil=None):
+    """Sentencias PRAGMA del perfil de rendimiento de SQLite."""
+    pragmas = []
+    if SQLITE_TUNING if perfil is None else perfil:
+        pragmas += [
+            f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}",
+            # Negativo: tamaño en KiB en lugar de en páginas
+            f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}",
+            f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}",
+            f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}",
+            f"PRAGMA temp_store={SQLITE_TEMP_STORE}"
+        ]
+    if solo_lectura:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+def aplicar_perfil_sqlite(engine, solo_lectura=False, perfil=None):
+    """Ejecuta los PRAGMA del perfil en cada conexión que abra el engine."""
+    pragmas = pragmas_sqlite(solo_lectura, perfil)
+    if not pragmas:
+        return
+    
+    def configurar(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+    
+    event.listen(engine, 'connect', configurar)
+
+def _sqlite_en_archivo(url):
+    url = make_url(url)
+    return (url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:')
+            and url.query.get('mode') != 'memory')
+
+_lock_lectura = threading.Lock()
+
+def engine_lectura():
+    """
+    Engine de solo lectura (query_only) de la app actual, o None si no aplica.
+    Se crea en el primer uso sobre el mismo archivo que el engine principal,
+    cuya URL ya trae la ruta resuelta por Flask-SQLAlchemy.
+    """
+    if not current_app.config.get('SQLITE_READONLY_READS'):
+        return None
+    engine = current_app.extensions.get('bd_lectura')
+    if engine is None:
+        with _lock_lectura:
+            engine = current_app.extensions.get('bd_lectura')
+            if engine is None:
+                engine = create_engine(db.engine.url)
+                aplicar_perfil_sqlite(engine, solo_lectura=True)
+                instrumentar_engine(engine)
+                current_app.extensions['bd_lectura'] = engine
+    return engine
+
+class SesionConLectura(Session):
+    """
+    Sesión que, marcada con info['solo_lectura'], consulta a través del
+    engine de solo lectura si la app lo tiene activado.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get('solo_lectura'):
+            engine = engine_lectura()
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+class SQLAlchemyReutilizable(SQLAlchemy):
+    """
+    SQLAlchemy que reutiliza el engine con el que se sondeó MySQL en lugar de
+    crear otro: la conexión de prueba queda en el pool para la primera petición.
+    """
+    
+    def _make_engine(self, bind_key, options, app):
+        url = options.get('url')
+        engine = None
+        if bind_key is None and url is not None:
+            engine = _engines_sondeados.pop(_clave_engine(url), None)
+        if engine is None:
+            engine = super()._make_engine(bind_key, options, app)
+            if engine.dialect.name == 'sqlite':
+                aplicar_perfil_sqlite(engine)
+        instrumentar_engine(engine)
+        return engine
+
+db = SQLAlchemyReutilizable(session_options={'class_': SesionConLectura})
 
 # URI de SQLite como fallback
 SQLITE_URI = 'sqlite:///pokemon_local.db'
 
-def get_database_url():
+def opciones_engine(database_url):
     """
-    Intenta construir la URL de MySQL y verificar la conexión.
-    Si falla, retorna la URL de SQLite local.
+    Opciones del engine según el backend. El pool solo se configura en
+    servidores de BD; SQLite conserva el pool que SQLAlchemy elige para él.
+    """
+    if make_url(database_url).get_backend_name() == 'sqlite':
+        return {}
+    return {
+        'poolclass': QueuePoolInstrumentado,
+        'pool_size': DB_POOL_SIZE,
+        'max_overflow': DB_MAX_OVERFLOW,
+        'pool_timeout': DB_POOL_TIMEOUT,
+        'pool_recycle': DB_POOL_RECYCLE,
+        'pool_pre_ping': DB_POOL_PRE_PING
+    }
+
+def _puerto_abierto(host, port, timeout):
+    """
+    Sondeo TCP: descarta en milisegundos un MySQL apagado o inalcanzable.
+    Además de conectar espera el primer byte del saludo que MySQL envía nada
+    más aceptar la conexión, para no confundirlo con un proxy o balanceador
+    que acepta conexiones sin servidor detrás.
+    """
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout) as conexion:
+            return bool(conexion.recv(1))
+    except (OSError, ValueError):
+        return False
+
+def get_database_url(backend=None):
     """
+    Decide el backend y retorna la URL de la base de datos.
+    
+    Si DATABASE_URL está definida se usa tal cual (útil para pruebas). Con
+    DB_BACKEND='auto' primero se comprueba con un sondeo TCP que el puerto de
+    MySQL responde y solo entonces se abre una conexión real (credenciales);
+    el engine de esa conexión se conserva para la app.
+    """
+    database_url = os.getenv('DATABASE_URL')
+    if database_url:
+        return database_url
+    
+    backend = (backend or DB_BACKEND).lower()
+    if backend == 'sqlite':
+        logger.info('→ DB_BACKEND=sqlite: usando SQLite local.')
+        return SQLITE_URI
+    if backend not in ('auto', 'mysql'):
+        raise ValueError(f"DB_BACKEND no válido: {backend}")
+    
     username = os.getenv('DBUSERNAME')
     password = os.getenv('DBPASSWORD')
     host = os.getenv('DBHOST')
@@ -30,20 +218,30 @@ def get_database_url():
     # Si todas las variables de MySQL están configuradas, intentar usar MySQL
     if all([username, password, host, port, database]):
         mysql_uri = f"mysql+mysqlconnector://{username}:{password}@{host}:{port}/{database}"
+        if backend == 'mysql':
+            return mysql_uri
+        
+        inicio = time.perf_counter()
+        if not _puerto_abierto(host, port, DB_PROBE_TIMEOUT):
+            logger.warning(f'⚠ MySQL no responde en {host}:{port} '
+                           f'({(time.perf_counter() - inicio) * 1000:.0f} ms).')
+            logger.warning('→ Usando SQLite local como fallback.')
+            return SQLITE_URI
         
         try:
-            # Probar la conexión a MySQL con timeout
-            test_engine = create_engine(
+            # Probar la conexión (credenciales y base de datos) con timeout
+            engine = create_engine(
                 mysql_uri, 
                 echo=False,
+                **opciones_engine(mysql_uri),
                 connect_args={
                     'connect_timeout': 5,  # Timeout de 5 segundos
                     'connection_timeout': 5
                 }
             )
-            conn = test_engine.connect()
+            conn = engine.connect()
             conn.close()
-            test_engine.dispose()
+            _engines_sondeados[_clave_engine(mysql_uri)] = engine
             logger.info('✓ Conexión a MySQL exitosa.')
             return mysql_uri
         except Exception as e:
@@ -60,20 +258,31 @@ def get_database_url():
 
 def init_db(app):
     """
-    Inicializa la base de datos con Flask-SQLAlchemy.
-    Intenta usar MySQL, si falla usa SQLite local.
+    Inicializa Flask-SQLAlchemy en la app. Si la configuración no trae
+    SQLALCHEMY_DATABASE_URI se elige el backend con get_database_url().
+    
+    No crea las tablas: eso es un paso explícito (crear_esquema, o
+    `flask --app app init-db`), para que arrancar un worker no toque el esquema.
     """
-    database_url = get_database_url()
-    app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+    if 'SQLALCHEMY_DATABASE_URI' not in app.config:
+        app.config['SQLALCHEMY_DATABASE_URI'] = get_database_url()
+    database_url = app.config['SQLALCHEMY_DATABASE_URI']
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', opciones_engine(database_url))
+    # En memoria no: el engine de lectura tendría su propia base de datos vacía
+    app.config['SQLITE_READONLY_READS'] = (app.config.get('SQLITE_READONLY_READS', SQLITE_READONLY_READS)
+                                           and _sqlite_en_archivo(database_url))
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
     db.init_app(app)
-    
+    logger.info(f'✓ Base de datos configurada: {app.config["SQLALCHEMY_DATABASE_URI"].split("://")[0]}')
+
+def crear_esquema(app):
+    """Crea las tablas que falten (no modifica las existentes)."""
     with app.app_context():
         try:
             db.create_all()
-            logger.info(f'✓ Base de datos inicializada correctamente: {database_url.split("://")[0]}')
+            logger.info('✓ Esquema de la base de datos verificado')
         except Exception as e:
-            logger.error(f'✗ Error al inicializar la base de datos: {str(e)}')
+            logger.error(f'✗ Error al crear el esquema de la base de datos: {str(e)}')
             raise
 
 def get_db_session():
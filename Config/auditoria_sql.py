@@ -0,0 +1,23 @@
+"""
+Configuración de la auditoría de sentencias SQL por petición (presupuestos
+por ruta y detección de N+1, ver Utils/auditoria_sql.py).
+Todos los valores pueden sobrescribirse con variables de entorno.
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# off | log. Sin definir: log en desarrollo (FLASK_DEBUG, p. ej. `flask --debug run`)
+# y off en producción, donde registrar el origen de cada sentencia no sale gratis
+SQL_AUDIT = (os.getenv("SQL_AUDIT") or (
+    "log" if os.getenv("FLASK_DEBUG", "").lower() in ("1", "true", "yes") else "off"
+)).lower()
+
+# Veces que debe repetirse la misma forma de sentencia en una petición para
+# avisar de un posible N+1
+SQL_AUDIT_N_PLUS_1 = int(os.getenv("SQL_AUDIT_N_PLUS_1", 5))
+
+# Llamadas del código del proyecto que se guardan como origen de cada sentencia
+SQL_AUDIT_STACK_DEPTH = int(os.getenv("SQL_AUDIT_STACK_DEPTH", 3))
@@ -0,0 +1,14 @@
+"""
+Configuración de las operaciones masivas (carga y asignación de pokémons).
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Número máximo de elementos aceptados en una sola petición masiva
+BULK_MAX_ITEMS = int(os.getenv("BULK_MAX_ITEMS", 100000))
+
+# Filas por cada INSERT multi-fila dentro de la transacción
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", 1000))
@@ -0,0 +1,44 @@
+"""
+Configuración de las cachés en memoria de la API.
+Todos los valores pueden sobrescribirse con variables de entorno.
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Caché de usuarios autenticados (clave: identidad del JWT = email)
+# Número máximo de usuarios distintos guardados por proceso
+USER_CACHE_MAXSIZE = int(os.getenv("USER_CACHE_MAXSIZE", 1024))
+
+# Segundos que un usuario permanece cacheado antes de volver a leerse de la BD.
+# Los cambios de rol, estado o baja hechos con la API se ven al instante en el
+# worker que los confirma y como mucho AUTHZ_EPOCH_SYNC_SECONDS después en los
+# demás (la época de autorización del usuario deja obsoleta su copia). Los que
+# se hagan directamente en la BD, sin pasar por los modelos, no cambian la
+# época: tardan hasta USER_CACHE_TTL segundos en verse en todos los workers
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 60))
+
+# Caché del catálogo de pokémons en PokemonService. Las entradas llevan la
+# versión del catálogo en la clave, así que una escritura en otro worker las
+# deja obsoletas en la siguiente lectura; el TTL solo acota la memoria.
+# POKEMON_CACHE_ENABLED=false la desactiva (lecturas siempre contra la BD)
+POKEMON_CACHE_ENABLED = os.getenv("POKEMON_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Pokémons individuales guardados por proceso (clave: id)
+POKEMON_CACHE_MAXSIZE = int(os.getenv("POKEMON_CACHE_MAXSIZE", 10000))
+
+# Listados guardados por proceso (catálogo completo y páginas por cursor)
+POKEMON_LIST_CACHE_MAXSIZE = int(os.getenv("POKEMON_LIST_CACHE_MAXSIZE", 64))
+
+# Segundos que una entrada del catálogo permanece cacheada
+POKEMON_CACHE_TTL = float(os.getenv("POKEMON_CACHE_TTL", 300))
+
+# Estadísticas agregadas (GET /api/pokemon/stats) guardadas por proceso: una
+# entrada para el catálogo y una por entrenador que las consulte. No caducan
+# por tiempo: la clave incluye las versiones de los datos de los que salen
+POKEMON_STATS_CACHE_MAXSIZE = int(os.getenv("POKEMON_STATS_CACHE_MAXSIZE", 1024))
+
+# Ancho de los intervalos de la distribución de nivel, ataque, defensa y HP
+POKEMON_STATS_BUCKET_WIDTH = int(os.getenv("POKEMON_STATS_BUCKET_WIDTH", 10))
@@ -0,0 +1,42 @@
+"""
+Configuración de la compresión de respuestas (gzip, y brotli o zstd si están instalados).
+Todos los valores pueden sobrescribirse con variables de entorno.
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# COMPRESSION_ENABLED=false desactiva la compresión (p. ej. si ya comprime el proxy)
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Codificaciones en orden de preferencia del servidor cuando el cliente acepta
+# varias con la misma calidad. "br" requiere el paquete brotli y "zstd" el
+# paquete zstandard (opcionales: pip install brotli zstandard); las que no
+# estén instaladas se ignoran
+COMPRESSION_ALGORITHMS = [
+    algoritmo.strip().lower()
+    for algoritmo in os.getenv("COMPRESSION_ALGORITHMS", "zstd,br,gzip").split(",")
+    if algoritmo.strip()
+]
+
+# Respuestas más pequeñas que esto (bytes) se envían sin comprimir: la
+# cabecera y el coste de CPU no compensan
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+
+# Niveles de cada algoritmo (ver Scripts/bench_compresion.py)
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", 6))
+COMPRESSION_BROTLI_LEVEL = int(os.getenv("COMPRESSION_BROTLI_LEVEL", 4))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3))
+
+# Tipos de contenido que se comprimen
+COMPRESSION_MIMETYPES = {
+    mimetype.strip()
+    for mimetype in os.getenv("COMPRESSION_MIMETYPES", "application/json,text/html,text/plain").split(",")
+    if mimetype.strip()
+}
+
+# Variantes ya comprimidas de respuestas con ETag (snapshots del catálogo,
+# páginas, estadísticas) que se reutilizan mientras el cuerpo no cambie
+COMPRESSION_CACHE_MAXSIZE = int(os.getenv("COMPRESSION_CACHE_MAXSIZE", 256))
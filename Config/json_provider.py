@@ -0,0 +1,14 @@
+"""
+Configuración de la serialización JSON de las respuestas.
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Codificador JSON de la app:
+# - 'auto': orjson si está instalado, si no la librería estándar
+# - 'orjson': exige orjson (si falta se avisa y se usa la librería estándar)
+# - 'stdlib': siempre la librería estándar (json)
+JSON_PROVIDER = os.getenv("JSON_PROVIDER", "auto").lower()
@@ -36,6 +36,29 @@ JWT_HEADER_TYPE = "Bearer"
 # Configuración adicional opcional
 JWT_ERROR_MESSAGE_KEY = "message"  # Clave para mensajes de error en respuestas JSON
 
+# Modo de autorización de roles:
+#   "db"     -> los decoradores leen el rol del usuario en la base de datos
+#   "claims" -> el rol se lee del token verificado, sin consultar la BD
+AUTHZ_MODE = os.getenv("AUTHZ_MODE", "db").lower()
+
+# Cada cuántos segundos se sincronizan las épocas de autorización con la BD
+# (solo afecta al modo "claims")
+AUTHZ_EPOCH_SYNC_SECONDS = float(os.getenv("AUTHZ_EPOCH_SYNC_SECONDS", 5))
+
+# Almacén de tokens revocados (logout):
+#   "sql"    -> tabla tokens_revocados, persistente y compartida entre workers
+#   "memory" -> solo en memoria del proceso (se pierde al reiniciar)
+REVOCATION_STORE = os.getenv("REVOCATION_STORE", "sql").lower()
+
+# Cada cuántos segundos cada worker incorpora las revocaciones de los demás
+REVOCATION_SYNC_SECONDS = float(os.getenv("REVOCATION_SYNC_SECONDS", 5))
+
+# Cada cuántos segundos se purgan los tokens revocados ya expirados
+REVOCATION_PURGE_SECONDS = float(os.getenv("REVOCATION_PURGE_SECONDS", 3600))
+
+# Capacidad prevista del filtro de Bloom que evita consultar la BD
+REVOCATION_BLOOM_CAPACITY = int(os.getenv("REVOCATION_BLOOM_CAPACITY", 100000))
+
 def init_jwt(app):
     """
     Inicializa la configuración de JWT en la aplicación Flask.
@@ -52,6 +75,7 @@ def init_jwt(app):
     app.config['JWT_HEADER_NAME'] = JWT_HEADER_NAME
     app.config['JWT_HEADER_TYPE'] = JWT_HEADER_TYPE
     app.config['JWT_ERROR_MESSAGE_KEY'] = JWT_ERROR_MESSAGE_KEY
+    app.config['AUTHZ_MODE'] = AUTHZ_MODE
     
     # Validar que la clave secreta no sea la default en producción
     if JWT_SECRET_KEY == "default-secret-key-change-in-production":
@@ -60,6 +84,7 @@ def init_jwt(app):
     print(f"✓ JWT configurado correctamente")
     print(f"  - Access Token: {JWT_ACCESS_TOKEN_EXPIRES}")
     print(f"  - Refresh Token: {JWT_REFRESH_TOKEN_EXPIRES}")
+    print(f"  - Modo de autorización: {AUTHZ_MODE}")
 
 def get_jwt_config():
     """
@@ -71,5 +96,7 @@ def get_jwt_config():
         'JWT_ACCESS_TOKEN_EXPIRES': str(JWT_ACCESS_TOKEN_EXPIRES),
         'JWT_HEADER_NAME': JWT_HEADER_NAME,
         'JWT_HEADER_TYPE': JWT_HEADER_TYPE,
+        'AUTHZ_MODE': AUTHZ_MODE,
+        'REVOCATION_STORE': REVOCATION_STORE,
         'JWT_SECRET_KEY_CONFIGURED': bool(os.getenv("JWT_SECRET_KEY"))
     }
@@ -0,0 +1,28 @@
+"""
+Configuración del endpoint de métricas en formato Prometheus (/metrics).
+Todos los valores pueden sobrescribirse con variables de entorno.
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# METRICS_ENABLED=false quita el endpoint y deja de medir las peticiones
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Si se define, /metrics exige la cabecera "Authorization: Bearer <token>"
+# (bearer_token en la configuración del scrape de Prometheus)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN") or None
+
+def _limites(variable, defecto):
+    return sorted(float(valor) for valor in (os.getenv(variable) or defecto).split(",") if valor.strip())
+
+# Límites superiores (inclusivos) de los buckets de cada histograma
+METRICS_LATENCY_BUCKETS = _limites(
+    "METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10"
+)
+METRICS_DB_QUERIES_BUCKETS = _limites("METRICS_DB_QUERIES_BUCKETS", "0,1,2,3,5,10,20,50,100")
+METRICS_DB_TIME_BUCKETS = _limites(
+    "METRICS_DB_TIME_BUCKETS", "0.001,0.0025,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1"
+)
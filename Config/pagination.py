@@ -0,0 +1,17 @@
+"""
+Configuración de la paginación de los listados de la API.
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Tamaño de página cuando el cliente no envía `limit`
+PAGE_SIZE_DEFAULT = int(os.getenv("PAGE_SIZE_DEFAULT", 50))
+
+# Tamaño máximo de página que acepta el servidor (valores mayores se recortan)
+PAGE_SIZE_MAX = int(os.getenv("PAGE_SIZE_MAX", 500))
+
+# Filas que se leen de la BD por lote en las respuestas en streaming (?stream=1)
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", 1000))
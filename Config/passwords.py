@@ -0,0 +1,24 @@
+"""
+Configuración del hash de contraseñas.
+Todos los valores pueden sobrescribirse con variables de entorno.
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Algoritmo de hash: 'scrypt' o 'pbkdf2' (pbkdf2:sha256)
+PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "scrypt").lower()
+
+# Coste del algoritmo: parámetro N de scrypt o iteraciones de pbkdf2.
+# Por defecto, los valores por defecto de werkzeug. Al cambiarlo, los hashes
+# existentes se recalculan en el siguiente login correcto de cada usuario.
+PASSWORD_HASH_COST = int(os.getenv("PASSWORD_HASH_COST") or 0) or None
+
+# Verificaciones de contraseña en paralelo por proceso (hilos del ejecutor)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS") or os.cpu_count() or 1)
+
+# Logins que pueden esperar turno además de los que se están verificando. Con
+# el ejecutor lleno el login responde 503 en lugar de ocupar otro hilo del servidor.
+PASSWORD_HASH_QUEUE = int(os.getenv("PASSWORD_HASH_QUEUE") or 4 * PASSWORD_HASH_WORKERS)
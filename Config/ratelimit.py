@@ -0,0 +1,31 @@
+"""
+Configuración del limitador de intentos de login (token bucket).
+Todos los valores pueden sobrescribirse con variables de entorno.
+"""
+import os
+from dotenv import load_dotenv
+
+# Cargar variables de entorno
+load_dotenv()
+
+# LOGIN_RATE_LIMIT=false desactiva el limitador
+LOGIN_RATE_LIMIT = os.getenv("LOGIN_RATE_LIMIT", "true").lower() in ("1", "true", "yes")
+
+# Almacén de los buckets:
+#   "memory" -> diccionario del proceso (cada worker limita por su cuenta)
+#   "sqlite" -> archivo SQLite compartido por los workers de la misma máquina
+LOGIN_RATE_STORE = os.getenv("LOGIN_RATE_STORE", "memory").lower()
+
+# Archivo del almacén "sqlite" (independiente de la BD de la app)
+LOGIN_RATE_SQLITE_PATH = os.getenv("LOGIN_RATE_SQLITE_PATH", "login_rate.db")
+
+# Por email: ráfaga de intentos permitida y segundos para recuperar un intento
+LOGIN_RATE_EMAIL_BURST = int(os.getenv("LOGIN_RATE_EMAIL_BURST", 10))
+LOGIN_RATE_EMAIL_INTERVAL = float(os.getenv("LOGIN_RATE_EMAIL_INTERVAL", 6))
+
+# Por IP: más holgado, una clase entera puede salir por la misma IP (NAT)
+LOGIN_RATE_IP_BURST = int(os.getenv("LOGIN_RATE_IP_BURST", 60))
+LOGIN_RATE_IP_INTERVAL = float(os.getenv("LOGIN_RATE_IP_INTERVAL", 1))
+
+# Claves activas máximas por proceso en el almacén "memory" (se desaloja la más antigua)
+LOGIN_RATE_MAX_KEYS = int(os.getenv("LOGIN_RATE_MAX_KEYS", 100000))
@@ -12,20 +12,33 @@ from flask_jwt_extended import (
     get_jwt_identity,
     get_jwt
 )
-from datetime import timedelta
+from datetime import datetime, timedelta
 from Models.Usuario import Usuario
 from Config.DataBase import db
-from Utils.decorators import profesor_required, get_current_user
+from Utils.decorators import profesor_required, get_current_user, solo_lectura
+from Utils.authz import obtener_epoch
+from Utils.revocation import crear_revocation_store
+from Utils.passwords import VerificacionSaturada
+from Utils.ratelimit import crear_rate_limiter, segundos_retry_after
+from Utils.auditoria_sql import presupuesto_sql
+from Config.ratelimit import LOGIN_RATE_LIMIT
 import re
 
 auth_blueprint = Blueprint('auth', __name__)
 
-# Set para almacenar tokens revocados (en producción usar Redis)
-revoked_tokens = set()
+# Almacén de tokens revocados (ver REVOCATION_STORE en Config/jwt.py)
+revocation_store = crear_revocation_store()
+
+# Limitador de intentos de login por email e IP (ver Config/ratelimit.py)
+login_limiter = crear_rate_limiter()
 
 def validar_token_revocado(jti):
     """Verifica si un token ha sido revocado."""
-    return jti in revoked_tokens
+    return revocation_store.esta_revocado(jti)
+
+def token_revocado(jwt_header, jwt_payload):
+    """Callback `token_in_blocklist_loader` de JWTManager."""
+    return validar_token_revocado(jwt_payload['jti'])
 
 def validar_email(email):
     """Valida el formato de un correo electrónico."""
@@ -33,6 +46,7 @@ def validar_email(email):
     return re.match(patron, email) is not None
 
 @auth_blueprint.route('/register', methods=['POST'])
+@presupuesto_sql(6)
 @jwt_required()
 @profesor_required()
 def register():
@@ -98,6 +112,7 @@ def register():
         return jsonify({"error": f"Error al registrar usuario: {str(e)}"}), 500
 
 @auth_blueprint.route('/login', methods=['POST'])
+@presupuesto_sql(4)
 def login():
     """
     Endpoint para iniciar sesión y obtener tokens JWT.
@@ -126,19 +141,40 @@ def login():
     if not email or not password:
         return jsonify({"error": "Email y contraseña son requeridos"}), 400
     
+    # Antes de consultar la BD y de verificar el hash, que es lo caro
+    if LOGIN_RATE_LIMIT:
+        espera = login_limiter.intentar([('email', email), ('ip', request.remote_addr or '-')])
+        if espera:
+            respuesta = jsonify({"error": "Demasiados intentos de inicio de sesión, reintenta más tarde"})
+            respuesta.headers['Retry-After'] = str(segundos_retry_after(espera))
+            return respuesta, 429
+    
     # Buscar usuario por email
     usuario = Usuario.query.filter_by(email=email).first()
     
-    if not usuario or not usuario.check_password(password):
+    try:
+        password_correcta = usuario is not None and usuario.check_password(password)
+    except VerificacionSaturada:
+        respuesta = jsonify({"error": "Demasiados inicios de sesión simultáneos, reintenta en un momento"})
+        respuesta.headers['Retry-After'] = '1'
+        return respuesta, 503
+    
+    if not password_correcta:
         return jsonify({"error": "Email o contraseña incorrectos"}), 401
     
     if not usuario.activo:
         return jsonify({"error": "Tu cuenta ha sido desactivada"}), 403
     
+    # Hash con parámetros antiguos: se recalcula ahora que se conoce la contraseña
+    if usuario.necesita_rehash():
+        usuario.set_password(password)
+        db.session.commit()
+    
     # Crear claims adicionales para ambos tokens
     additional_claims = {
         "rol": usuario.rol,
-        "nombre": usuario.nombre
+        "nombre": usuario.nombre,
+        "epoch": obtener_epoch(email)
     }
     
     # Crear Access Token (corta duración - 30 minutos)
@@ -163,13 +199,14 @@ def login():
     }), 200
 
 @auth_blueprint.route('/me', methods=['GET'])
+@presupuesto_sql(3)
+@solo_lectura()
 @jwt_required()
 def get_current_user_info():
     """
     Obtiene información del usuario autenticado actual.
     """
-    email = get_jwt_identity()
-    usuario = Usuario.query.filter_by(email=email).first()
+    usuario = get_current_user()
     
     if not usuario:
         return jsonify({"error": "Usuario no encontrado"}), 404
@@ -179,6 +216,7 @@ def get_current_user_info():
     }), 200
 
 @auth_blueprint.route('/refresh', methods=['POST'])
+@presupuesto_sql(4)
 @jwt_required(refresh=True)
 def refresh():
     """
@@ -210,7 +248,8 @@ def refresh():
     # Crear claims con información actualizada del usuario
     additional_claims = {
         "rol": usuario.rol,
-        "nombre": usuario.nombre
+        "nombre": usuario.nombre,
+        "epoch": obtener_epoch(email)
     }
     
     # Generar nuevo access token
@@ -227,6 +266,7 @@ def refresh():
     }), 200
 
 @auth_blueprint.route('/logout', methods=['POST'])
+@presupuesto_sql(3)
 @jwt_required(verify_type=False)  # Acepta tanto access como refresh token
 def logout():
     """
@@ -243,10 +283,11 @@ def logout():
     """
     jti = get_jwt()["jti"]  # JWT ID único del token
     token_type = get_jwt()["type"]  # "access" o "refresh"
+    exp = datetime.utcfromtimestamp(get_jwt()["exp"])  # Pasada esta fecha se puede purgar
     email = get_jwt_identity()
     
     # Agregar token a la lista de revocados
-    revoked_tokens.add(jti)
+    revocation_store.revocar(jti, exp)
     
     return jsonify({
         "message": f"Logout exitoso",
@@ -0,0 +1,24 @@
+"""
+Controlador de métricas para Prometheus.
+Expone en /metrics las latencias, códigos de estado y consultas SQL por ruta
+(ver Utils/metricas.py). No usa JWT: Prometheus no inicia sesión; si se
+define METRICS_TOKEN, el scrape debe enviarlo como Bearer token.
+"""
+import hmac
+from flask import Blueprint, Response, current_app, jsonify, request
+from Config.metricas import METRICS_TOKEN
+
+metricas_blueprint = Blueprint('metricas', __name__)
+
+@metricas_blueprint.route('/metrics', methods=['GET'])
+def metricas():
+    """Métricas del proceso en formato de texto de Prometheus."""
+    token = current_app.config.get('METRICS_TOKEN', METRICS_TOKEN)
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'error': 'Token de métricas no válido'}), 401
+    
+    registro = current_app.extensions.get('metricas')
+    if registro is None:
+        return jsonify({'error': 'Métricas desactivadas'}), 404
+    
+    return Response(registro.exportar(), content_type='text/plain; version=0.0.4; charset=utf-8')
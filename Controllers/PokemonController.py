@@ -5,23 +5,38 @@ Reglas de negocio:
 - PROFESOR: Puede ver todos los pokémons, crear, actualizar y eliminar cualquiera
 - TRAINER: Solo puede ver y eliminar sus pokémons capturados, no puede crear ni actualizar
 """
+import json
+from collections import Counter
 from flask import Blueprint, jsonify, request
 from flask_jwt_extended import jwt_required
 from Services.PokemonService import PokemonService
-from Models.Usuario import Usuario
-from Models.PokemonCapturado import PokemonCapturado
-from Models.Pokemon import Pokemon
+from Services.VersionService import VersionService
+from Services.PokemonCapturadoService import (
+    PokemonCapturadoService, ASIGNADO, POKEMON_NO_ENCONTRADO, ENTRENADOR_NO_ENCONTRADO, DUPLICADO
+)
 from Config.DataBase import db
-from Utils.decorators import profesor_required, get_current_user
+from Utils.decorators import profesor_required, get_current_user, solo_lectura
+from Utils.pagination import parse_paginacion, parse_limit
+from Utils.filtros import parse_filtros
+from Utils.campos import parse_campos
+from Utils.streaming import respuesta_json_stream
+from Utils.etag import con_etag, no_modificado
+from Utils.json_fragmentos import respuesta_json
+from Utils.auditoria_sql import presupuesto_sql
+from Config.pagination import STREAM_BATCH_SIZE
+from Config.bulk import BULK_MAX_ITEMS
 
 pokemon_blueprint = Blueprint('pokemon', __name__)
 pokemon_service = PokemonService()
+captura_service = PokemonCapturadoService()
+version_service = VersionService()
 
 # ============================================================================
 # CREAR POKÉMON (Solo Profesor)
 # ============================================================================
 
 @pokemon_blueprint.route('/pokemon', methods=['POST'])
+@presupuesto_sql(7)
 @jwt_required()
 @profesor_required()
 def create_pokemon():
@@ -40,40 +55,134 @@ def create_pokemon():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# ============================================================================
+# CREAR POKÉMONS EN BLOQUE (Solo Profesor)
+# ============================================================================
+
+def _leer_items_bulk():
+    """
+    Lee el cuerpo de una carga masiva: un array JSON, un objeto con la clave
+    "pokemons" o NDJSON (un pokémon por línea, Content-Type application/x-ndjson).
+    Las líneas NDJSON ilegibles se devuelven como ValueError en su posición.
+    """
+    if request.mimetype == 'application/x-ndjson':
+        items = []
+        for linea in request.get_data(as_text=True).splitlines():
+            if not linea.strip():
+                continue
+            try:
+                items.append(json.loads(linea))
+            except ValueError as e:
+                items.append(ValueError(f"JSON inválido: {e}"))
+        return items
+    
+    data = request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get('pokemons')
+    if not isinstance(data, list):
+        raise ValueError('Se esperaba un array JSON de pokémons o NDJSON')
+    return data
+
+@pokemon_blueprint.route('/pokemon/bulk', methods=['POST'])
+@presupuesto_sql(n_mas_1=False)
+@jwt_required()
+@profesor_required()
+def create_pokemons_bulk():
+    """Crear muchos pokémons en una sola transacción (SOLO PROFESOR)."""
+    try:
+        try:
+            items = _leer_items_bulk()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if not items:
+            return jsonify({'error': 'No se recibió ningún pokémon'}), 400
+        
+        if len(items) > BULK_MAX_ITEMS:
+            return jsonify({'error': f'Máximo {BULK_MAX_ITEMS} pokémons por petición'}), 413
+        
+        resultado = pokemon_service.create_pokemons_bulk(items)
+        status = 201 if resultado['creados'] else 400
+        
+        return jsonify({
+            'message': f"{resultado['creados']} pokémons creados",
+            'total_recibidos': len(items),
+            'creados': resultado['creados'],
+            'errores': resultado['errores']
+        }), status
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ============================================================================
 # OBTENER TODOS LOS POKÉMONS
 # ============================================================================
 
 @pokemon_blueprint.route('/pokemon', methods=['GET'])
+@presupuesto_sql(5)
+@solo_lectura()
 @jwt_required()
 def get_all_pokemons():
-    """Obtener pokémons según el rol del usuario."""
+    """
+    Obtener pokémons según el rol del usuario, paginados por cursor.
+    
+    Query params:
+        limit: tamaño de página (se recorta al máximo del servidor)
+        cursor: valor `next_cursor` de la página anterior
+        stream: si es 1/true se devuelve el listado completo en streaming
+        tipo, nombre, nivel_min/max, poder_ataque_min/max, poder_defensa_min/max,
+        hp_min/max: filtros (ver Utils/filtros.py); el trainer filtra su colección
+        fields: campos del pokémon a incluir, p. ej. id,nombre,tipo (ver Utils/campos.py)
+    
+    Con If-None-Match y un ETag vigente responde 304 sin consultar los datos.
+    """
     try:
         usuario = get_current_user()
         
         if not usuario:
             return jsonify({'error': 'Usuario no encontrado'}), 404
         
+        etag = version_service.etag_para(usuario)
+        no_modificada = no_modificado(etag)
+        if no_modificada:
+            return no_modificada
+        
+        try:
+            filtros = parse_filtros(request.args)
+            campos = parse_campos(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if request.args.get('stream', '').lower() in ('1', 'true'):
+            return con_etag(_listado_en_streaming(usuario, filtros, campos), etag)
+        
+        try:
+            ultimo_id, limit = parse_paginacion(request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         if usuario.rol == 'profesor':
             # El profesor ve todos los pokémons
-            pokemons = pokemon_service.get_all_pokemons()
-            return jsonify({
+            pokemons, next_cursor = pokemon_service.get_pokemons_page_json(ultimo_id, limit, filtros, campos)
+            return con_etag(respuesta_json({
                 'rol': 'profesor',
                 'total': len(pokemons),
-                'pokemons': pokemons
-            }), 200
+                'pokemons': pokemons,
+                'paginacion': {'limit': limit, 'next_cursor': next_cursor}
+            }), etag), 200
         
         elif usuario.rol == 'trainer':
             # El trainer solo ve sus pokémons capturados
-            capturas = PokemonCapturado.query.filter_by(usuario_id=usuario.id).all()
-            pokemons_capturados = [captura.to_dict() for captura in capturas]
+            pokemons_capturados, next_cursor = captura_service.get_capturas_page_json(
+                usuario.id, ultimo_id, limit, filtros, campos
+            )
             
-            return jsonify({
+            return con_etag(respuesta_json({
                 'rol': 'trainer',
                 'entrenador': usuario.nombre,
                 'total_capturados': len(pokemons_capturados),
-                'pokemons_capturados': pokemons_capturados
-            }), 200
+                'pokemons_capturados': pokemons_capturados,
+                'paginacion': {'limit': limit, 'next_cursor': next_cursor}
+            }), etag), 200
         
         else:
             return jsonify({'error': 'Rol de usuario no válido'}), 403
@@ -81,49 +190,182 @@ def get_all_pokemons():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _listado_en_streaming(usuario, filtros=None, campos=None):
+    """Listado completo emitido por trozos mientras se leen las filas por lotes."""
+    if usuario.rol == 'profesor':
+        return respuesta_json_stream(
+            {'rol': 'profesor'}, 'pokemons',
+            pokemon_service.iter_pokemons(STREAM_BATCH_SIZE, filtros, campos),
+            clave_total='total', tam_lote=STREAM_BATCH_SIZE
+        )
+    
+    if usuario.rol == 'trainer':
+        return respuesta_json_stream(
+            {'rol': 'trainer', 'entrenador': usuario.nombre}, 'pokemons_capturados',
+            captura_service.iter_capturas(usuario.id, STREAM_BATCH_SIZE, filtros, campos),
+            clave_total='total_capturados', tam_lote=STREAM_BATCH_SIZE
+        )
+    
+    return jsonify({'error': 'Rol de usuario no válido'}), 403
+
+# ============================================================================
+# ESTADÍSTICAS AGREGADAS
+# ============================================================================
+
+@pokemon_blueprint.route('/pokemon/stats', methods=['GET'])
+@presupuesto_sql(7)
+@solo_lectura()
+@jwt_required()
+def get_estadisticas():
+    """
+    Estadísticas agregadas: total, pokémons por tipo y mínimo, máximo, media y
+    distribución por intervalos de nivel, ataque, defensa y HP.
+    
+    El profesor las obtiene del catálogo; el trainer, de su colección.
+    Se calculan con agregados SQL y se memorizan hasta la siguiente escritura.
+    """
+    try:
+        usuario = get_current_user()
+        
+        if not usuario:
+            return jsonify({'error': 'Usuario no encontrado'}), 404
+        
+        etag = version_service.etag_para(usuario)
+        no_modificada = no_modificado(etag)
+        if no_modificada:
+            return no_modificada
+        
+        if usuario.rol == 'profesor':
+            return con_etag(respuesta_json({
+                'rol': 'profesor',
+                'estadisticas': pokemon_service.get_estadisticas_json()
+            }), etag), 200
+        
+        elif usuario.rol == 'trainer':
+            return con_etag(respuesta_json({
+                'rol': 'trainer',
+                'entrenador': usuario.nombre,
+                'estadisticas': pokemon_service.get_estadisticas_json(usuario.id)
+            }), etag), 200
+        
+        else:
+            return jsonify({'error': 'Rol de usuario no válido'}), 403
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ============================================================================
+# BUSCAR POKÉMONS POR TEXTO
+# ============================================================================
+
+@pokemon_blueprint.route('/pokemon/search', methods=['GET'])
+@presupuesto_sql(5)
+@solo_lectura()
+@jwt_required()
+def buscar_pokemons():
+    """
+    Búsqueda de texto completo en nombre y descripción, por relevancia.
+    
+    Query params:
+        q: palabras a buscar (todas deben aparecer; la última vale también como
+           prefijo, las anteriores son palabras completas; sin distinguir
+           acentos ni mayúsculas: "psiquico" encuentra "Psíquico")
+        limit: número máximo de resultados
+    
+    El profesor busca en todo el catálogo; el trainer, en su colección.
+    """
+    try:
+        usuario = get_current_user()
+        
+        if not usuario:
+            return jsonify({'error': 'Usuario no encontrado'}), 404
+        if usuario.rol not in ('profesor', 'trainer'):
+            return jsonify({'error': 'Rol de usuario no válido'}), 403
+        
+        etag = version_service.etag_para(usuario)
+        no_modificada = no_modificado(etag)
+        if no_modificada:
+            return no_modificada
+        
+        consulta = request.args.get('q', '')
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            pokemons = pokemon_service.buscar_pokemons_json(
+                consulta, limit, usuario.id if usuario.rol == 'trainer' else None
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return con_etag(respuesta_json({
+            'rol': usuario.rol,
+            'q': consulta,
+            'total': len(pokemons),
+            'pokemons': pokemons
+        }), etag), 200
+    
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 # ============================================================================
 # OBTENER UN POKÉMON ESPECÍFICO
 # ============================================================================
 
 @pokemon_blueprint.route('/pokemon/<int:pokemon_id>', methods=['GET'])
+@presupuesto_sql(6)
+@solo_lectura()
 @jwt_required()
 def get_pokemon(pokemon_id):
-    """Obtener un pokémon específico según el rol."""
+    """
+    Obtener un pokémon específico según el rol (admite If-None-Match).
+    
+    Query params:
+        fields: campos del pokémon a incluir, p. ej. id,nombre,tipo (ver Utils/campos.py)
+    """
     try:
         usuario = get_current_user()
         
         if not usuario:
             return jsonify({'error': 'Usuario no encontrado'}), 404
         
-        pokemon = pokemon_service.get_pokemon_by_id(pokemon_id)
+        etag = version_service.etag_para(usuario)
+        no_modificada = no_modificado(etag)
+        if no_modificada:
+            return no_modificada
         
-        if not pokemon:
-            return jsonify({'error': 'Pokémon no encontrado'}), 404
+        try:
+            campos = parse_campos(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         if usuario.rol == 'profesor':
             # El profesor puede ver cualquier pokémon
-            return jsonify({
+            pokemon = pokemon_service.get_pokemon_json(pokemon_id, campos)
+            
+            if not pokemon:
+                return jsonify({'error': 'Pokémon no encontrado'}), 404
+            
+            return con_etag(respuesta_json({
                 'rol': 'profesor',
                 'pokemon': pokemon
-            }), 200
+            }), etag), 200
         
         elif usuario.rol == 'trainer':
             # Verificar si el trainer ha capturado este pokémon
-            captura = PokemonCapturado.query.filter_by(
-                usuario_id=usuario.id,
-                pokemon_id=pokemon_id
-            ).first()
+            # (la captura trae el pokémon en la misma consulta)
+            captura = captura_service.get_captura_json(usuario.id, pokemon_id, campos)
             
             if not captura:
+                if not pokemon_service.get_pokemon_by_id(pokemon_id):
+                    return jsonify({'error': 'Pokémon no encontrado'}), 404
                 return jsonify({
                     'error': 'No has capturado este Pokémon',
                     'mensaje': f'El Pokémon con ID {pokemon_id} no está en tu colección'
                 }), 403
             
-            return jsonify({
+            return con_etag(respuesta_json({
                 'rol': 'trainer',
-                'pokemon': captura.to_dict()
-            }), 200
+                'pokemon': captura
+            }), etag), 200
         
         else:
             return jsonify({'error': 'Rol de usuario no válido'}), 403
@@ -136,6 +378,7 @@ def get_pokemon(pokemon_id):
 # ============================================================================
 
 @pokemon_blueprint.route('/pokemon/<int:pokemon_id>', methods=['PUT'])
+@presupuesto_sql(11)
 @jwt_required()
 @profesor_required()
 def update_pokemon(pokemon_id):
@@ -161,6 +404,7 @@ def update_pokemon(pokemon_id):
 # ============================================================================
 
 @pokemon_blueprint.route('/pokemon/<int:pokemon_id>', methods=['DELETE'])
+@presupuesto_sql(9)
 @jwt_required()
 def delete_pokemon(pokemon_id):
     """Eliminar pokémon según el rol."""
@@ -180,23 +424,14 @@ def delete_pokemon(pokemon_id):
         
         elif usuario.rol == 'trainer':
             # El trainer solo puede liberar pokémons de su colección
-            captura = PokemonCapturado.query.filter_by(
-                usuario_id=usuario.id,
-                pokemon_id=pokemon_id
-            ).first()
+            pokemon_nombre = captura_service.liberar_pokemon(usuario.id, pokemon_id)
             
-            if not captura:
+            if not pokemon_nombre:
                 return jsonify({
                     'error': 'No puedes liberar este Pokémon',
                     'mensaje': 'Este Pokémon no está en tu colección'
                 }), 403
             
-            # Guardar el nombre del pokémon ANTES de eliminar la captura
-            pokemon_nombre = captura.pokemon.nombre
-            
-            db.session.delete(captura)
-            db.session.commit()
-            
             return jsonify({
                 'message': f'{usuario.nombre} ha liberado el Pokémon de su colección',
                 'pokemon_liberado': pokemon_nombre
@@ -213,7 +448,43 @@ def delete_pokemon(pokemon_id):
 # ASIGNAR POKÉMON A TRAINER (Solo Profesor)
 # ============================================================================
 
+@pokemon_blueprint.route('/pokemon/asignar', methods=['POST'])
+@presupuesto_sql(8)
+@jwt_required()
+@profesor_required()
+def asignar_pokemons_en_lote():
+    """
+    El profesor asigna muchos pokémons a muchos trainers en una sola petición.
+    Body: array de {pokemon_id, trainer_email, apodo} u objeto {"asignaciones": [...]}.
+    """
+    try:
+        usuario_profesor = get_current_user()
+        data = request.get_json(silent=True)
+        asignaciones = data.get('asignaciones') if isinstance(data, dict) else data
+        
+        if not isinstance(asignaciones, list) or not asignaciones:
+            return jsonify({'error': 'Se esperaba un array de asignaciones'}), 400
+        
+        if len(asignaciones) > BULK_MAX_ITEMS:
+            return jsonify({'error': f'Máximo {BULK_MAX_ITEMS} asignaciones por petición'}), 413
+        
+        resultados = captura_service.asignar_pokemons(asignaciones)
+        resumen = Counter(resultado['estado'] for resultado in resultados)
+        
+        return jsonify({
+            'message': f"{resumen[ASIGNADO]} pokémons asignados",
+            'profesor': usuario_profesor.nombre,
+            'total_recibidos': len(asignaciones),
+            'resumen': dict(resumen),
+            'resultados': resultados
+        }), 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @pokemon_blueprint.route('/pokemon/<int:pokemon_id>/asignar', methods=['POST'])
+@presupuesto_sql(6)
 @jwt_required()
 @profesor_required()
 def asignar_pokemon_a_trainer(pokemon_id):
@@ -228,39 +499,27 @@ def asignar_pokemon_a_trainer(pokemon_id):
         if not trainer_email:
             return jsonify({'error': 'Email del entrenador es requerido'}), 400
         
-        pokemon = Pokemon.query.get(pokemon_id)
-        if not pokemon:
+        estado, asignacion = captura_service.asignar_pokemon(
+            pokemon_id, trainer_email, apodo if apodo else None
+        )
+        
+        if estado == POKEMON_NO_ENCONTRADO:
             return jsonify({'error': 'Pokémon no encontrado'}), 404
         
-        trainer = Usuario.query.filter_by(email=trainer_email, rol='trainer').first()
-        if not trainer:
+        if estado == ENTRENADOR_NO_ENCONTRADO:
             return jsonify({'error': 'Entrenador no encontrado'}), 404
         
-        captura_existente = PokemonCapturado.query.filter_by(
-            usuario_id=trainer.id,
-            pokemon_id=pokemon_id
-        ).first()
-        
-        if captura_existente:
+        if estado == DUPLICADO:
             return jsonify({
                 'error': 'El entrenador ya tiene este Pokémon'
             }), 409
         
-        nueva_captura = PokemonCapturado(
-            usuario_id=trainer.id,
-            pokemon_id=pokemon_id,
-            apodo=apodo if apodo else None
-        )
-        
-        db.session.add(nueva_captura)
-        db.session.commit()
-        
         return jsonify({
             'message': f'Pokémon asignado exitosamente',
             'profesor': usuario_profesor.nombre,
-            'entrenador': trainer.nombre,
-            'pokemon': pokemon.nombre,
-            'apodo': apodo if apodo else None
+            'entrenador': asignacion['entrenador'],
+            'pokemon': asignacion['pokemon'],
+            'apodo': asignacion['apodo']
         }), 201
         
     except Exception as e:
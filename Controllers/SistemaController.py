@@ -0,0 +1,46 @@
+"""
+Controlador de estado interno de la API.
+Expone estadísticas de funcionamiento (cachés, etc.) para dimensionar el
+despliegue y verificar cuántas consultas a la base de datos se ahorran.
+"""
+from flask import Blueprint, current_app, jsonify
+from flask_jwt_extended import jwt_required
+from Config.DataBase import db
+from Utils.decorators import profesor_required, usuario_cache
+from Utils.pool_stats import estadisticas_pool
+from Utils.passwords import password_hasher
+from Utils.compresion import variantes_cache
+from Controllers.AuthController import revocation_store, login_limiter
+from Services.PokemonService import pokemon_cache, listados_cache, fragmentos_cache, estadisticas_cache
+
+sistema_blueprint = Blueprint('sistema', __name__)
+
+@sistema_blueprint.route('/estadisticas', methods=['GET'])
+@jwt_required()
+@profesor_required()
+def estadisticas():
+    """Estadísticas internas del proceso actual (SOLO PROFESOR)."""
+    return jsonify({
+        'cache_usuarios': usuario_cache.stats(),
+        'cache_pokemons': pokemon_cache.stats(),
+        'cache_listados': listados_cache.stats(),
+        'cache_fragmentos_json': fragmentos_cache.stats(),
+        'cache_estadisticas': estadisticas_cache.stats(),
+        'tokens_revocados': revocation_store.stats(),
+        'hash_passwords': password_hasher.stats(),
+        'limitador_login': login_limiter.stats(),
+        'pool_bd': estadisticas_pool(db.engine),
+        'compresion': _estadisticas_compresion()
+    }), 200
+
+def _estadisticas_compresion():
+    compresion = current_app.extensions.get('compresion')
+    if compresion is None:
+        return {'activa': False}
+    return {
+        'activa': True,
+        'codificaciones': compresion.codificaciones,
+        'niveles': {c: compresion.niveles[c] for c in compresion.codificaciones},
+        'min_size': compresion.min_size,
+        'variantes_cacheadas': variantes_cache.stats()
+    }
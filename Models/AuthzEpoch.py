@@ -0,0 +1,18 @@
+"""
+Modelo de "época de autorización" por usuario.
+Cada vez que cambia el rol o el estado (activo) de un usuario se incrementa
+su época; los tokens emitidos con una época anterior dejan de ser válidos
+en el modo de autorización por claims.
+"""
+from Config.DataBase import db
+from datetime import datetime
+
+class AuthzEpoch(db.Model):
+    __tablename__ = 'authz_epoch'
+    
+    email = db.Column(db.String(120), primary_key=True)
+    epoch = db.Column(db.Integer, nullable=False, default=0)
+    actualizado = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<AuthzEpoch {self.email} epoch={self.epoch}>'
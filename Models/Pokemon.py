@@ -1,18 +1,44 @@
+from sqlalchemy import text
+from sqlalchemy.orm import validates
 from Config.DataBase import db
+from Models.PokemonTipo import PokemonTipo
+from Utils.texto import tipos_normalizados
 
 class Pokemon(db.Model):
     __tablename__ = 'pokemon'
+    __table_args__ = (
+        # Prefijo de nombre sin distinguir mayúsculas. En SQLite el LIKE solo usa
+        # un índice con COLLATE NOCASE; en MySQL la collation ya es insensible.
+        db.Index('ix_pokemon_nombre', text('nombre COLLATE NOCASE')).ddl_if(dialect='sqlite'),
+        db.Index('ix_pokemon_nombre', 'nombre').ddl_if(callable_=lambda ddl, target, bind, **kw:
+                                                         bind.dialect.name != 'sqlite'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(100), nullable=False)
     tipo = db.Column(db.String(50), nullable=False)
-    nivel = db.Column(db.Integer, nullable=False)
-    poder_ataque = db.Column(db.Float, nullable=False)
-    poder_defensa = db.Column(db.Float, nullable=False)
-    hp = db.Column(db.Integer, nullable=False)
+    nivel = db.Column(db.Integer, nullable=False, index=True)
+    poder_ataque = db.Column(db.Float, nullable=False, index=True)
+    poder_defensa = db.Column(db.Float, nullable=False, index=True)
+    hp = db.Column(db.Integer, nullable=False, index=True)
     descripcion = db.Column(db.Text)
     
-    def to_dict(self):
+    # Tipos individuales normalizados (tabla pokemon_tipo)
+    tipos = db.relationship(PokemonTipo, cascade='all, delete-orphan', lazy=True)
+    
+    @validates('tipo')
+    def _sincronizar_tipos(self, key, tipo):
+        actuales = {pokemon_tipo.tipo: pokemon_tipo for pokemon_tipo in self.tipos}
+        self.tipos = [actuales.get(t) or PokemonTipo(tipo=t) for t in tipos_normalizados(tipo)]
+        return tipo
+    
+    def to_dict(self, campos=None):
+        """
+        Diccionario del pokémon. Con `campos` (ver Utils/campos.py) solo incluye
+        esos atributos, sin tocar los que no se cargaron con load_only.
+        """
+        if campos is not None:
+            return {campo: getattr(self, campo) for campo in campos}
         return {
             'id': self.id,
             'nombre': self.nombre,
@@ -22,4 +48,4 @@ class Pokemon(db.Model):
             'poder_defensa': self.poder_defensa,
             'hp': self.hp,
             'descripcion': self.descripcion
-        }
\ No newline at end of file
+        }
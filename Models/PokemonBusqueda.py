@@ -0,0 +1,79 @@
+"""
+Índices de búsqueda de texto completo sobre pokemon (nombre y descripción).
+
+- SQLite: tabla virtual FTS5 `pokemon_fts` con contenido externo (lee el
+  texto de `pokemon`, solo guarda el índice) y triggers que la mantienen
+  sincronizada en cada INSERT, UPDATE y DELETE, incluida la carga en bloque.
+  El tokenizador unicode61 con remove_diacritics 2 ignora acentos y mayúsculas.
+- MySQL: índice FULLTEXT (nombre, descripcion); con una collation *_ai_ci
+  (la de MySQL 8 por defecto) también ignora acentos.
+
+Se crean con la tabla pokemon (db.create_all). En bases de datos anteriores:
+`flask --app app reindex-busqueda`.
+"""
+from sqlalchemy import DDL, event, inspect, text
+from Config.DataBase import db
+from Models.Pokemon import Pokemon
+
+_tabla = Pokemon.__table__
+
+# Índice FULLTEXT solo en MySQL
+db.Index('ft_pokemon_nombre_descripcion', _tabla.c.nombre, _tabla.c.descripcion,
+         mysql_prefix='FULLTEXT').ddl_if(dialect='mysql')
+
+SENTENCIAS_FTS_SQLITE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS pokemon_fts USING fts5("
+    "nombre, descripcion, content='pokemon', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS pokemon_fts_ai AFTER INSERT ON pokemon BEGIN "
+    "INSERT INTO pokemon_fts (rowid, nombre, descripcion) VALUES (new.id, new.nombre, new.descripcion); END",
+    "CREATE TRIGGER IF NOT EXISTS pokemon_fts_ad AFTER DELETE ON pokemon BEGIN "
+    "INSERT INTO pokemon_fts (pokemon_fts, rowid, nombre, descripcion) "
+    "VALUES ('delete', old.id, old.nombre, old.descripcion); END",
+    "CREATE TRIGGER IF NOT EXISTS pokemon_fts_au AFTER UPDATE OF nombre, descripcion ON pokemon BEGIN "
+    "INSERT INTO pokemon_fts (pokemon_fts, rowid, nombre, descripcion) "
+    "VALUES ('delete', old.id, old.nombre, old.descripcion); "
+    "INSERT INTO pokemon_fts (rowid, nombre, descripcion) VALUES (new.id, new.nombre, new.descripcion); END",
+]
+
+# Resultado de la comprobación de FTS5 por engine (no cambia mientras vive el proceso)
+_fts5_por_engine = {}
+
+def fts5_disponible(conexion):
+    """True si la conexión es SQLite compilado con FTS5."""
+    if conexion.dialect.name != 'sqlite':
+        return False
+    disponible = _fts5_por_engine.get(conexion.engine)
+    if disponible is None:
+        disponible = bool(conexion.exec_driver_sql("SELECT sqlite_compileoption_used('ENABLE_FTS5')").scalar())
+        _fts5_por_engine[conexion.engine] = disponible
+    return disponible
+
+def _si_fts5(ddl, target, bind, **kw):
+    return fts5_disponible(bind)
+
+for _sentencia in SENTENCIAS_FTS_SQLITE:
+    event.listen(_tabla, 'after_create', DDL(_sentencia).execute_if(callable_=_si_fts5))
+
+# Al borrar pokemon el índice FTS se queda huérfano: se borra con ella
+event.listen(_tabla, 'before_drop', DDL("DROP TABLE IF EXISTS pokemon_fts").execute_if(callable_=_si_fts5))
+
+def reconstruir_indice_busqueda(conexion):
+    """
+    Crea el índice de búsqueda si falta y lo reconstruye a partir de la tabla
+    pokemon. Retorna el nombre del índice reconstruido o None si el backend no
+    tiene uno (búsqueda con LIKE).
+    """
+    if fts5_disponible(conexion):
+        for sentencia in SENTENCIAS_FTS_SQLITE:
+            conexion.execute(text(sentencia))
+        conexion.execute(text("INSERT INTO pokemon_fts (pokemon_fts) VALUES ('rebuild')"))
+        return 'pokemon_fts'
+    if conexion.dialect.name == 'mysql':
+        existentes = {indice['name'] for indice in inspect(conexion).get_indexes('pokemon')}
+        if 'ft_pokemon_nombre_descripcion' not in existentes:
+            conexion.execute(text(
+                "ALTER TABLE pokemon ADD FULLTEXT INDEX ft_pokemon_nombre_descripcion (nombre, descripcion)"
+            ))
+        return 'ft_pokemon_nombre_descripcion'
+    return None
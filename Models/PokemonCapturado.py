@@ -7,9 +7,14 @@ from datetime import datetime
 
 class PokemonCapturado(db.Model):
     __tablename__ = 'pokemon_capturado'
+    __table_args__ = (
+        # Un entrenador no puede tener dos veces el mismo pokémon. La restricción
+        # es también el índice compuesto que usa la asignación.
+        db.UniqueConstraint('usuario_id', 'pokemon_id', name='uq_pokemon_capturado_usuario_pokemon'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), nullable=False)
+    usuario_id = db.Column(db.Integer, db.ForeignKey('usuarios.id'), nullable=False, index=True)
     pokemon_id = db.Column(db.Integer, db.ForeignKey('pokemon.id'), nullable=False)
     fecha_captura = db.Column(db.DateTime, default=datetime.utcnow)
     apodo = db.Column(db.String(100))  # Opcional: apodo personalizado
@@ -17,9 +22,14 @@ class PokemonCapturado(db.Model):
     # Relación con Pokemon
     pokemon = db.relationship('Pokemon', backref='capturas', lazy=True)
     
-    def to_dict(self):
-        """Convierte la captura a diccionario con información del pokémon."""
-        pokemon_dict = self.pokemon.to_dict()
+    def to_dict(self, pokemon=None, campos=None):
+        """
+        Convierte la captura a diccionario con información del pokémon.
+        `pokemon` permite pasar la representación del pokémon ya preparada
+        (p. ej. su fragmento JSON cacheado) en lugar de construirla; `campos`
+        limita los campos del pokémon (ver Utils/campos.py).
+        """
+        pokemon_dict = self.pokemon.to_dict(campos) if pokemon is None else pokemon
         return {
             'id': self.id,
             'pokemon': pokemon_dict,
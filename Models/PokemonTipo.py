@@ -0,0 +1,21 @@
+"""
+Tipos individuales de cada pokémon, normalizados (ver Utils/texto.py).
+`Pokemon.tipo` guarda el texto combinado tal cual ("Fuego/Volador"); esta
+tabla guarda una fila por tipo ('fuego', 'volador') para filtrar con índice.
+Se mantiene sincronizada desde Pokemon (al asignar `tipo`) y desde la
+inserción en bloque.
+"""
+from Config.DataBase import db
+
+class PokemonTipo(db.Model):
+    __tablename__ = 'pokemon_tipo'
+    __table_args__ = (
+        # Filtro por tipo + paginación por cursor: WHERE tipo = ? AND pokemon_id > ? ORDER BY pokemon_id
+        db.Index('ix_pokemon_tipo_tipo_pokemon', 'tipo', 'pokemon_id'),
+    )
+    
+    pokemon_id = db.Column(db.Integer, db.ForeignKey('pokemon.id', ondelete='CASCADE'), primary_key=True)
+    tipo = db.Column(db.String(50), primary_key=True)
+    
+    def __repr__(self):
+        return f'<PokemonTipo pokemon_id={self.pokemon_id} tipo={self.tipo}>'
@@ -0,0 +1,17 @@
+"""
+Modelo de tokens JWT revocados (logout).
+Se guarda el `jti` del token y su expiración: pasada esa fecha el token ya no
+sería válido de todos modos y la fila puede purgarse.
+"""
+from Config.DataBase import db
+from datetime import datetime
+
+class TokenRevocado(db.Model):
+    __tablename__ = 'tokens_revocados'
+    
+    jti = db.Column(db.String(36), primary_key=True)
+    exp = db.Column(db.DateTime, nullable=False, index=True)
+    revocado = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    
+    def __repr__(self):
+        return f'<TokenRevocado {self.jti}>'
@@ -3,7 +3,7 @@ Modelo de Usuario para el sistema de autenticación.
 Soporta roles de Profesor y Entrenador (Trainer).
 """
 from Config.DataBase import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from Utils.passwords import password_hasher
 from datetime import datetime
 
 class Usuario(db.Model):
@@ -21,12 +21,16 @@ class Usuario(db.Model):
     pokemons_capturados = db.relationship('PokemonCapturado', backref='entrenador', lazy=True, cascade='all, delete-orphan')
     
     def set_password(self, password):
-        """Hashea y guarda la contraseña."""
-        self.password_hash = generate_password_hash(password)
+        """Hashea y guarda la contraseña (método de Config/passwords.py)."""
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Verifica si la contraseña es correcta."""
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verificar(self.password_hash, password)
+    
+    def necesita_rehash(self):
+        """True si la contraseña se hasheó con un algoritmo o coste distinto al actual."""
+        return password_hasher.necesita_rehash(self.password_hash)
     
     def to_dict(self):
         """Convierte el usuario a diccionario (sin contraseña)."""
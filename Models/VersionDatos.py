@@ -0,0 +1,19 @@
+"""
+Modelo de contadores de versión de los datos servidos por la API.
+Cada escritura del catálogo o de la colección de un entrenador incrementa su
+contador en la misma transacción; las lecturas lo usan para calcular el ETag.
+
+Claves:
+- 'pokemon': catálogo completo
+- 'capturas:<usuario_id>': colección de un entrenador
+"""
+from Config.DataBase import db
+
+class VersionDatos(db.Model):
+    __tablename__ = 'version_datos'
+    
+    clave = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<VersionDatos {self.clave} v{self.version}>'
@@ -1,5 +1,10 @@
 from .Pokemon import Pokemon
+from .PokemonTipo import PokemonTipo
+from .PokemonBusqueda import reconstruir_indice_busqueda
 from .Usuario import Usuario
 from .PokemonCapturado import PokemonCapturado
+from .AuthzEpoch import AuthzEpoch
+from .TokenRevocado import TokenRevocado
+from .VersionDatos import VersionDatos
 
-__all__ = ['Pokemon', 'Usuario', 'PokemonCapturado']
+__all__ = ['Pokemon', 'PokemonTipo', 'Usuario', 'PokemonCapturado', 'AuthzEpoch', 'TokenRevocado', 'VersionDatos']
@@ -0,0 +1,148 @@
+from sqlalchemy import and_, insert, select
+from sqlalchemy.orm import contains_eager, joinedload
+from Models.Pokemon import Pokemon
+from Models.PokemonCapturado import PokemonCapturado
+from Models.Usuario import Usuario
+from Config.DataBase import db
+from Repositories.VersionRepository import VersionRepository, clave_coleccion
+from Repositories.PokemonRepositories import columnas_pokemon, filtrar_pokemons
+
+class PokemonCapturadoRepository:
+    # Toda escritura de una colección incrementa su versión antes del commit (ETag)
+    def __init__(self):
+        self.versiones = VersionRepository()
+    
+    def _cargar_pokemon(self, carga, campos):
+        # Con una selección de campos solo se leen esas columnas del pokémon
+        return carga if campos is None else carga.load_only(*columnas_pokemon(campos))
+    
+    def _query_con_pokemon(self, campos=None):
+        # El pokémon se carga en la misma consulta (JOIN) para que to_dict()
+        # no dispare un SELECT por cada captura.
+        return PokemonCapturado.query.options(
+            self._cargar_pokemon(joinedload(PokemonCapturado.pokemon, innerjoin=True), campos)
+        )
+    
+    def _query_filtrada(self, filtros, campos=None):
+        # Con filtros el JOIN con pokemon es explícito para poder filtrar por
+        # sus columnas; contains_eager carga el pokémon de ese mismo JOIN
+        if not filtros:
+            return self._query_con_pokemon(campos)
+        consulta = (PokemonCapturado.query
+                    .join(PokemonCapturado.pokemon)
+                    .options(self._cargar_pokemon(contains_eager(PokemonCapturado.pokemon), campos)))
+        return filtrar_pokemons(consulta, filtros)
+    
+    def get_capturas_page(self, usuario_id, ultimo_id, limit, filtros=None, campos=None):
+        """Retorna hasta `limit + 1` capturas del entrenador con id mayor que `ultimo_id`."""
+        return (self._query_filtrada(filtros, campos)
+                .filter(PokemonCapturado.usuario_id == usuario_id,
+                        PokemonCapturado.id > ultimo_id)
+                .order_by(PokemonCapturado.id)
+                .limit(limit + 1)
+                .all())
+    
+    def iter_capturas(self, usuario_id, batch_size, filtros=None, campos=None):
+        """Recorre la colección del entrenador leyendo del cursor de la BD por lotes."""
+        return db.session.execute(
+            filtrar_pokemons(
+                select(PokemonCapturado)
+                .join(PokemonCapturado.pokemon)
+                .options(self._cargar_pokemon(contains_eager(PokemonCapturado.pokemon), campos)),
+                filtros
+            )
+            .where(PokemonCapturado.usuario_id == usuario_id)
+            .order_by(PokemonCapturado.id)
+            .execution_options(yield_per=batch_size)
+        ).scalars()
+    
+    def get_captura(self, usuario_id, pokemon_id, campos=None):
+        return self._query_con_pokemon(campos).filter(
+            PokemonCapturado.usuario_id == usuario_id,
+            PokemonCapturado.pokemon_id == pokemon_id
+        ).first()
+    
+    def delete_captura(self, captura):
+        db.session.delete(captura)
+        self.versiones.incrementar([clave_coleccion(captura.usuario_id)])
+        db.session.commit()
+    
+    def resolver_asignacion(self, pokemon_id, trainer_email):
+        """
+        Busca en una sola consulta el pokémon y el entrenador de una asignación.
+        Retorna None si el pokémon no existe; si el entrenador no existe la
+        fila trae `trainer_id` a None.
+        """
+        return db.session.execute(
+            select(Pokemon.id.label('pokemon_id'), Pokemon.nombre.label('pokemon_nombre'),
+                   Usuario.id.label('trainer_id'), Usuario.nombre.label('trainer_nombre'))
+            .select_from(Pokemon)
+            .outerjoin(Usuario, and_(Usuario.email == trainer_email, Usuario.rol == 'trainer'))
+            .where(Pokemon.id == pokemon_id)
+        ).first()
+    
+    def create_captura(self, usuario_id, pokemon_id, apodo=None):
+        """
+        Inserta la captura sin comprobar antes si existe: si está duplicada la
+        restricción única hace fallar el INSERT con IntegrityError.
+        """
+        captura = PokemonCapturado(usuario_id=usuario_id, pokemon_id=pokemon_id, apodo=apodo)
+        db.session.add(captura)
+        self.versiones.incrementar([clave_coleccion(usuario_id)])
+        db.session.commit()
+        return captura
+    
+    def get_pokemons_por_id(self, pokemon_ids, chunk_size):
+        """Retorna {id: nombre} de los pokémons existentes, con consultas IN por bloques."""
+        ids = list(pokemon_ids)
+        nombres = {}
+        for inicio in range(0, len(ids), chunk_size):
+            nombres.update(db.session.execute(
+                select(Pokemon.id, Pokemon.nombre)
+                .where(Pokemon.id.in_(ids[inicio:inicio + chunk_size]))
+            ).all())
+        return nombres
+    
+    def get_trainers_por_email(self, emails, chunk_size):
+        """Retorna {email: (id, nombre)} de los entrenadores existentes, con consultas IN por bloques."""
+        lista = list(emails)
+        trainers = {}
+        for inicio in range(0, len(lista), chunk_size):
+            for email, usuario_id, nombre in db.session.execute(
+                select(Usuario.email, Usuario.id, Usuario.nombre)
+                .where(Usuario.email.in_(lista[inicio:inicio + chunk_size]), Usuario.rol == 'trainer')
+            ):
+                trainers[email] = (usuario_id, nombre)
+        return trainers
+    
+    def get_capturas_existentes(self, usuario_ids, pokemon_ids, chunk_size):
+        """
+        Retorna el conjunto de pares (usuario_id, pokemon_id) ya capturados entre
+        los entrenadores y pokémons dados. Se consulta por bloques de entrenadores.
+        """
+        usuarios = list(usuario_ids)
+        pokemons = list(pokemon_ids)
+        existentes = set()
+        if not usuarios or not pokemons:
+            return existentes
+        for inicio in range(0, len(usuarios), chunk_size):
+            existentes.update(db.session.execute(
+                select(PokemonCapturado.usuario_id, PokemonCapturado.pokemon_id)
+                .where(PokemonCapturado.usuario_id.in_(usuarios[inicio:inicio + chunk_size]),
+                       PokemonCapturado.pokemon_id.in_(pokemons))
+            ).all())
+        return existentes
+    
+    def bulk_create_capturas(self, capturas_data, chunk_size):
+        """
+        Inserta las capturas en bloques de `chunk_size` filas dentro de una única
+        transacción. Si alguna está duplicada falla todo el lote con IntegrityError.
+        """
+        try:
+            for inicio in range(0, len(capturas_data), chunk_size):
+                db.session.execute(insert(PokemonCapturado), capturas_data[inicio:inicio + chunk_size])
+            self.versiones.incrementar([clave_coleccion(captura['usuario_id']) for captura in capturas_data])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
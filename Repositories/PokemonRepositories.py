@@ -1,31 +1,288 @@
+from sqlalchemy import Integer, and_, case, cast, column, func, insert, literal, or_, select, table, union_all
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import load_only
 from Models.Pokemon import Pokemon
+from Models.PokemonTipo import PokemonTipo
+from Models.PokemonCapturado import PokemonCapturado
+from Models.PokemonBusqueda import fts5_disponible, reconstruir_indice_busqueda
 from Config.DataBase import db
+from Repositories.VersionRepository import VersionRepository, CLAVE_CATALOGO
+from Utils.filtros import RANGOS
+from Utils.texto import tipos_normalizados
+
+def _escapar_like(texto):
+    return texto.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+def filtrar_pokemons(consulta, filtros):
+    """
+    Aplica los filtros de Utils/filtros.py a una consulta que ya incluye la
+    tabla pokemon. Cada filtro usa un índice: pokemon_tipo (tipo, pokemon_id),
+    ix_pokemon_nombre para el prefijo y los índices de cada campo numérico.
+    """
+    if not filtros:
+        return consulta
+    if 'tipo' in filtros:
+        consulta = consulta.join(PokemonTipo, PokemonTipo.pokemon_id == Pokemon.id).filter(
+            PokemonTipo.tipo == filtros['tipo']
+        )
+    if 'nombre' in filtros:
+        consulta = consulta.filter(Pokemon.nombre.like(_escapar_like(filtros['nombre']) + '%', escape='\\'))
+    for campo in RANGOS:
+        columna = getattr(Pokemon, campo)
+        if f'{campo}_min' in filtros:
+            consulta = consulta.filter(columna >= filtros[f'{campo}_min'])
+        if f'{campo}_max' in filtros:
+            consulta = consulta.filter(columna <= filtros[f'{campo}_max'])
+    return consulta
+
+# Tabla virtual FTS5 (ver Models/PokemonBusqueda.py). La columna oculta con el
+# nombre de la tabla es la que recibe MATCH y las funciones de ranking.
+_pokemon_fts = table('pokemon_fts', column('rowid'), column('pokemon_fts'))
+
+# Peso del nombre frente a la descripción en el ranking BM25 de SQLite
+PESO_NOMBRE = 10.0
+
+def columnas_pokemon(campos):
+    """Columnas de Pokemon que corresponden a los campos pedidos (ver Utils/campos.py)."""
+    return [getattr(Pokemon, campo) for campo in campos]
+
+def columna_orden(filtros):
+    """
+    Columna del cursor y del ORDER BY. Con filtro de tipo es pokemon_tipo.pokemon_id
+    (mismo valor que pokemon.id): así se recorre el índice (tipo, pokemon_id) en
+    orden en lugar de ordenar todas las coincidencias antes del LIMIT.
+    """
+    return PokemonTipo.pokemon_id if filtros and 'tipo' in filtros else Pokemon.id
+
+# Campos numéricos con mínimo, máximo, media y distribución en las estadísticas
+CAMPOS_ESTADISTICAS = ('nivel', 'poder_ataque', 'poder_defensa', 'hp')
+
+def _indice_intervalo(columna, ancho, dialecto):
+    """floor(columna / ancho) en SQL; SQLite puede no tener floor() compilado."""
+    cociente = columna * 1.0 / ancho
+    if dialecto == 'sqlite':
+        truncado = cast(cociente, Integer)
+        return truncado - case((cociente < truncado, 1), else_=0)
+    return func.floor(cociente)
 
 class PokemonRepository:
+    # Toda escritura del catálogo incrementa su versión antes del commit (ETag)
+    def __init__(self):
+        self.versiones = VersionRepository()
+    
     def create_pokemon(self, pokemon_data):
         pokemon = Pokemon(**pokemon_data)
         db.session.add(pokemon)
+        self.versiones.incrementar([CLAVE_CATALOGO])
         db.session.commit()
         return pokemon
     
+    def bulk_create_pokemons(self, pokemons_data, chunk_size):
+        """
+        Inserta muchos pokémons con INSERT multi-fila por bloques de `chunk_size`
+        dentro de una única transacción (un solo commit).
+        """
+        try:
+            for inicio in range(0, len(pokemons_data), chunk_size):
+                self._insertar_bloque(pokemons_data[inicio:inicio + chunk_size])
+            self.versiones.incrementar([CLAVE_CATALOGO])
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+    
+    def _insertar_bloque(self, bloque):
+        """
+        Inserta un bloque de pokémons con un INSERT multi-fila y después sus
+        filas de pokemon_tipo, que necesitan los ids generados.
+        """
+        dialecto = db.session.get_bind(mapper=Pokemon).dialect
+        if dialecto.insert_executemany_returning:
+            # RETURNING del id junto con el tipo: no depende del orden de las filas
+            # devueltas, que SQLite no garantiza (pedir sort_by_parameter_order
+            # obligaría a SQLAlchemy a insertar fila a fila)
+            filas = db.session.execute(insert(Pokemon).returning(Pokemon.id, Pokemon.tipo), bloque).all()
+        else:
+            # MySQL no tiene RETURNING: se leen de una vez las filas con id mayor
+            # que el último anterior al bloque. En REPEATABLE READ (el nivel por
+            # defecto de InnoDB) las filas de otras transacciones no son visibles,
+            # así que el rango contiene solo las del bloque
+            ultimo_id = db.session.execute(select(func.max(Pokemon.id))).scalar() or 0
+            db.session.execute(insert(Pokemon), bloque)
+            filas = db.session.execute(
+                select(Pokemon.id, Pokemon.tipo).where(Pokemon.id > ultimo_id).order_by(Pokemon.id)
+            ).all()
+        tipos = [{'pokemon_id': pokemon_id, 'tipo': tipo}
+                 for pokemon_id, tipo_combinado in filas for tipo in tipos_normalizados(tipo_combinado)]
+        if tipos:
+            db.session.execute(insert(PokemonTipo), tipos)
+    
+    def reconstruir_tipos(self, chunk_size):
+        """
+        Regenera pokemon_tipo a partir de pokemon.tipo (bases de datos creadas
+        antes de existir la tabla). Retorna el número de pokémons procesados.
+        """
+        db.session.execute(PokemonTipo.__table__.delete())
+        total = 0
+        filas = db.session.execute(select(Pokemon.id, Pokemon.tipo).order_by(Pokemon.id)).all()
+        for inicio in range(0, len(filas), chunk_size):
+            bloque = filas[inicio:inicio + chunk_size]
+            tipos = [{'pokemon_id': fila.id, 'tipo': tipo}
+                     for fila in bloque for tipo in tipos_normalizados(fila.tipo)]
+            if tipos:
+                db.session.execute(insert(PokemonTipo), tipos)
+            total += len(bloque)
+        db.session.commit()
+        return total
+    
+    def buscar_pokemons(self, terminos, limit, usuario_id=None):
+        """
+        Pokémons cuyo nombre o descripción contienen todos los términos, del
+        más al menos relevante. El último término vale también como prefijo
+        (búsqueda mientras se escribe); los anteriores deben ser palabras
+        completas, que en el índice se resuelven mucho más rápido. Con
+        `usuario_id` solo busca en la colección de ese entrenador.
+        """
+        conexion = db.session.connection(bind_arguments={'mapper': Pokemon})
+        if fts5_disponible(conexion):
+            expresion = ' '.join([f'"{termino}"' for termino in terminos[:-1]] + [f'"{terminos[-1]}"*'])
+            rango = func.bm25(_pokemon_fts.c.pokemon_fts, PESO_NOMBRE, 1.0)
+            consulta = (select(Pokemon)
+                        .join(_pokemon_fts, _pokemon_fts.c.rowid == Pokemon.id)
+                        .where(_pokemon_fts.c.pokemon_fts.op('MATCH')(expresion))
+                        .order_by(rango, Pokemon.id))
+        elif conexion.dialect.name == 'mysql':
+            relevancia = match(
+                Pokemon.nombre, Pokemon.descripcion,
+                against=' '.join([f'+{termino}' for termino in terminos[:-1]] + [f'+{terminos[-1]}*'])
+            ).in_boolean_mode()
+            consulta = select(Pokemon).where(relevancia > 0).order_by(relevancia.desc(), Pokemon.id)
+        else:
+            # Sin índice de texto: LIKE '%x%' recorre la tabla entera y no ignora acentos
+            condiciones = [or_(Pokemon.nombre.ilike(f'%{_escapar_like(t)}%', escape='\\'),
+                               Pokemon.descripcion.ilike(f'%{_escapar_like(t)}%', escape='\\'))
+                           for t in terminos]
+            en_nombre = and_(*[Pokemon.nombre.ilike(f'%{_escapar_like(t)}%', escape='\\') for t in terminos])
+            consulta = (select(Pokemon).where(*condiciones)
+                        .order_by(case((en_nombre, 0), else_=1), Pokemon.id))
+        if usuario_id is not None:
+            consulta = consulta.join(PokemonCapturado, PokemonCapturado.pokemon_id == Pokemon.id).where(
+                PokemonCapturado.usuario_id == usuario_id
+            )
+        return db.session.execute(consulta.limit(limit)).scalars().all()
+    
+    def reconstruir_indice_busqueda(self):
+        """Crea (si falta) y reconstruye el índice de texto completo."""
+        indice = reconstruir_indice_busqueda(db.session.connection(bind_arguments={'mapper': Pokemon}))
+        db.session.commit()
+        return indice
+    
+    def estadisticas(self, ancho_intervalo, usuario_id=None):
+        """
+        Agregados del catálogo (o de la colección de `usuario_id`) calculados
+        en la BD con tres consultas, sin cargar filas:
+        
+        - total y mínimo, máximo y media de cada campo de CAMPOS_ESTADISTICAS;
+        - pokémons por tipo, contando cada componente ("Fuego/Volador" suma en
+          fuego y en volador) a partir de pokemon_tipo;
+        - distribución de cada campo en intervalos de `ancho_intervalo`
+          (una sola consulta con UNION ALL).
+        """
+        def en_ambito(consulta, columna_id):
+            if usuario_id is None:
+                return consulta
+            return consulta.join(PokemonCapturado, PokemonCapturado.pokemon_id == columna_id).where(
+                PokemonCapturado.usuario_id == usuario_id
+            )
+        
+        columnas = [func.count(Pokemon.id).label('total')]
+        for campo in CAMPOS_ESTADISTICAS:
+            columna = getattr(Pokemon, campo)
+            columnas += [func.min(columna).label(f'{campo}_min'), func.max(columna).label(f'{campo}_max'),
+                         func.avg(columna).label(f'{campo}_media')]
+        agregados = db.session.execute(en_ambito(select(*columnas), Pokemon.id)).one()._mapping
+        
+        por_tipo = db.session.execute(
+            en_ambito(select(PokemonTipo.tipo, func.count().label('total')), PokemonTipo.pokemon_id)
+            .group_by(PokemonTipo.tipo)
+            .order_by(func.count().desc(), PokemonTipo.tipo)
+        ).all()
+        
+        dialecto = db.session.get_bind(mapper=Pokemon).dialect.name
+        consultas = []
+        for campo in CAMPOS_ESTADISTICAS:
+            intervalo = _indice_intervalo(getattr(Pokemon, campo), ancho_intervalo, dialecto)
+            consultas.append(en_ambito(
+                select(literal(campo).label('campo'), intervalo.label('intervalo'), func.count().label('total')),
+                Pokemon.id
+            ).group_by(intervalo))
+        distribucion = {campo: [] for campo in CAMPOS_ESTADISTICAS}
+        for campo, intervalo, total in db.session.execute(union_all(*consultas)).all():
+            distribucion[campo].append((int(intervalo) * ancho_intervalo, total))
+        
+        resultado = {
+            'total': agregados['total'],
+            'por_tipo': [{'tipo': tipo, 'total': total} for tipo, total in por_tipo]
+        }
+        for campo in CAMPOS_ESTADISTICAS:
+            media = agregados[f'{campo}_media']
+            resultado[campo] = {
+                'min': agregados[f'{campo}_min'],
+                'max': agregados[f'{campo}_max'],
+                'media': round(float(media), 2) if media is not None else None,
+                'distribucion': [{'desde': desde, 'hasta': desde + ancho_intervalo, 'total': total}
+                                 for desde, total in sorted(distribucion[campo])]
+            }
+        return resultado
+    
     def get_all_pokemons(self):
         return Pokemon.query.all()
     
-    def get_pokemon_by_id(self, pokemon_id):
-        return Pokemon.query.get(pokemon_id)
+    def _query(self, campos=None):
+        # Con una selección de campos solo se leen esas columnas de la BD
+        if campos is None:
+            return Pokemon.query
+        return Pokemon.query.options(load_only(*columnas_pokemon(campos)))
+    
+    def get_pokemons_page(self, ultimo_id, limit, filtros=None, campos=None):
+        """Retorna hasta `limit + 1` pokémons con id mayor que `ultimo_id` (keyset)."""
+        orden = columna_orden(filtros)
+        return (filtrar_pokemons(self._query(campos), filtros)
+                .filter(orden > ultimo_id)
+                .order_by(orden)
+                .limit(limit + 1)
+                .all())
+    
+    def iter_pokemons(self, batch_size, filtros=None, campos=None):
+        """Recorre el catálogo ordenado por id leyendo del cursor de la BD por lotes."""
+        consulta = select(Pokemon)
+        if campos is not None:
+            consulta = consulta.options(load_only(*columnas_pokemon(campos)))
+        return db.session.execute(
+            filtrar_pokemons(consulta, filtros)
+            .order_by(columna_orden(filtros))
+            .execution_options(yield_per=batch_size)
+        ).scalars()
+    
+    def get_pokemon_by_id(self, pokemon_id, campos=None):
+        if campos is None:
+            return db.session.get(Pokemon, pokemon_id)
+        return db.session.get(Pokemon, pokemon_id, options=[load_only(*columnas_pokemon(campos))])
     
     def update_pokemon(self, pokemon_id, pokemon_data):
-        pokemon = Pokemon.query.get(pokemon_id)
+        pokemon = db.session.get(Pokemon, pokemon_id)
         if pokemon:
             for key, value in pokemon_data.items():
                 setattr(pokemon, key, value)
+            self.versiones.incrementar([CLAVE_CATALOGO])
             db.session.commit()
         return pokemon
     
     def delete_pokemon(self, pokemon_id):
-        pokemon = Pokemon.query.get(pokemon_id)
+        pokemon = db.session.get(Pokemon, pokemon_id)
         if pokemon:
             db.session.delete(pokemon)
+            self.versiones.incrementar([CLAVE_CATALOGO])
             db.session.commit()
             return True
         return False
\ No newline at end of file
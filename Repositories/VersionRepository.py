@@ -0,0 +1,75 @@
+from flask import g, has_request_context
+from sqlalchemy import select
+from sqlalchemy.dialects import mysql, sqlite
+from Models.VersionDatos import VersionDatos
+from Config.DataBase import db
+
+CLAVE_CATALOGO = 'pokemon'
+
+_tabla = VersionDatos.__table__
+
+def clave_coleccion(usuario_id):
+    """Clave de versión de la colección de un entrenador."""
+    return f'capturas:{usuario_id}'
+
+class VersionRepository:
+    def _memo(self):
+        # Dentro de una petición las versiones se leen una sola vez (el ETag y
+        # la caché del catálogo comparten la misma lectura)
+        if not has_request_context():
+            return {}
+        if 'versiones_datos' not in g:
+            g.versiones_datos = {}
+        return g.versiones_datos
+    
+    def get_versiones(self, claves):
+        """Retorna {clave: versión} con una sola consulta (0 si nunca se ha escrito)."""
+        memo = self._memo()
+        versiones = {clave: memo.get(clave) for clave in claves}
+        pendientes = [clave for clave, version in versiones.items() if version is None]
+        if pendientes:
+            leidas = dict.fromkeys(pendientes, 0)
+            leidas.update(db.session.execute(
+                select(_tabla.c.clave, _tabla.c.version).where(_tabla.c.clave.in_(pendientes))
+            ).all())
+            memo.update(leidas)
+            versiones.update(leidas)
+        return versiones
+    
+    def incrementar(self, claves):
+        """
+        Incrementa las versiones dentro de la transacción en curso (sin commit),
+        para que el cambio de versión y el de los datos se confirmen juntos.
+        Usa un upsert atómico para que dos escrituras simultáneas sobre una
+        clave nueva no choquen con la clave primaria.
+        """
+        filas = [{'clave': clave, 'version': 1} for clave in sorted(set(claves))]
+        if not filas:
+            return
+        memo = self._memo()
+        for fila in filas:
+            memo.pop(fila['clave'], None)
+        dialecto = db.session.get_bind().dialect.name
+        if dialecto == 'sqlite':
+            consulta = sqlite.insert(_tabla)
+            consulta = consulta.on_conflict_do_update(
+                index_elements=[_tabla.c.clave], set_={'version': _tabla.c.version + 1}
+            )
+        elif dialecto in ('mysql', 'mariadb'):
+            consulta = mysql.insert(_tabla).on_duplicate_key_update(version=_tabla.c.version + 1)
+        else:
+            self._incrementar_generico(filas)
+            return
+        db.session.execute(consulta, filas)
+    
+    def _incrementar_generico(self, filas):
+        claves = [fila['clave'] for fila in filas]
+        db.session.execute(
+            _tabla.update().where(_tabla.c.clave.in_(claves)).values(version=_tabla.c.version + 1)
+        )
+        existentes = set(db.session.execute(
+            select(_tabla.c.clave).where(_tabla.c.clave.in_(claves))
+        ).scalars())
+        nuevas = [fila for fila in filas if fila['clave'] not in existentes]
+        if nuevas:
+            db.session.execute(_tabla.insert(), nuevas)
@@ -0,0 +1,30 @@
+-- Índices para bases de datos MySQL creadas con versiones anteriores de la API
+-- (para SQLite, Scripts/add_indexes_sqlite.sql). db.create_all() no modifica
+-- tablas existentes, así que hay que aplicarlos a mano:
+--   python Scripts/execute_sql.py Scripts/add_indexes.sql
+
+-- Paginación por cursor de la colección de cada entrenador (usuario_id, id)
+CREATE INDEX ix_pokemon_capturado_usuario_id ON pokemon_capturado (usuario_id);
+
+-- Una captura por (entrenador, pokémon). Antes se eliminan los duplicados
+-- existentes conservando la captura más antigua.
+DELETE FROM pokemon_capturado
+WHERE id NOT IN (
+    SELECT id FROM (
+        SELECT MIN(id) AS id FROM pokemon_capturado GROUP BY usuario_id, pokemon_id
+    ) AS capturas_unicas
+);
+CREATE UNIQUE INDEX uq_pokemon_capturado_usuario_pokemon ON pokemon_capturado (usuario_id, pokemon_id);
+
+-- Filtros del listado (nivel, estadísticas y prefijo de nombre). La tabla
+-- pokemon_tipo la crea `flask --app app init-db` y se rellena con
+-- `flask --app app reindex-tipos`.
+CREATE INDEX ix_pokemon_nivel ON pokemon (nivel);
+CREATE INDEX ix_pokemon_poder_ataque ON pokemon (poder_ataque);
+CREATE INDEX ix_pokemon_poder_defensa ON pokemon (poder_defensa);
+CREATE INDEX ix_pokemon_hp ON pokemon (hp);
+-- La collation de la columna ya es insensible a mayúsculas, como LIKE
+CREATE INDEX ix_pokemon_nombre ON pokemon (nombre);
+
+-- Búsqueda de texto (GET /api/pokemon/search)
+CREATE FULLTEXT INDEX ft_pokemon_nombre_descripcion ON pokemon (nombre, descripcion);
@@ -0,0 +1,32 @@
+-- Índices para bases de datos SQLite creadas con versiones anteriores de la API
+-- (la versión MySQL está en Scripts/add_indexes.sql). db.create_all() no
+-- modifica tablas existentes, así que hay que aplicarlos a mano:
+--   sqlite3 instance/pokemon_local.db < Scripts/add_indexes_sqlite.sql
+-- Se puede ejecutar más de una vez.
+
+-- Paginación por cursor de la colección de cada entrenador (usuario_id, id)
+CREATE INDEX IF NOT EXISTS ix_pokemon_capturado_usuario_id ON pokemon_capturado (usuario_id);
+
+-- Una captura por (entrenador, pokémon). Antes se eliminan los duplicados
+-- existentes conservando la captura más antigua.
+DELETE FROM pokemon_capturado
+WHERE id NOT IN (
+    SELECT MIN(id) FROM pokemon_capturado GROUP BY usuario_id, pokemon_id
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_pokemon_capturado_usuario_pokemon ON pokemon_capturado (usuario_id, pokemon_id);
+
+-- Filtros del listado (nivel, estadísticas y prefijo de nombre). La tabla
+-- pokemon_tipo la crea `flask --app app init-db` y se rellena con
+-- `flask --app app reindex-tipos`.
+CREATE INDEX IF NOT EXISTS ix_pokemon_nivel ON pokemon (nivel);
+CREATE INDEX IF NOT EXISTS ix_pokemon_poder_ataque ON pokemon (poder_ataque);
+CREATE INDEX IF NOT EXISTS ix_pokemon_poder_defensa ON pokemon (poder_defensa);
+CREATE INDEX IF NOT EXISTS ix_pokemon_hp ON pokemon (hp);
+-- LIKE 'x%' no distingue mayúsculas en SQLite: solo usa un índice NOCASE. Se
+-- recrea por si una versión anterior de este script lo creó sin COLLATE.
+DROP INDEX IF EXISTS ix_pokemon_nombre;
+CREATE INDEX ix_pokemon_nombre ON pokemon (nombre COLLATE NOCASE);
+
+-- Búsqueda de texto (GET /api/pokemon/search): SQLite no tiene FULLTEXT. La
+-- tabla FTS5 y sus triggers los crea `flask --app app reindex-busqueda`, que
+-- también indexa las filas existentes.
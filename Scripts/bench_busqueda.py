@@ -0,0 +1,79 @@
+"""
+Benchmark de la búsqueda de texto: índice FTS5 (PokemonRepository.buscar_pokemons)
+frente a LIKE '%x%' sobre nombre y descripción, en una BD SQLite en archivo.
+
+La BD se genera una vez con `--filas` pokémons (un millón para reproducir el
+caso de producción; tarda un par de minutos) y se reutiliza si ya existe.
+Cada consulta se repite `--repeticiones` veces y se reporta la mediana.
+
+Uso: python Scripts/bench_busqueda.py [--filas 200000] [--repeticiones 20] [--bd bench_busqueda.db]
+"""
+import sys
+import os
+import argparse
+import random
+import statistics
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import func, insert, or_, select
+from app import create_app
+from Config.DataBase import db
+from Models.Pokemon import Pokemon
+from Repositories.PokemonRepositories import PokemonRepository
+from Utils.texto import terminos_busqueda
+
+PALABRAS = ['fuego', 'agua', 'planta', 'eléctrico', 'psíquico', 'dragón', 'hielo', 'roca',
+            'veloz', 'feroz', 'tranquilo', 'nocturno', 'gigante', 'pequeño', 'antiguo', 'brillante']
+CONSULTAS = ['psiquico', 'dragón nocturno', 'Pokémon 123456', 'feroz gigante antiguo', 'inexistente']
+
+def preparar(filas):
+    """Inserta `filas` pokémons con descripciones aleatorias si la tabla está vacía."""
+    if db.session.scalar(select(func.count(Pokemon.id))):
+        return
+    aleatorio = random.Random(0)
+    for inicio in range(0, filas, 10000):
+        db.session.execute(insert(Pokemon), [{
+            'nombre': f'Pokémon {i}', 'tipo': 'Normal', 'nivel': 1 + i % 100,
+            'poder_ataque': 50.0, 'poder_defensa': 40.0, 'hp': 100,
+            'descripcion': ' '.join(aleatorio.sample(PALABRAS, 5))
+        } for i in range(inicio, min(filas, inicio + 10000))])
+    db.session.commit()
+
+def buscar_like(terminos, limit):
+    condiciones = [or_(Pokemon.nombre.ilike(f'%{t}%'), Pokemon.descripcion.ilike(f'%{t}%')) for t in terminos]
+    return db.session.execute(select(Pokemon).where(*condiciones).order_by(Pokemon.id).limit(limit)).scalars().all()
+
+def medir(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+        db.session.expunge_all()
+    return statistics.median(tiempos) * 1000, len(resultado)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=200000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--bd', default='bench_busqueda.db')
+    args = parser.parse_args()
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{os.path.abspath(args.bd)}'})
+    repositorio = PokemonRepository()
+    with app.app_context():
+        db.create_all()
+        preparar(args.filas)
+        total = db.session.scalar(select(func.count(Pokemon.id)))
+        print(f'{total} pokémons, mediana de {args.repeticiones} repeticiones, limit={args.limit}\n')
+        print(f'{"consulta":<24} {"FTS5 ms":>9} {"LIKE ms":>9} {"filas FTS/LIKE":>15}')
+        for consulta in CONSULTAS:
+            terminos = terminos_busqueda(consulta)
+            ms_fts, n_fts = medir(lambda: repositorio.buscar_pokemons(terminos, args.limit), args.repeticiones)
+            ms_like, n_like = medir(lambda: buscar_like(terminos, args.limit), args.repeticiones)
+            print(f'{consulta:<24} {ms_fts:>9.2f} {ms_like:>9.2f} {f"{n_fts}/{n_like}":>15}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark de la compresión de respuestas: CPU frente a ancho de banda.
+
+Para una página del catálogo y para el catálogo completo (mismo JSON que
+genera la API) mide, por codificación y nivel, la razón de compresión, el
+tiempo de CPU de comprimir y el tiempo total estimado de entregar la
+respuesta (CPU + bytes / ancho de banda) en varios enlaces. brotli y zstd
+solo aparecen si sus paquetes están instalados.
+
+Uso: python Scripts/bench_compresion.py [--filas 10000] [--pagina 500] [--repeticiones 5]
+"""
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from Utils.json_provider import crear_json_provider
+from Utils.compresion import codificaciones_disponibles, comprimir
+
+NIVELES = {
+    'gzip': [1, 3, 6, 9],
+    'br': [1, 4, 6, 9, 11],
+    'zstd': [1, 3, 6, 12, 19],
+}
+
+# Enlaces en megabits por segundo
+ENLACES = {'3G (2 Mb/s)': 2, '4G (20 Mb/s)': 20, 'LAN (1 Gb/s)': 1000}
+
+TIPOS = ['Fuego', 'Agua', 'Planta', 'Eléctrico', 'Psíquico/Volador', 'Roca/Tierra', 'Normal']
+
+def generar_json(app, filas):
+    """JSON del listado del profesor con `filas` pokémons, como lo serializa la API."""
+    pokemons = [{
+        'id': i, 'nombre': f'Pokémon {i}', 'tipo': TIPOS[i % len(TIPOS)], 'nivel': 1 + i % 100,
+        'poder_ataque': 40.0 + i % 60, 'poder_defensa': 35.5 + i % 50, 'hp': 50 + i % 200,
+        'descripcion': f'Pokémon de tipo {TIPOS[i % len(TIPOS)].lower()} generado para el benchmark número {i}'
+    } for i in range(1, filas + 1)]
+    with app.app_context():
+        return app.json.dumps({'rol': 'profesor', 'total': filas, 'pokemons': pokemons},
+                              separators=(',', ':')).encode()
+
+def medir(codificacion, datos, nivel, repeticiones):
+    mejor, comprimido = float('inf'), b''
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        comprimido = comprimir(codificacion, datos, nivel)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, len(comprimido)
+
+def informe(nombre, datos, repeticiones):
+    print(f'\n== {nombre}: {len(datos) / 1024:.0f} KiB sin comprimir ==')
+    print(f'{"codificación":<14} {"razón":>6} {"CPU ms":>8} {"MB/s":>7}', end='')
+    for enlace in ENLACES:
+        print(f' {enlace:>14}', end='')
+    print()
+
+    def fila(etiqueta, segundos, tamano):
+        print(f'{etiqueta:<14} {len(datos) / tamano:>6.1f} {segundos * 1000:>8.2f} '
+              f'{len(datos) / segundos / 1e6 if segundos else float("inf"):>7.0f}', end='')
+        for megabits in ENLACES.values():
+            total = segundos + tamano * 8 / (megabits * 1e6)
+            print(f' {total * 1000:>12.1f}ms', end='')
+        print()
+
+    fila('identity', 0.0, len(datos))
+    for codificacion in codificaciones_disponibles(['gzip', 'br', 'zstd']):
+        for nivel in NIVELES[codificacion]:
+            segundos, tamano = medir(codificacion, datos, nivel, repeticiones)
+            fila(f'{codificacion}-{nivel}', segundos, tamano)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=10000)
+    parser.add_argument('--pagina', type=int, default=500)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    app.json = crear_json_provider(app)
+    print(f'Codificaciones disponibles: {", ".join(codificaciones_disponibles(["gzip", "br", "zstd"]))}')
+    informe(f'Página de {args.pagina}', generar_json(app, args.pagina), args.repeticiones)
+    informe(f'Catálogo de {args.filas}', generar_json(app, args.filas), args.repeticiones)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark de los fragmentos JSON precodificados por pokémon.
+
+Para cada tamaño de catálogo mide peticiones por segundo de:
+- serialización del catálogo completo: jsonify de los diccionarios frente a
+  respuesta_json con los fragmentos ya cacheados;
+- GET /api/pokemon?limit=500 y GET /api/pokemon/<id> de punta a punta con el
+  cliente de pruebas, con las cachés del catálogo desactivadas (antes) y
+  activadas (después).
+
+Uso: python Scripts/bench_fragmentos.py [--filas 10000 100000] [--segundos 3]
+"""
+import sys
+import os
+import argparse
+import tempfile
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def _por_segundo(funcion, segundos):
+    """Ejecuta `funcion` durante `segundos` y retorna las llamadas por segundo."""
+    funcion()
+    llamadas = 0
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < segundos:
+        funcion()
+        llamadas += 1
+    return llamadas / (time.perf_counter() - inicio)
+
+def medir(filas, segundos):
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'bench_fragmentos.db')
+        os.environ['DATABASE_URL'] = f'sqlite:///{ruta}'
+        # Que quepa el catálogo entero en la caché de fragmentos
+        os.environ['POKEMON_CACHE_MAXSIZE'] = str(max(filas, 10000))
+        from bench_streaming import preparar_bd
+        preparar_bd(ruta, filas)
+
+        from flask import jsonify
+        from app import app
+        from Config.DataBase import db
+        from Models.Usuario import Usuario
+        from Controllers.PokemonController import pokemon_service, captura_service
+        from Services.PokemonService import fragmento_pokemon, pokemon_cache, listados_cache, fragmentos_cache
+        from Utils.json_fragmentos import respuesta_json
+
+        with app.app_context():
+            profesor = Usuario(email='bench@universidad.edu', nombre='Bench', rol='profesor')
+            profesor.set_password('bench123')
+            db.session.add(profesor)
+            db.session.commit()
+
+        resultados = []
+        with app.test_request_context('/api/pokemon'):
+            pokemons = pokemon_service.get_all_pokemons()
+            fragmentos = [fragmento_pokemon(pokemon, 0, True) for pokemon in pokemons]
+            antes = _por_segundo(lambda: jsonify({'pokemons': pokemons}).get_data(), segundos)
+            despues = _por_segundo(lambda: respuesta_json({'pokemons': fragmentos}).get_data(), segundos)
+            resultados.append(('catálogo completo (solo serialización)', antes, despues))
+
+        client = app.test_client()
+        token = client.post('/auth/login', json={'email': 'bench@universidad.edu', 'password': 'bench123'})
+        headers = {'Authorization': f"Bearer {token.get_json()['access_token']}"}
+        urls = [('GET /api/pokemon?limit=500', '/api/pokemon?limit=500'),
+                (f'GET /api/pokemon/{filas // 2}', f'/api/pokemon/{filas // 2}')]
+        for nombre, url in urls:
+            medidas = []
+            for activa in (False, True):
+                pokemon_service.cache_activa = captura_service.cache_activa = activa
+                for cache in (pokemon_cache, listados_cache, fragmentos_cache):
+                    cache.clear()
+                medidas.append(_por_segundo(lambda: client.get(url, headers=headers).get_data(), segundos))
+            resultados.append((nombre, *medidas))
+        return resultados
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--segundos', type=float, default=3)
+    parser.add_argument('--una', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.una:
+        for nombre, antes, despues in medir(args.una, args.segundos):
+            print(f"{args.una:>7} {nombre:<42} {antes:>10.1f} {despues:>10.1f} {despues / antes:>7.1f}x")
+        return
+
+    import subprocess
+    print(f"{'filas':>7} {'caso':<42} {'antes r/s':>10} {'después':>10} {'mejora':>8}")
+    for filas in args.filas:
+        # Cada tamaño en un proceso propio: la app lee la configuración al importarse
+        subprocess.run([sys.executable, __file__, '--una', str(filas), '--segundos', str(args.segundos)],
+                       check=True)
+
+if __name__ == '__main__':
+    main()
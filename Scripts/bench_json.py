@@ -0,0 +1,83 @@
+"""
+Micro-benchmark del codificador JSON de la app: proveedor por defecto de
+Flask (json de la librería estándar) frente a FastJSONProvider con orjson.
+
+Codifica en formato compacto (como jsonify) las formas reales de nuestras
+respuestas y muestra codificaciones por segundo y MB/s de cada proveedor.
+
+Uso: python Scripts/bench_json.py [--segundos 2]
+"""
+import sys
+import os
+import argparse
+import time
+from datetime import datetime
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from Utils.json_provider import FastJSONProvider, orjson
+
+def _pokemon(i):
+    return {
+        'id': i, 'nombre': f'Pokémon {i}', 'tipo': 'Psíquico/Fuego', 'nivel': i % 100 + 1,
+        'poder_ataque': 84.5, 'poder_defensa': 78.0, 'hp': 266,
+        'descripcion': 'Pokémon generado para el benchmark de serialización'
+    }
+
+def cargas():
+    """Formas de las respuestas reales de la API."""
+    fecha = datetime(2024, 3, 1, 12, 30, 5, 123456).isoformat()
+    return {
+        'pokemon (GET /api/pokemon/<id>)': {'rol': 'profesor', 'pokemon': _pokemon(1)},
+        'página de 500 (profesor)': {
+            'rol': 'profesor', 'total': 500, 'pokemons': [_pokemon(i) for i in range(500)],
+            'paginacion': {'limit': 500, 'next_cursor': 'NTAw'}
+        },
+        'página de 500 (trainer)': {
+            'rol': 'trainer', 'entrenador': 'Ash Ketchum', 'total_capturados': 500,
+            'pokemons_capturados': [
+                {'id': i, 'pokemon': _pokemon(i), 'apodo': 'Chispitas', 'fecha_captura': fecha}
+                for i in range(500)
+            ],
+            'paginacion': {'limit': 500, 'next_cursor': None}
+        },
+        'página de 500 (nombres solo ASCII)': {
+            'rol': 'profesor', 'total': 500,
+            'pokemons': [dict(_pokemon(i), nombre=f'Pokemon {i}', tipo='Fuego', descripcion='Generado')
+                         for i in range(500)],
+            'paginacion': {'limit': 500, 'next_cursor': 'NTAw'}
+        },
+        'catálogo de 10k (get_all_pokemons)': {'pokemons': [_pokemon(i) for i in range(10000)]},
+    }
+
+def medir(proveedor, carga, segundos):
+    tam = len(proveedor.dumps(carga, separators=(',', ':')).encode())
+    llamadas = 0
+    inicio = time.perf_counter()
+    while time.perf_counter() - inicio < segundos:
+        proveedor.dumps(carga, separators=(',', ':'))
+        llamadas += 1
+    por_segundo = llamadas / (time.perf_counter() - inicio)
+    return por_segundo, por_segundo * tam / 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--segundos', type=float, default=2)
+    args = parser.parse_args()
+    if orjson is None:
+        print("orjson no está instalado: pip install orjson")
+        return
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    rapido = FastJSONProvider(app, usar_orjson=True)
+    print(f"{'carga':<38} {'stdlib/s':>10} {'MB/s':>7} {'orjson/s':>10} {'MB/s':>7} {'mejora':>7}")
+    for nombre, carga in cargas().items():
+        assert stdlib.dumps(carga, separators=(',', ':')) == rapido.dumps(carga, separators=(',', ':'))
+        lento, mb_lento = medir(stdlib, carga, args.segundos)
+        veloz, mb_veloz = medir(rapido, carga, args.segundos)
+        print(f"{nombre:<38} {lento:>10.0f} {mb_lento:>7.1f} {veloz:>10.0f} {mb_veloz:>7.1f} {veloz / lento:>6.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark del hash de contraseñas: logins por segundo para cada combinación de
+algoritmo y coste.
+
+Para cada método mide las verificaciones por segundo en un solo hilo (logins/s
+por núcleo) y a través de PasswordHasher con varios hilos de login a la vez,
+que es lo que limita el throughput de /auth/login en un worker.
+
+Uso: python Scripts/bench_passwords.py [--segundos 3] [--hilos 8]
+"""
+import sys
+import os
+import argparse
+import threading
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from werkzeug.security import check_password_hash
+from Config.passwords import PASSWORD_HASH_WORKERS
+from Utils.passwords import PasswordHasher, VerificacionSaturada, metodo_hash
+
+METODOS = [
+    metodo_hash('scrypt', 32768),
+    metodo_hash('scrypt', 16384),
+    metodo_hash('pbkdf2', 1000000),
+    metodo_hash('pbkdf2', 600000),
+    metodo_hash('pbkdf2', 260000),
+]
+
+def por_nucleo(password_hash, segundos):
+    """Verificaciones por segundo en el hilo actual."""
+    total = 0
+    fin = time.perf_counter() + segundos
+    while time.perf_counter() < fin:
+        check_password_hash(password_hash, 'pikachu123')
+        total += 1
+    return total / segundos
+
+def con_ejecutor(hasher, password_hash, hilos, segundos):
+    """Logins por segundo (y rechazos) con `hilos` peticiones simultáneas."""
+    correctos = [0] * hilos
+    rechazados = [0] * hilos
+    fin = time.perf_counter() + segundos
+
+    def login(i):
+        while time.perf_counter() < fin:
+            try:
+                hasher.verificar(password_hash, 'pikachu123')
+                correctos[i] += 1
+            except VerificacionSaturada:
+                rechazados[i] += 1
+                time.sleep(0.01)
+
+    trabajadores = [threading.Thread(target=login, args=(i,)) for i in range(hilos)]
+    for hilo in trabajadores:
+        hilo.start()
+    for hilo in trabajadores:
+        hilo.join()
+    return sum(correctos) / segundos, sum(rechazados)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--segundos', type=float, default=3)
+    parser.add_argument('--hilos', type=int, default=8)
+    args = parser.parse_args()
+
+    print(f'{os.cpu_count()} núcleos, ejecutor de {PASSWORD_HASH_WORKERS} hilos, '
+          f'{args.hilos} logins simultáneos\n')
+    print(f"{'método':<24}{'ms/login':>10}{'logins/s/núcleo':>17}{'logins/s ejecutor':>19}{'rechazos':>10}")
+    for metodo in METODOS:
+        hasher = PasswordHasher(metodo=metodo)
+        password_hash = hasher.hash('pikachu123')
+        por_segundo = por_nucleo(password_hash, args.segundos)
+        paralelo, rechazos = con_ejecutor(hasher, password_hash, args.hilos, args.segundos)
+        print(f"{metodo:<24}{1000 / por_segundo:>10.1f}{por_segundo:>17.1f}{paralelo:>19.1f}{rechazos:>10}")
+
+if __name__ == '__main__':
+    main()
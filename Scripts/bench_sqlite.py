@@ -0,0 +1,145 @@
+"""
+Benchmark de concurrencia del fallback SQLite: lecturas y escrituras mezcladas
+con los PRAGMA por defecto frente al perfil de rendimiento (WAL,
+synchronous=NORMAL, caché y mmap) y frente al perfil con engine de solo
+lectura para las lecturas.
+
+Los lectores piden páginas del catálogo; los escritores hacen commits cortos
+como los de una asignación (actualizar una fila y subir el contador de versión).
+Cada escenario usa una BD nueva con las mismas filas.
+
+Uso: python Scripts/bench_sqlite.py [--filas 20000] [--lectores 8] [--escritores 2] [--segundos 5]
+"""
+import sys
+import os
+import argparse
+import random
+import tempfile
+import threading
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, insert, select, text, update
+from sqlalchemy.exc import OperationalError
+from Config.DataBase import db, aplicar_perfil_sqlite
+from Models.Pokemon import Pokemon
+import Models  # noqa: F401  (registra todas las tablas en db.metadata)
+
+ESCENARIOS = [
+    ('defecto', False, False),
+    ('perfil', True, False),
+    ('perfil + solo lectura', True, True),
+]
+
+def preparar_bd(ruta, filas):
+    """Crea la BD con `filas` pokémons usando los PRAGMA por defecto."""
+    engine = create_engine(f'sqlite:///{ruta}')
+    db.metadata.create_all(engine)
+    with engine.begin() as conexion:
+        conexion.execute(insert(Pokemon), [{
+            'nombre': f'Pokémon {i}', 'tipo': 'Agua', 'nivel': i % 100 + 1,
+            'poder_ataque': 50.5, 'poder_defensa': 40.0, 'hp': 100,
+            'descripcion': 'Pokémon generado para el benchmark de SQLite'
+        } for i in range(filas)])
+    engine.dispose()
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def ejecutar(ruta, filas, perfil, lectura_separada, lectores, escritores, segundos):
+    engine = create_engine(f'sqlite:///{ruta}', pool_size=lectores + escritores)
+    if perfil:
+        aplicar_perfil_sqlite(engine, perfil=True)
+    engine_lectura = engine
+    if lectura_separada:
+        engine_lectura = create_engine(f'sqlite:///{ruta}', pool_size=lectores)
+        aplicar_perfil_sqlite(engine_lectura, solo_lectura=True, perfil=True)
+
+    tabla = Pokemon.__table__
+    fin = time.perf_counter() + segundos
+    latencias_lectura, latencias_escritura = [], []
+    errores = []
+    lock = threading.Lock()
+
+    def lector():
+        propias = []
+        while time.perf_counter() < fin:
+            desde = random.randrange(filas)
+            inicio = time.perf_counter()
+            try:
+                with engine_lectura.connect() as conexion:
+                    conexion.execute(
+                        select(tabla).where(tabla.c.id > desde).order_by(tabla.c.id).limit(50)
+                    ).all()
+            except OperationalError as e:
+                with lock:
+                    errores.append(str(e.orig))
+                continue
+            propias.append(time.perf_counter() - inicio)
+        with lock:
+            latencias_lectura.extend(propias)
+
+    def escritor():
+        propias = []
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            try:
+                with engine.begin() as conexion:
+                    conexion.execute(
+                        update(tabla).where(tabla.c.id == random.randrange(1, filas + 1))
+                        .values(nivel=tabla.c.nivel + 1)
+                    )
+                    conexion.execute(text(
+                        "INSERT INTO version_datos (clave, version) VALUES ('pokemon', 1) "
+                        "ON CONFLICT (clave) DO UPDATE SET version = version + 1"
+                    ))
+            except OperationalError as e:
+                with lock:
+                    errores.append(str(e.orig))
+                continue
+            propias.append(time.perf_counter() - inicio)
+        with lock:
+            latencias_escritura.extend(propias)
+
+    hilos = [threading.Thread(target=lector) for _ in range(lectores)]
+    hilos += [threading.Thread(target=escritor) for _ in range(escritores)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    engine.dispose()
+    if engine_lectura is not engine:
+        engine_lectura.dispose()
+
+    return {
+        'lecturas_s': len(latencias_lectura) / segundos,
+        'escrituras_s': len(latencias_escritura) / segundos,
+        'lectura_p99_ms': _percentil(latencias_lectura, 0.99) * 1000,
+        'escritura_p99_ms': _percentil(latencias_escritura, 0.99) * 1000,
+        'errores': len(errores)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--filas', type=int, default=20000)
+    parser.add_argument('--lectores', type=int, default=8)
+    parser.add_argument('--escritores', type=int, default=2)
+    parser.add_argument('--segundos', type=float, default=5)
+    args = parser.parse_args()
+
+    print(f'{args.filas} filas, {args.lectores} lectores, {args.escritores} escritores, {args.segundos:g} s\n')
+    print(f"{'escenario':<24}{'lecturas/s':>12}{'escrit./s':>12}{'p99 lect.':>12}{'p99 escr.':>12}{'errores':>9}")
+    for nombre, perfil, lectura_separada in ESCENARIOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, 'bench.db')
+            preparar_bd(ruta, args.filas)
+            r = ejecutar(ruta, args.filas, perfil, lectura_separada,
+                         args.lectores, args.escritores, args.segundos)
+        print(f"{nombre:<24}{r['lecturas_s']:>12.0f}{r['escrituras_s']:>12.0f}"
+              f"{r['lectura_p99_ms']:>10.1f}ms{r['escritura_p99_ms']:>10.1f}ms{r['errores']:>9}")
+
+if __name__ == '__main__':
+    main()
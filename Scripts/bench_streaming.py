@@ -0,0 +1,116 @@
+"""
+Benchmark del listado completo del catálogo: jsonify de la lista entera
+frente a la respuesta en streaming (GET /api/pokemon?stream=1).
+
+Mide, para cada modo, el tiempo hasta la primera fila (en streaming, el
+primer trozo con pokémons: la cabecera del documento sale antes de leer
+ninguna fila y no cuenta), el tiempo total y el incremento del pico de
+memoria (RSS). Cada modo se ejecuta en un subproceso
+propio para que el pico de uno no contamine al otro.
+
+Uso: python Scripts/bench_streaming.py [--filas 100000]
+"""
+import sys
+import os
+import argparse
+import json
+import resource
+import subprocess
+import tempfile
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def _rss_pico_mb():
+    # En Linux ru_maxrss está en KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def preparar_bd(ruta, filas):
+    """Crea una BD SQLite temporal con `filas` pokémons."""
+    os.environ['DATABASE_URL'] = f'sqlite:///{ruta}'
+    from sqlalchemy import insert
+    from app import app
+    from Config.DataBase import db
+    from Models.Pokemon import Pokemon
+
+    with app.app_context():
+        db.create_all()
+        lote = []
+        for i in range(filas):
+            lote.append({
+                'nombre': f'Pokémon {i}', 'tipo': 'Fuego/Volador', 'nivel': i % 100 + 1,
+                'poder_ataque': 50.5, 'poder_defensa': 40.0, 'hp': 100,
+                'descripcion': 'Pokémon generado para el benchmark de streaming'
+            })
+            if len(lote) == 5000:
+                db.session.execute(insert(Pokemon), lote)
+                lote = []
+        if lote:
+            db.session.execute(insert(Pokemon), lote)
+        db.session.commit()
+
+def medir(modo, ruta):
+    """Ejecuta un modo y retorna sus métricas (se llama en un subproceso)."""
+    os.environ['DATABASE_URL'] = f'sqlite:///{ruta}'
+    from flask import jsonify
+    from app import app
+    from Config.pagination import STREAM_BATCH_SIZE
+    from Controllers.PokemonController import pokemon_service
+    from Utils.streaming import respuesta_json_stream
+
+    with app.test_request_context('/api/pokemon'):
+        rss_inicial = _rss_pico_mb()
+        inicio = time.perf_counter()
+
+        if modo == 'lista':
+            pokemons = pokemon_service.get_all_pokemons()
+            cuerpo = jsonify({'rol': 'profesor', 'total': len(pokemons), 'pokemons': pokemons}).get_data()
+            primera_fila = time.perf_counter() - inicio
+            total_bytes = len(cuerpo)
+        else:
+            respuesta = respuesta_json_stream(
+                {'rol': 'profesor'}, 'pokemons', pokemon_service.iter_pokemons(STREAM_BATCH_SIZE),
+                clave_total='total', tam_lote=STREAM_BATCH_SIZE
+            )
+            primera_fila = None
+            total_bytes = 0
+            for numero, trozo in enumerate(respuesta.response):
+                # El trozo 0 es la cabecera ({"pokemons":[); el 1 trae el primer lote
+                if numero == 1:
+                    primera_fila = time.perf_counter() - inicio
+                total_bytes += len(trozo.encode() if isinstance(trozo, str) else trozo)
+
+        return {
+            'modo': modo,
+            'primera_fila_ms': round(primera_fila * 1000, 1),
+            'total_ms': round((time.perf_counter() - inicio) * 1000, 1),
+            'rss_pico_mb': round(_rss_pico_mb() - rss_inicial, 1),
+            'bytes': total_bytes
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filas', type=int, default=100000)
+    parser.add_argument('--modo', choices=['lista', 'stream'])
+    parser.add_argument('--bd')
+    args = parser.parse_args()
+
+    if args.modo:
+        print(json.dumps(medir(args.modo, args.bd)))
+        return
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'bench_streaming.db')
+        print(f"Preparando {args.filas} filas en {ruta}...")
+        preparar_bd(ruta, args.filas)
+
+        print(f"\n{'modo':<8} {'primera fila (ms)':>18} {'total (ms)':>11} {'Δ RSS pico (MB)':>16} {'bytes':>12}")
+        for modo in ('lista', 'stream'):
+            salida = subprocess.run(
+                [sys.executable, __file__, '--modo', modo, '--bd', ruta],
+                check=True, capture_output=True, text=True
+            ).stdout.strip().splitlines()[-1]
+            r = json.loads(salida)
+            print(f"{r['modo']:<8} {r['primera_fila_ms']:>18} {r['total_ms']:>11} {r['rss_pico_mb']:>16} {r['bytes']:>12}")
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,13 @@
 import mysql.connector
 import os
+import sys
 from dotenv import load_dotenv
 
 # Cargar variables de entorno
 load_dotenv()
 
-# Leer el archivo SQL
-sql_file_path = 'Scripts/create_pokemon_table.sql'
+# Leer el archivo SQL (por defecto, el de creación de la tabla de pokémons)
+sql_file_path = sys.argv[1] if len(sys.argv) > 1 else 'Scripts/create_pokemon_table.sql'
 with open(sql_file_path, 'r') as file:
     sql_script = file.read()
 
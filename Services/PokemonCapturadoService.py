@@ -0,0 +1,194 @@
+import sqlite3
+from sqlalchemy.exc import IntegrityError
+from Config.DataBase import db
+from Config.bulk import BULK_CHUNK_SIZE
+from Repositories.PokemonCapturadoRepositories import PokemonCapturadoRepository
+from Repositories.VersionRepository import VersionRepository, CLAVE_CATALOGO
+from Services.PokemonService import fragmento_pokemon
+from Utils.json_fragmentos import JSONCrudo, dumps_con_fragmentos
+from Utils.pagination import cortar_pagina
+from Config.cache import POKEMON_CACHE_ENABLED
+
+# Resultados posibles de una asignación de pokémon a un entrenador
+ASIGNADO = 'asignado'
+POKEMON_NO_ENCONTRADO = 'pokemon_no_encontrado'
+ENTRENADOR_NO_ENCONTRADO = 'entrenador_no_encontrado'
+DUPLICADO = 'duplicado'
+DATOS_INVALIDOS = 'datos_invalidos'
+
+# Códigos de clave duplicada: ER_DUP_ENTRY de MySQL y el nombre extendido de SQLite
+# (sqlite_errorname existe desde Python 3.11; antes solo queda el mensaje)
+MYSQL_ER_DUP_ENTRY = 1062
+SQLITE_CONSTRAINT_UNIQUE = 'SQLITE_CONSTRAINT_UNIQUE'
+SQLITE_MENSAJE_UNIQUE = 'UNIQUE constraint failed'
+
+def es_violacion_unicidad(error):
+    """Distingue una clave duplicada de otras violaciones de integridad (p. ej. FK)."""
+    original = getattr(error, 'orig', error)
+    if isinstance(original, sqlite3.Error):
+        nombre = getattr(original, 'sqlite_errorname', None)
+        if nombre is not None:
+            return nombre == SQLITE_CONSTRAINT_UNIQUE
+        return str(original).startswith(SQLITE_MENSAJE_UNIQUE)
+    args = getattr(original, 'args', ())
+    return bool(args) and args[0] == MYSQL_ER_DUP_ENTRY
+
+class PokemonCapturadoService:
+    def __init__(self, cache_activa=POKEMON_CACHE_ENABLED):
+        self.repository = PokemonCapturadoRepository()
+        self.versiones = VersionRepository()
+        self.cache_activa = cache_activa
+    
+    def _fragmento_captura(self, captura, version, campos=None):
+        """JSON de la captura reutilizando el fragmento cacheado de su pokémon."""
+        pokemon = fragmento_pokemon(captura.pokemon, version, self.cache_activa, campos)
+        return JSONCrudo(dumps_con_fragmentos(captura.to_dict(pokemon=pokemon)))
+    
+    def get_capturas_page(self, usuario_id, ultimo_id, limit, filtros=None, campos=None):
+        """Retorna una página de la colección del entrenador y el cursor de la siguiente."""
+        capturas, next_cursor = cortar_pagina(
+            self.repository.get_capturas_page(usuario_id, ultimo_id, limit, filtros, campos), limit
+        )
+        return [captura.to_dict(campos=campos) for captura in capturas], next_cursor
+    
+    def get_capturas_page_json(self, usuario_id, ultimo_id, limit, filtros=None, campos=None):
+        """Como get_capturas_page, pero con cada captura ya codificada (JSONCrudo)."""
+        version = self.versiones.get_versiones([CLAVE_CATALOGO])[CLAVE_CATALOGO]
+        capturas, next_cursor = cortar_pagina(
+            self.repository.get_capturas_page(usuario_id, ultimo_id, limit, filtros, campos), limit
+        )
+        return [self._fragmento_captura(captura, version, campos) for captura in capturas], next_cursor
+    
+    def iter_capturas(self, usuario_id, batch_size, filtros=None, campos=None):
+        """Genera la colección del entrenador como diccionarios, leyendo por lotes."""
+        for captura in self.repository.iter_capturas(usuario_id, batch_size, filtros, campos):
+            yield captura.to_dict(campos=campos)
+    
+    def get_captura(self, usuario_id, pokemon_id, campos=None):
+        captura = self.repository.get_captura(usuario_id, pokemon_id, campos)
+        if captura:
+            return captura.to_dict(campos=campos)
+        return None
+    
+    def get_captura_json(self, usuario_id, pokemon_id, campos=None):
+        """Como get_captura, pero con la captura ya codificada (JSONCrudo)."""
+        version = self.versiones.get_versiones([CLAVE_CATALOGO])[CLAVE_CATALOGO]
+        captura = self.repository.get_captura(usuario_id, pokemon_id, campos)
+        if captura:
+            return self._fragmento_captura(captura, version, campos)
+        return None
+    
+    def liberar_pokemon(self, usuario_id, pokemon_id):
+        """
+        Elimina la captura del entrenador (el pokémon sigue en el catálogo).
+        Retorna el nombre del pokémon liberado o None si no estaba en su colección.
+        """
+        captura = self.repository.get_captura(usuario_id, pokemon_id)
+        if not captura:
+            return None
+        # Guardar el nombre del pokémon ANTES de eliminar la captura
+        pokemon_nombre = captura.pokemon.nombre
+        self.repository.delete_captura(captura)
+        return pokemon_nombre
+    
+    def asignar_pokemon(self, pokemon_id, trainer_email, apodo=None):
+        """
+        Asigna un pokémon a un entrenador con una consulta de resolución y un
+        INSERT. Los duplicados los detecta la restricción única, no una
+        búsqueda previa, así que dos peticiones simultáneas no pueden crear
+        la misma captura.
+        
+        Retorna (estado, datos) con estado ASIGNADO, POKEMON_NO_ENCONTRADO,
+        ENTRENADOR_NO_ENCONTRADO o DUPLICADO.
+        """
+        fila = self.repository.resolver_asignacion(pokemon_id, trainer_email)
+        if not fila:
+            return POKEMON_NO_ENCONTRADO, None
+        if fila.trainer_id is None:
+            return ENTRENADOR_NO_ENCONTRADO, None
+        
+        datos = {'pokemon': fila.pokemon_nombre, 'entrenador': fila.trainer_nombre, 'apodo': apodo}
+        try:
+            self.repository.create_captura(fila.trainer_id, pokemon_id, apodo)
+        except IntegrityError as e:
+            db.session.rollback()
+            if es_violacion_unicidad(e):
+                return DUPLICADO, datos
+            raise
+        return ASIGNADO, datos
+    
+    def asignar_pokemons(self, asignaciones):
+        """
+        Asigna en lote una lista de {pokemon_id, trainer_email, apodo}.
+        
+        Los pokémons, los entrenadores y las capturas ya existentes se resuelven
+        con consultas IN (unas pocas por lote, no una por elemento) y las
+        capturas nuevas se insertan en bloque en una sola transacción. Si otra
+        petición inserta a la vez alguna de las mismas capturas, la restricción
+        única hace fallar el lote y se repite una vez con los duplicados ya
+        detectados.
+        
+        Retorna una lista con el estado de cada elemento, en el mismo orden.
+        """
+        resultados = []
+        validas = []
+        for indice, item in enumerate(asignaciones):
+            resultado = {'indice': indice}
+            resultados.append(resultado)
+            if not isinstance(item, dict):
+                resultado['estado'] = DATOS_INVALIDOS
+                continue
+            pokemon_id = item.get('pokemon_id')
+            trainer_email = item.get('trainer_email')
+            apodo = item.get('apodo')
+            if isinstance(trainer_email, str):
+                trainer_email = trainer_email.strip().lower()
+            if isinstance(apodo, str):
+                apodo = apodo.strip() or None
+            resultado.update({'pokemon_id': pokemon_id, 'trainer_email': trainer_email})
+            
+            if (not isinstance(pokemon_id, int) or isinstance(pokemon_id, bool)
+                    or not isinstance(trainer_email, str) or not trainer_email
+                    or (apodo is not None and not isinstance(apodo, str))):
+                resultado['estado'] = DATOS_INVALIDOS
+                continue
+            validas.append((resultado, pokemon_id, trainer_email, apodo))
+        
+        if not validas:
+            return resultados
+        
+        nombres = self.repository.get_pokemons_por_id(
+            {pokemon_id for _, pokemon_id, _, _ in validas}, BULK_CHUNK_SIZE
+        )
+        trainers = self.repository.get_trainers_por_email(
+            {trainer_email for _, _, trainer_email, _ in validas}, BULK_CHUNK_SIZE
+        )
+        
+        for intento in range(2):
+            existentes = self.repository.get_capturas_existentes(
+                {usuario_id for usuario_id, _ in trainers.values()}, nombres.keys(), BULK_CHUNK_SIZE
+            )
+            nuevas = []
+            for resultado, pokemon_id, trainer_email, apodo in validas:
+                if pokemon_id not in nombres:
+                    resultado['estado'] = POKEMON_NO_ENCONTRADO
+                    continue
+                if trainer_email not in trainers:
+                    resultado['estado'] = ENTRENADOR_NO_ENCONTRADO
+                    continue
+                usuario_id = trainers[trainer_email][0]
+                # Los repetidos dentro del mismo lote cuentan como duplicados
+                if (usuario_id, pokemon_id) in existentes:
+                    resultado['estado'] = DUPLICADO
+                    continue
+                existentes.add((usuario_id, pokemon_id))
+                resultado['estado'] = ASIGNADO
+                nuevas.append({'usuario_id': usuario_id, 'pokemon_id': pokemon_id, 'apodo': apodo})
+            
+            try:
+                if nuevas:
+                    self.repository.bulk_create_capturas(nuevas, BULK_CHUNK_SIZE)
+                return resultados
+            except IntegrityError as e:
+                if intento or not es_violacion_unicidad(e):
+                    raise
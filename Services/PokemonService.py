@@ -1,44 +1,276 @@
 from Repositories.PokemonRepositories import PokemonRepository
+from Repositories.VersionRepository import VersionRepository, CLAVE_CATALOGO, clave_coleccion
+from Utils.cache import TTLCache
+from Utils.json_fragmentos import JSONCrudo, codificar
+from Utils.pagination import cortar_pagina
+from Utils.filtros import clave_filtros
+from Utils.texto import terminos_busqueda
+from Config.bulk import BULK_CHUNK_SIZE
+from Config.cache import (
+    POKEMON_CACHE_ENABLED, POKEMON_CACHE_MAXSIZE, POKEMON_LIST_CACHE_MAXSIZE, POKEMON_CACHE_TTL,
+    POKEMON_STATS_CACHE_MAXSIZE, POKEMON_STATS_BUCKET_WIDTH
+)
+
+REQUIRED_FIELDS = ['nombre', 'tipo', 'nivel', 'poder_ataque', 'poder_defensa', 'hp']
+OPTIONAL_FIELDS = ['descripcion']
+
+# Cachés del catálogo compartidas por todas las instancias del servicio.
+# Las claves incluyen la versión del catálogo (ver VersionRepository): una
+# escritura hecha en cualquier worker cambia la versión y las entradas viejas
+# dejan de usarse sin necesidad de avisar a los demás procesos.
+pokemon_cache = TTLCache(maxsize=POKEMON_CACHE_MAXSIZE, ttl=POKEMON_CACHE_TTL)
+listados_cache = TTLCache(maxsize=POKEMON_LIST_CACHE_MAXSIZE, ttl=POKEMON_CACHE_TTL)
+# JSON ya codificado de cada pokémon, clave (id, versión del catálogo) o
+# (id, versión, campos) si se pidió una selección de campos
+fragmentos_cache = TTLCache(maxsize=POKEMON_CACHE_MAXSIZE, ttl=POKEMON_CACHE_TTL)
+# Estadísticas ya codificadas, clave ('catalogo', versión) o ('coleccion', id,
+# versión del catálogo, versión de la colección); sin TTL
+estadisticas_cache = TTLCache(maxsize=POKEMON_STATS_CACHE_MAXSIZE, ttl=None)
+
+def fragmento_pokemon(pokemon, version, cache_activa=POKEMON_CACHE_ENABLED, campos=None):
+    """
+    Retorna el JSON de un pokémon (instancia o diccionario) como JSONCrudo,
+    reutilizando el ya codificado para esa versión del catálogo. Con `campos`
+    solo incluye esos campos (un diccionario se asume ya recortado).
+    """
+    es_dict = isinstance(pokemon, dict)
+    clave = (pokemon['id'] if es_dict else pokemon.id, version)
+    if campos is not None:
+        clave += (campos,)
+    if cache_activa:
+        fragmento = fragmentos_cache.get(clave)
+        if fragmento is not None:
+            return fragmento
+    fragmento = JSONCrudo(codificar(pokemon if es_dict else pokemon.to_dict(campos)))
+    if cache_activa:
+        fragmentos_cache.set(clave, fragmento)
+    return fragmento
 
 class PokemonService:
-    def __init__(self):
+    def __init__(self, cache_activa=POKEMON_CACHE_ENABLED):
         self.repository = PokemonRepository()
+        self.versiones = VersionRepository()
+        self.cache_activa = cache_activa
+    
+    def _version_catalogo(self):
+        return self.versiones.get_versiones([CLAVE_CATALOGO])[CLAVE_CATALOGO]
+    
+    def _invalidar_cache(self):
+        """Tras una escritura del catálogo todas las entradas quedan obsoletas."""
+        pokemon_cache.clear()
+        listados_cache.clear()
+        fragmentos_cache.clear()
+        estadisticas_cache.clear()
+    
+    def validar_pokemon(self, pokemon_data):
+        """
+        Valida los datos de un pokémon nuevo y retorna solo los campos del modelo.
+        Lanza ValueError con el primer problema encontrado.
+        """
+        if not isinstance(pokemon_data, dict):
+            raise ValueError("Cada pokémon debe ser un objeto JSON")
+        
+        # Validar datos
+        for field in REQUIRED_FIELDS:
+            if field not in pokemon_data:
+                raise ValueError(f"El campo {field} es requerido")
+        
+        desconocidos = set(pokemon_data) - set(REQUIRED_FIELDS) - set(OPTIONAL_FIELDS)
+        if desconocidos:
+            raise ValueError(f"Campos no válidos: {', '.join(sorted(desconocidos))}")
+        
+        # Validar tipos de datos
+        for field in ('nombre', 'tipo'):
+            if not isinstance(pokemon_data[field], str) or not pokemon_data[field].strip():
+                raise ValueError(f"El campo {field} debe ser un texto no vacío")
+        
+        if not isinstance(pokemon_data['nivel'], int) or pokemon_data['nivel'] <= 0:
+            raise ValueError("El nivel debe ser un número entero positivo")
+        
+        if not isinstance(pokemon_data['hp'], int) or pokemon_data['hp'] <= 0:
+            raise ValueError("El HP debe ser un número entero positivo")
+        
+        for field in ('poder_ataque', 'poder_defensa'):
+            valor = pokemon_data[field]
+            if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+                raise ValueError(f"El campo {field} debe ser numérico")
+        
+        return {field: pokemon_data.get(field) for field in REQUIRED_FIELDS + OPTIONAL_FIELDS}
     
     def create_pokemon(self, pokemon_data):
         try:
-            # Validar datos
-            required_fields = ['nombre', 'tipo', 'nivel', 'poder_ataque', 'poder_defensa', 'hp']
-            for field in required_fields:
-                if field not in pokemon_data:
-                    raise ValueError(f"El campo {field} es requerido")
-            
-            # Validar tipos de datos
-            if not isinstance(pokemon_data['nivel'], int) or pokemon_data['nivel'] <= 0:
-                raise ValueError("El nivel debe ser un número entero positivo")
-            
-            if not isinstance(pokemon_data['hp'], int) or pokemon_data['hp'] <= 0:
-                raise ValueError("El HP debe ser un número entero positivo")
-            
-            pokemon = self.repository.create_pokemon(pokemon_data)
+            pokemon = self.repository.create_pokemon(self.validar_pokemon(pokemon_data))
+            self._invalidar_cache()
             return pokemon.to_dict()
         except Exception as e:
             raise Exception(f"Error al crear el Pokémon: {str(e)}")
     
+    def create_pokemons_bulk(self, items):
+        """
+        Valida todos los elementos e inserta los válidos en una sola transacción.
+        Los elementos que llegan como excepción (p. ej. líneas NDJSON que no se
+        pudieron leer) se reportan como error de su índice.
+        Retorna el número de pokémons creados y los errores por índice.
+        """
+        validos, errores = [], []
+        for indice, item in enumerate(items):
+            if isinstance(item, Exception):
+                errores.append({'indice': indice, 'error': str(item)})
+                continue
+            try:
+                validos.append(self.validar_pokemon(item))
+            except ValueError as e:
+                errores.append({'indice': indice, 'error': str(e)})
+        
+        if validos:
+            self.repository.bulk_create_pokemons(validos, BULK_CHUNK_SIZE)
+            self._invalidar_cache()
+        return {'creados': len(validos), 'errores': errores}
+    
     def get_all_pokemons(self):
-        pokemons = self.repository.get_all_pokemons()
-        return [pokemon.to_dict() for pokemon in pokemons]
+        if not self.cache_activa:
+            return [pokemon.to_dict() for pokemon in self.repository.get_all_pokemons()]
+        
+        clave = ('todos', self._version_catalogo())
+        pokemons = listados_cache.get(clave)
+        if pokemons is None:
+            pokemons = [pokemon.to_dict() for pokemon in self.repository.get_all_pokemons()]
+            listados_cache.set(clave, pokemons)
+        return list(pokemons)
     
-    def get_pokemon_by_id(self, pokemon_id):
-        pokemon = self.repository.get_pokemon_by_id(pokemon_id)
-        if pokemon:
-            return pokemon.to_dict()
-        return None
+    def get_pokemons_page(self, ultimo_id, limit, filtros=None, campos=None):
+        """
+        Retorna una página del catálogo (opcionalmente filtrado y con solo
+        `campos`) y el cursor de la siguiente.
+        """
+        if not self.cache_activa:
+            return self._leer_pagina(ultimo_id, limit, filtros, campos)
+        
+        clave = ('pagina', ultimo_id, limit, clave_filtros(filtros), campos, self._version_catalogo())
+        pagina = listados_cache.get(clave)
+        if pagina is None:
+            pagina = self._leer_pagina(ultimo_id, limit, filtros, campos)
+            listados_cache.set(clave, pagina)
+        pokemons, next_cursor = pagina
+        return list(pokemons), next_cursor
+    
+    def get_pokemons_page_json(self, ultimo_id, limit, filtros=None, campos=None):
+        """Como get_pokemons_page, pero con cada pokémon ya codificado (JSONCrudo)."""
+        version = self._version_catalogo()
+        pokemons, next_cursor = self.get_pokemons_page(ultimo_id, limit, filtros, campos)
+        return [fragmento_pokemon(pokemon, version, self.cache_activa, campos)
+                for pokemon in pokemons], next_cursor
+    
+    def _leer_pagina(self, ultimo_id, limit, filtros=None, campos=None):
+        pokemons, next_cursor = cortar_pagina(
+            self.repository.get_pokemons_page(ultimo_id, limit, filtros, campos), limit
+        )
+        return [pokemon.to_dict(campos) for pokemon in pokemons], next_cursor
+    
+    def iter_pokemons(self, batch_size, filtros=None, campos=None):
+        """Genera los pokémons del catálogo como diccionarios, leyendo por lotes."""
+        for pokemon in self.repository.iter_pokemons(batch_size, filtros, campos):
+            yield pokemon.to_dict(campos)
+    
+    def buscar_pokemons_json(self, consulta, limit, usuario_id=None):
+        """
+        Busca en nombre y descripción (ver PokemonRepository.buscar_pokemons) y
+        retorna los pokémons ya codificados (JSONCrudo) por orden de relevancia.
+        Lanza ValueError si la consulta no tiene ninguna palabra.
+        """
+        terminos = terminos_busqueda(consulta)
+        if not terminos:
+            raise ValueError("El parámetro q debe contener al menos una palabra")
+        
+        version = self._version_catalogo()
+        # Solo se cachean las búsquedas en el catálogo: las de un entrenador
+        # dependen también de su colección
+        cachear = self.cache_activa and usuario_id is None
+        clave = ('busqueda', tuple(terminos), limit, version)
+        pokemons = listados_cache.get(clave) if cachear else None
+        if pokemons is None:
+            pokemons = [pokemon.to_dict() for pokemon in
+                        self.repository.buscar_pokemons(terminos, limit, usuario_id)]
+            if cachear:
+                listados_cache.set(clave, pokemons)
+        return [fragmento_pokemon(pokemon, version, self.cache_activa) for pokemon in pokemons]
+    
+    def get_estadisticas_json(self, usuario_id=None):
+        """
+        Estadísticas agregadas del catálogo o, con `usuario_id`, de la colección
+        de ese entrenador, ya codificadas (JSONCrudo). Entre dos escrituras se
+        sirven de memoria sin tocar la BD más allá de leer las versiones, así
+        que el coste no depende del tamaño de la tabla.
+        """
+        if usuario_id is None:
+            clave = ('catalogo', self._version_catalogo())
+        else:
+            coleccion = clave_coleccion(usuario_id)
+            versiones = self.versiones.get_versiones([CLAVE_CATALOGO, coleccion])
+            clave = ('coleccion', usuario_id, versiones[CLAVE_CATALOGO], versiones[coleccion])
+        
+        if self.cache_activa:
+            estadisticas = estadisticas_cache.get(clave)
+            if estadisticas is not None:
+                return estadisticas
+        estadisticas = JSONCrudo(codificar(
+            self.repository.estadisticas(POKEMON_STATS_BUCKET_WIDTH, usuario_id)
+        ))
+        if self.cache_activa:
+            estadisticas_cache.set(clave, estadisticas)
+        return estadisticas
+    
+    def reconstruir_indice_busqueda(self):
+        """Crea o reconstruye el índice de texto completo del catálogo."""
+        indice = self.repository.reconstruir_indice_busqueda()
+        self._invalidar_cache()
+        return indice
+    
+    def reconstruir_tipos(self):
+        """Regenera la tabla de tipos normalizados desde pokemon.tipo."""
+        total = self.repository.reconstruir_tipos(BULK_CHUNK_SIZE)
+        self._invalidar_cache()
+        return total
+    
+    def get_pokemon_by_id(self, pokemon_id, campos=None):
+        if self.cache_activa:
+            clave = (pokemon_id, self._version_catalogo())
+            if campos is not None:
+                clave += (campos,)
+            pokemon = pokemon_cache.get(clave)
+            if pokemon is not None:
+                return pokemon
+        
+        pokemon = self.repository.get_pokemon_by_id(pokemon_id, campos)
+        if not pokemon:
+            return None
+        pokemon = pokemon.to_dict(campos)
+        if self.cache_activa:
+            pokemon_cache.set(clave, pokemon)
+        return pokemon
+    
+    def get_pokemon_json(self, pokemon_id, campos=None):
+        """Como get_pokemon_by_id, pero con el pokémon ya codificado (JSONCrudo)."""
+        version = self._version_catalogo()
+        if self.cache_activa:
+            clave = (pokemon_id, version) if campos is None else (pokemon_id, version, campos)
+            fragmento = fragmentos_cache.get(clave)
+            if fragmento is not None:
+                return fragmento
+        pokemon = self.get_pokemon_by_id(pokemon_id, campos)
+        if pokemon is None:
+            return None
+        return fragmento_pokemon(pokemon, version, self.cache_activa, campos)
     
     def update_pokemon(self, pokemon_id, pokemon_data):
         pokemon = self.repository.update_pokemon(pokemon_id, pokemon_data)
         if pokemon:
+            self._invalidar_cache()
             return pokemon.to_dict()
         return None
     
     def delete_pokemon(self, pokemon_id):
-        return self.repository.delete_pokemon(pokemon_id)
\ No newline at end of file
+        eliminado = self.repository.delete_pokemon(pokemon_id)
+        if eliminado:
+            self._invalidar_cache()
+        return eliminado
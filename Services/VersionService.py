@@ -0,0 +1,28 @@
+import zlib
+from Repositories.VersionRepository import VersionRepository, CLAVE_CATALOGO, clave_coleccion
+
+class VersionService:
+    def __init__(self):
+        self.repository = VersionRepository()
+    
+    def etag_para(self, usuario):
+        """
+        ETag fuerte de los datos que ve el usuario, calculado con una sola
+        consulta a los contadores de versión (sin cargar ni serializar datos).
+        
+        - Profesor: versión del catálogo.
+        - Trainer: versión del catálogo (sus capturas incluyen los datos del
+          pokémon), versión de su colección y su nombre, que va en la respuesta.
+        
+        Retorna None para roles que no tienen listado.
+        """
+        if usuario.rol == 'profesor':
+            return f"catalogo-{self.repository.get_versiones([CLAVE_CATALOGO])[CLAVE_CATALOGO]}"
+        
+        if usuario.rol == 'trainer':
+            coleccion = clave_coleccion(usuario.id)
+            versiones = self.repository.get_versiones([CLAVE_CATALOGO, coleccion])
+            nombre = zlib.crc32(usuario.nombre.encode())
+            return f"coleccion-{usuario.id}-{versiones[CLAVE_CATALOGO]}-{versiones[coleccion]}-{nombre:08x}"
+        
+        return None
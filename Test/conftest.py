@@ -0,0 +1,114 @@
+"""
+Fixtures compartidas para las pruebas con el cliente de Flask.
+Usan una base de datos SQLite en memoria, independiente de MySQL y del
+archivo local pokemon_local.db.
+"""
+import sys
+import os
+from contextlib import contextmanager
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ['DATABASE_URL'] = 'sqlite://'
+# Cada petición de las pruebas se audita: presupuesto SQL de su ruta y N+1
+os.environ['SQL_AUDIT'] = 'log'
+
+import pytest
+from sqlalchemy import event
+from app import app as flask_app
+from Config.DataBase import db
+from Models.Usuario import Usuario
+from Models.Pokemon import Pokemon
+from Utils.decorators import usuario_cache
+from Utils.authz import epoch_registry
+from Controllers.AuthController import revocation_store, login_limiter
+from Services.PokemonService import pokemon_cache, listados_cache, fragmentos_cache, estadisticas_cache
+from Utils.compresion import variantes_cache
+from Utils.metricas import registro_metricas
+
+USUARIOS_PRUEBA = [
+    ('profesor@universidad.edu', 'Profesor Oak', 'profesor', 'profesor123'),
+    ('ash@pokemon.com', 'Ash Ketchum', 'trainer', 'ash123'),
+    ('misty@pokemon.com', 'Misty', 'trainer', 'misty123'),
+]
+
+@pytest.fixture
+def aplicacion():
+    # No se llama `app` para que pytest-flask no empuje un contexto de petición
+    # compartido por todo el test (flask.g debe ser distinto en cada petición).
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+        for email, nombre, rol, password in USUARIOS_PRUEBA:
+            usuario = Usuario(email=email, nombre=nombre, rol=rol)
+            usuario.set_password(password)
+            db.session.add(usuario)
+        db.session.commit()
+    # La BD se recrea en cada test y las versiones vuelven a 0: hay que vaciar
+    # las cachés para no servir datos del test anterior con la misma versión
+    for cache in (usuario_cache, pokemon_cache, listados_cache, fragmentos_cache, estadisticas_cache,
+                  variantes_cache):
+        cache.clear()
+        cache.reset_stats()
+    epoch_registry.reset()
+    revocation_store.reset()
+    login_limiter.reset()
+    registro_metricas.reset()
+    auditoria_sql = flask_app.extensions['auditoria_sql']
+    auditoria_sql.reset()
+    flask_app.config['AUTHZ_MODE'] = 'db'
+    yield flask_app
+    with flask_app.app_context():
+        db.session.remove()
+    infracciones = list(auditoria_sql.infracciones)
+    assert not infracciones, '\n'.join(map(auditoria_sql.describir, infracciones))
+
+@pytest.fixture
+def client(aplicacion):
+    with aplicacion.test_client() as client:
+        yield client
+
+def login(client, email, password):
+    """Hace login y retorna los headers de autorización."""
+    response = client.post('/auth/login', json={'email': email, 'password': password})
+    assert response.status_code == 200, response.get_json()
+    return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+@pytest.fixture
+def profesor_headers(client):
+    return login(client, 'profesor@universidad.edu', 'profesor123')
+
+@pytest.fixture
+def trainer_headers(client):
+    return login(client, 'ash@pokemon.com', 'ash123')
+
+def crear_pokemons(n, **valores):
+    """Inserta `n` pokémons de prueba y retorna sus ids."""
+    datos = {
+        'tipo': 'Fuego/Volador', 'nivel': 30, 'poder_ataque': 50.0,
+        'poder_defensa': 40.0, 'hp': 100, 'descripcion': 'Pokémon de prueba'
+    }
+    datos.update(valores)
+    pokemons = [Pokemon(nombre=f'Pokemon {i}', **datos) for i in range(n)]
+    db.session.add_all(pokemons)
+    db.session.commit()
+    return [pokemon.id for pokemon in pokemons]
+
+@contextmanager
+def contar_sql(aplicacion):
+    """Cuenta las sentencias SQL emitidas dentro del bloque."""
+    sentencias = []
+    
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        sentencias.append(statement)
+    
+    with aplicacion.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', registrar)
+    try:
+        yield sentencias
+    finally:
+        event.remove(engine, 'before_cursor_execute', registrar)
+
+def sin_versiones(sentencias):
+    """Quita las sentencias sobre los contadores de versión (ETag)."""
+    return [s for s in sentencias if 'version_datos' not in s]
@@ -0,0 +1,72 @@
+"""
+Pruebas de la fábrica de la app y de la elección del backend de base de datos.
+"""
+import socket
+import threading
+import time
+from sqlalchemy import create_engine, inspect
+import Config.DataBase as database
+from Config.DataBase import db, get_database_url, SQLITE_URI
+from app import create_app
+
+def _puerto_cerrado():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _mysql_en(monkeypatch, port):
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    for clave, valor in {'DBUSERNAME': 'u', 'DBPASSWORD': 'p', 'DBHOST': '127.0.0.1',
+                         'DBPORT': str(port), 'DBNAME': 'pokemon'}.items():
+        monkeypatch.setenv(clave, valor)
+
+def test_mysql_apagado_se_descarta_en_milisegundos(monkeypatch):
+    _mysql_en(monkeypatch, _puerto_cerrado())
+    
+    inicio = time.perf_counter()
+    assert get_database_url('auto') == SQLITE_URI
+    assert time.perf_counter() - inicio < 0.2
+
+def test_sondeo_espera_el_saludo_de_mysql():
+    with socket.socket() as mudo, socket.socket() as mysql:
+        for servidor in (mudo, mysql):
+            servidor.bind(('127.0.0.1', 0))
+            servidor.listen()
+        hilo = threading.Thread(target=lambda: mysql.accept()[0].sendall(b'\x0a'))
+        hilo.start()
+        
+        assert database._puerto_abierto('127.0.0.1', mysql.getsockname()[1], 1)
+        # Acepta la conexión (backlog) pero nunca saluda: proxy sin servidor
+        assert not database._puerto_abierto('127.0.0.1', mudo.getsockname()[1], 0.05)
+        hilo.join()
+
+def test_backend_explicito_no_sondea(monkeypatch):
+    _mysql_en(monkeypatch, _puerto_cerrado())
+    def sondeo(*args):
+        raise AssertionError('no debería sondear MySQL')
+    monkeypatch.setattr(database, '_puerto_abierto', sondeo)
+    
+    assert get_database_url('sqlite') == SQLITE_URI
+    assert get_database_url('mysql').startswith('mysql+mysqlconnector://u:p@127.0.0.1:')
+
+def test_el_esquema_es_un_paso_explicito():
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://'})
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
+    
+    resultado = app.test_cli_runner().invoke(args=['init-db'])
+    
+    assert resultado.exit_code == 0
+    with app.app_context():
+        assert 'pokemon' in inspect(db.engine).get_table_names()
+
+def test_reutiliza_el_engine_del_sondeo(tmp_path):
+    url = f"sqlite:///{tmp_path / 'sondeo.db'}"
+    engine = create_engine(url)
+    database._engines_sondeados[database._clave_engine(url)] = engine
+    
+    app = create_app({'SQLALCHEMY_DATABASE_URI': url})
+    
+    with app.app_context():
+        assert db.engine is engine
+    assert not database._engines_sondeados
@@ -0,0 +1,89 @@
+"""
+Pruebas de la asignación de pokémons a entrenadores con la restricción única
+(usuario_id, pokemon_id).
+"""
+import sqlite3
+import pytest
+from sqlalchemy.exc import IntegrityError
+from Config.DataBase import db
+from Models.PokemonCapturado import PokemonCapturado
+from Models.Usuario import Usuario
+from Services.PokemonCapturadoService import es_violacion_unicidad
+from Test.conftest import contar_sql, crear_pokemons, sin_versiones
+
+def test_asignacion_con_una_consulta_y_un_insert(aplicacion, client, profesor_headers):
+    client.get('/auth/me', headers=profesor_headers)
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers,
+                               json={'trainer_email': 'ash@pokemon.com', 'apodo': 'Chispitas'})
+    
+    assert response.status_code == 201
+    assert response.get_json()['entrenador'] == 'Ash Ketchum'
+    assert response.get_json()['apodo'] == 'Chispitas'
+    verbos = [s.lstrip().split()[0].upper() for s in sin_versiones(sentencias)]
+    assert verbos == ['SELECT', 'INSERT']
+
+def test_asignacion_duplicada_responde_409(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    datos = {'trainer_email': 'ash@pokemon.com'}
+    
+    assert client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers, json=datos).status_code == 201
+    response = client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers, json=datos)
+    
+    assert response.status_code == 409
+    with aplicacion.app_context():
+        assert PokemonCapturado.query.count() == 1
+
+def test_asignacion_con_pokemon_o_entrenador_inexistente(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    
+    response = client.post('/api/pokemon/9999/asignar', headers=profesor_headers,
+                           json={'trainer_email': 'ash@pokemon.com'})
+    assert response.get_json()['error'] == 'Pokémon no encontrado'
+    
+    for email in ('nadie@pokemon.com', 'profesor@universidad.edu'):
+        response = client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers,
+                               json={'trainer_email': email})
+        assert response.status_code == 404
+        assert response.get_json()['error'] == 'Entrenador no encontrado'
+
+def test_restriccion_unica_en_la_tabla(aplicacion):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+        ash = Usuario.query.filter_by(email='ash@pokemon.com').first()
+        db.session.add(PokemonCapturado(usuario_id=ash.id, pokemon_id=pokemon_id))
+        db.session.add(PokemonCapturado(usuario_id=ash.id, pokemon_id=pokemon_id))
+        with pytest.raises(IntegrityError) as duplicada:
+            db.session.commit()
+        db.session.rollback()
+        
+        db.session.add(PokemonCapturado(usuario_id=ash.id, pokemon_id=None))
+        with pytest.raises(IntegrityError) as nula:
+            db.session.commit()
+        db.session.rollback()
+    
+    assert es_violacion_unicidad(duplicada.value)
+    assert not es_violacion_unicidad(nula.value)
+
+def test_violacion_unicidad_en_sqlite_sin_sqlite_errorname():
+    # Antes de Python 3.11 sqlite3 no expone el nombre del error: decide el mensaje
+    duplicada = sqlite3.IntegrityError('UNIQUE constraint failed: pokemon_capturado.usuario_id')
+    nula = sqlite3.IntegrityError('NOT NULL constraint failed: pokemon_capturado.pokemon_id')
+    assert not hasattr(duplicada, 'sqlite_errorname')
+    assert es_violacion_unicidad(IntegrityError('INSERT', {}, duplicada))
+    assert not es_violacion_unicidad(IntegrityError('INSERT', {}, nula))
+
+class _ErrorMySQL(Exception):
+    """Como los de mysql-connector: args = (errno, mensaje, sqlstate)."""
+
+def test_violacion_unicidad_por_codigo_de_mysql():
+    assert es_violacion_unicidad(IntegrityError('INSERT', {}, _ErrorMySQL(
+        1062, "1062 (23000): Duplicate entry '1-2' for key 'uq_pokemon_capturado_usuario_pokemon'", '23000')))
+    # FK: el mensaje no decide, solo el código
+    assert not es_violacion_unicidad(IntegrityError('INSERT', {}, _ErrorMySQL(
+        1452, '1452 (23000): Duplicate entry?', '23000')))
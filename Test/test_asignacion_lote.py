@@ -0,0 +1,60 @@
+"""
+Pruebas de la asignación en lote POST /api/pokemon/asignar.
+"""
+from Config.DataBase import db
+from Models.PokemonCapturado import PokemonCapturado
+from Models.Usuario import Usuario
+from Test.conftest import contar_sql, crear_pokemons, sin_versiones
+
+def _crear_trainers(n):
+    db.session.add_all([
+        Usuario(nombre=f'Trainer {i}', email=f'trainer{i}@pokemon.com', password_hash='x', rol='trainer')
+        for i in range(n)
+    ])
+    db.session.commit()
+
+def test_informe_por_elemento(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        p1, p2 = crear_pokemons(2)
+    client.post(f'/api/pokemon/{p1}/asignar', headers=profesor_headers, json={'trainer_email': 'ash@pokemon.com'})
+    
+    response = client.post('/api/pokemon/asignar', headers=profesor_headers, json={'asignaciones': [
+        {'pokemon_id': p1, 'trainer_email': 'ash@pokemon.com'},
+        {'pokemon_id': p2, 'trainer_email': 'ASH@pokemon.com', 'apodo': 'Bulbi'},
+        {'pokemon_id': p2, 'trainer_email': 'ash@pokemon.com'},
+        {'pokemon_id': 9999, 'trainer_email': 'misty@pokemon.com'},
+        {'pokemon_id': p1, 'trainer_email': 'profesor@universidad.edu'},
+        {'pokemon_id': 'uno', 'trainer_email': 'misty@pokemon.com'},
+    ]})
+    
+    assert response.status_code == 200
+    datos = response.get_json()
+    assert [r['estado'] for r in datos['resultados']] == [
+        'duplicado', 'asignado', 'duplicado', 'pokemon_no_encontrado',
+        'entrenador_no_encontrado', 'datos_invalidos'
+    ]
+    assert datos['resumen']['asignado'] == 1
+    with aplicacion.app_context():
+        captura = PokemonCapturado.query.filter_by(pokemon_id=p2).one()
+        assert captura.apodo == 'Bulbi'
+
+def test_consultas_constantes_con_muchos_trainers(aplicacion, client, profesor_headers):
+    client.get('/auth/me', headers=profesor_headers)
+    with aplicacion.app_context():
+        starter = crear_pokemons(1)[0]
+        _crear_trainers(300)
+    asignaciones = [{'pokemon_id': starter, 'trainer_email': f'trainer{i}@pokemon.com'} for i in range(300)]
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.post('/api/pokemon/asignar', headers=profesor_headers, json=asignaciones)
+    
+    assert response.get_json()['resumen'] == {'asignado': 300}
+    verbos = [s.lstrip().split()[0].upper() for s in sin_versiones(sentencias)]
+    assert verbos.count('SELECT') == 3
+    assert verbos.count('INSERT') == 1
+    with aplicacion.app_context():
+        assert PokemonCapturado.query.count() == 300
+
+def test_cuerpo_invalido(client, profesor_headers, trainer_headers):
+    assert client.post('/api/pokemon/asignar', headers=profesor_headers, json={'x': 1}).status_code == 400
+    assert client.post('/api/pokemon/asignar', headers=trainer_headers, json=[]).status_code == 403
@@ -0,0 +1,77 @@
+"""
+Pruebas del modo de autorización por claims (AUTHZ_MODE='claims').
+"""
+from flask_jwt_extended import jwt_required
+from Config.DataBase import db
+from Models.Usuario import Usuario
+from Utils.authz import epoch_registry
+from Utils.decorators import profesor_required
+from Test.conftest import contar_sql, login
+
+POKEMON = {'nombre': 'Eevee', 'tipo': 'Normal', 'nivel': 10,
+           'poder_ataque': 55.0, 'poder_defensa': 50.0, 'hp': 55}
+
+def _modificar_usuario(aplicacion, email, **cambios):
+    with aplicacion.app_context():
+        usuario = Usuario.query.filter_by(email=email).first()
+        for campo, valor in cambios.items():
+            setattr(usuario, campo, valor)
+        db.session.commit()
+
+def test_rol_se_autoriza_sin_consultar_la_bd(aplicacion, profesor_headers):
+    aplicacion.config['AUTHZ_MODE'] = 'claims'
+    
+    @jwt_required()
+    @profesor_required()
+    def ruta_protegida():
+        return 'ok'
+    
+    with aplicacion.test_request_context(headers=profesor_headers):
+        ruta_protegida()
+        with contar_sql(aplicacion) as sentencias:
+            assert ruta_protegida() == 'ok'
+    
+    assert sentencias == []
+
+def test_cambio_de_rol_invalida_el_token_al_momento(aplicacion, client, profesor_headers):
+    aplicacion.config['AUTHZ_MODE'] = 'claims'
+    assert client.post('/api/pokemon', json=POKEMON, headers=profesor_headers).status_code == 201
+    
+    _modificar_usuario(aplicacion, 'profesor@universidad.edu', rol='trainer')
+    
+    response = client.post('/api/pokemon', json=POKEMON, headers=profesor_headers)
+    assert response.status_code == 401
+    assert response.get_json()['error'] == 'Token obsoleto'
+
+def test_desactivacion_invalida_el_token(aplicacion, client, trainer_headers):
+    aplicacion.config['AUTHZ_MODE'] = 'claims'
+    assert client.get('/api/pokemon', headers=trainer_headers).status_code == 200
+    
+    _modificar_usuario(aplicacion, 'ash@pokemon.com', activo=False)
+    
+    assert client.get('/api/pokemon', headers=trainer_headers).status_code == 401
+
+def test_nuevo_login_recibe_la_epoca_actual(aplicacion, client):
+    aplicacion.config['AUTHZ_MODE'] = 'claims'
+    _modificar_usuario(aplicacion, 'misty@pokemon.com', rol='profesor')
+    
+    headers = login(client, 'misty@pokemon.com', 'misty123')
+    
+    assert client.post('/api/pokemon', json=POKEMON, headers=headers).status_code == 201
+
+def test_cambio_deshecho_no_adelanta_la_epoca(aplicacion, client, trainer_headers):
+    aplicacion.config['AUTHZ_MODE'] = 'claims'
+    with aplicacion.app_context():
+        usuario = Usuario.query.filter_by(email='ash@pokemon.com').first()
+        usuario.rol = 'profesor'
+        db.session.flush()
+        db.session.rollback()
+        assert epoch_registry.epoch('ash@pokemon.com') == 0
+    
+    assert client.get('/api/pokemon', headers=trainer_headers).status_code == 200
+
+def test_modo_db_no_comprueba_epocas(aplicacion, client, profesor_headers):
+    _modificar_usuario(aplicacion, 'profesor@universidad.edu', nombre='Oak')
+    _modificar_usuario(aplicacion, 'profesor@universidad.edu', activo=False)
+    
+    assert client.get('/auth/me', headers=profesor_headers).status_code == 200
@@ -0,0 +1,75 @@
+"""
+Pruebas de la carga masiva POST /api/pokemon/bulk.
+"""
+import json
+from Models.Pokemon import Pokemon
+from Test.conftest import contar_sql
+
+def _pokemon(i, **cambios):
+    datos = {'nombre': f'Pokemon {i}', 'tipo': 'Agua', 'nivel': 10, 'poder_ataque': 40.0,
+             'poder_defensa': 35.5, 'hp': 60, 'descripcion': 'Carga masiva'}
+    datos.update(cambios)
+    return datos
+
+def test_array_con_errores_por_elemento(aplicacion, client, profesor_headers):
+    items = [_pokemon(i) for i in range(5)]
+    items[1]['nivel'] = -3
+    del items[3]['hp']
+    
+    response = client.post('/api/pokemon/bulk', json=items, headers=profesor_headers)
+    
+    assert response.status_code == 201
+    datos = response.get_json()
+    assert datos['creados'] == 3
+    assert [error['indice'] for error in datos['errores']] == [1, 3]
+    with aplicacion.app_context():
+        assert Pokemon.query.count() == 3
+
+def test_ndjson(aplicacion, client, profesor_headers):
+    lineas = [json.dumps(_pokemon(i)) for i in range(3)] + ['{no es json']
+    
+    response = client.post('/api/pokemon/bulk', data='\n'.join(lineas),
+                           content_type='application/x-ndjson', headers=profesor_headers)
+    
+    datos = response.get_json()
+    assert datos['creados'] == 3
+    assert datos['errores'][0]['indice'] == 3
+
+def test_una_transaccion_con_inserts_por_bloques(aplicacion, client, profesor_headers):
+    client.get('/auth/me', headers=profesor_headers)
+    items = [_pokemon(i) for i in range(2500)]
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.post('/api/pokemon/bulk', json={'pokemons': items}, headers=profesor_headers)
+    
+    assert response.get_json()['creados'] == 2500
+    inserts = [s for s in sentencias if s.lstrip().upper().startswith('INSERT INTO POKEMON ')]
+    assert len(inserts) <= 3
+
+def test_cuerpo_invalido_o_sin_pokemons_validos(client, profesor_headers, trainer_headers):
+    assert client.post('/api/pokemon/bulk', json={'x': 1}, headers=profesor_headers).status_code == 400
+    assert client.post('/api/pokemon/bulk', json=[{'nombre': 'X'}], headers=profesor_headers).status_code == 400
+    assert client.post('/api/pokemon/bulk', json=[_pokemon(1)], headers=trainer_headers).status_code == 403
+
+def _tipos_por_pokemon(aplicacion):
+    from Models.PokemonTipo import PokemonTipo
+    with aplicacion.app_context():
+        tipos = {}
+        for fila in PokemonTipo.query.all():
+            tipos.setdefault(fila.pokemon_id, set()).add(fila.tipo)
+        return {pokemon.nombre: tipos.get(pokemon.id) for pokemon in Pokemon.query.all()}
+
+def test_tipos_con_returning_y_sin_el(aplicacion, client, profesor_headers, monkeypatch):
+    from Config.DataBase import db
+    items = [_pokemon(i, tipo=['Agua', 'Fuego/Volador'][i % 2]) for i in range(6)]
+    client.post('/api/pokemon/bulk', json=items[:3], headers=profesor_headers)
+    
+    # Sin RETURNING (MySQL): los ids se leen por rango después del INSERT
+    with aplicacion.app_context():
+        dialecto = db.engine.dialect
+    monkeypatch.setattr(dialecto, 'insert_executemany_returning', False)
+    client.post('/api/pokemon/bulk', json=items[3:], headers=profesor_headers)
+    
+    assert _tipos_por_pokemon(aplicacion) == {
+        f'Pokemon {i}': [{'agua'}, {'fuego', 'volador'}][i % 2] for i in range(6)
+    }
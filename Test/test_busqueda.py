@@ -0,0 +1,99 @@
+"""
+Pruebas de la búsqueda de texto completo (GET /api/pokemon/search) y del
+índice FTS5 que la respalda en SQLite.
+"""
+from sqlalchemy import text
+from Config.DataBase import db
+from Models.Pokemon import Pokemon
+from Services.PokemonService import PokemonService
+from Test.conftest import crear_pokemons
+
+CATALOGO = [
+    ('Mewtwo', 'Pokémon Psíquico creado por ingeniería genética'),
+    ('Alakazam', 'Su cerebro psíquico no deja de crecer'),
+    ('Charizard', 'Escupe fuego capaz de fundir rocas'),
+    ('Psyduck', 'Sufre dolores de cabeza constantes'),
+]
+
+def _crear(aplicacion, catalogo=CATALOGO):
+    with aplicacion.app_context():
+        ids = crear_pokemons(len(catalogo))
+        for pokemon_id, (nombre, descripcion) in zip(ids, catalogo):
+            pokemon = db.session.get(Pokemon, pokemon_id)
+            pokemon.nombre, pokemon.descripcion = nombre, descripcion
+        db.session.commit()
+        return ids
+
+def _buscar(client, headers, q, **params):
+    response = client.get('/api/pokemon/search', headers=headers, query_string={'q': q, **params})
+    assert response.status_code == 200, response.get_json()
+    return [p['nombre'] for p in response.get_json()['pokemons']]
+
+def test_busqueda_ignora_acentos_y_mayusculas(aplicacion, client, profesor_headers):
+    _crear(aplicacion)
+    
+    assert _buscar(client, profesor_headers, 'psiquico') == ['Mewtwo', 'Alakazam']
+    assert _buscar(client, profesor_headers, 'PSÍQUICO genética') == ['Mewtwo']
+    assert _buscar(client, profesor_headers, 'fueg') == ['Charizard']
+    assert _buscar(client, profesor_headers, 'dragon') == []
+
+def test_coincidencia_en_nombre_va_primero(aplicacion, client, profesor_headers):
+    _crear(aplicacion, [
+        ('Golduck', 'Evoluciona de Psyduck'),
+        ('Psyduck', 'Sufre dolores de cabeza constantes'),
+    ])
+    
+    assert _buscar(client, profesor_headers, 'psyduck') == ['Psyduck', 'Golduck']
+    assert _buscar(client, profesor_headers, 'psyduck', limit=1) == ['Psyduck']
+
+def test_indice_sincronizado_al_actualizar_y_eliminar(aplicacion, client, profesor_headers):
+    ids = _crear(aplicacion)
+    
+    response = client.put(f'/api/pokemon/{ids[2]}', headers=profesor_headers,
+                          json={'descripcion': 'Vuela alto buscando rivales'})
+    assert response.status_code == 200
+    assert _buscar(client, profesor_headers, 'fuego') == []
+    assert _buscar(client, profesor_headers, 'rivales') == ['Charizard']
+    
+    assert client.delete(f'/api/pokemon/{ids[0]}', headers=profesor_headers).status_code == 200
+    assert _buscar(client, profesor_headers, 'psiquico') == ['Alakazam']
+
+def test_carga_en_bloque_queda_indexada(client, profesor_headers):
+    pokemons = [{'nombre': f'Eevee {i}', 'tipo': 'Normal', 'nivel': 5, 'poder_ataque': 55,
+                 'poder_defensa': 50, 'hp': 55, 'descripcion': f'Evolución número {i}'} for i in range(30)]
+    response = client.post('/api/pokemon/bulk', headers=profesor_headers, json=pokemons)
+    assert response.status_code == 201
+    
+    assert len(_buscar(client, profesor_headers, 'evolucion', limit=100)) == 30
+    assert _buscar(client, profesor_headers, 'eevee 17') == ['Eevee 17']
+
+def test_trainer_busca_solo_en_su_coleccion(aplicacion, client, profesor_headers, trainer_headers):
+    ids = _crear(aplicacion)
+    response = client.post(f'/api/pokemon/{ids[1]}/asignar', headers=profesor_headers,
+                           json={'trainer_email': 'ash@pokemon.com'})
+    assert response.status_code == 201, response.get_json()
+    
+    assert _buscar(client, trainer_headers, 'psiquico') == ['Alakazam']
+    assert _buscar(client, trainer_headers, 'fuego') == []
+
+def test_consulta_vacia_responde_400(client, profesor_headers):
+    for q in ('', '  ', '¡¿?!'):
+        response = client.get('/api/pokemon/search', headers=profesor_headers, query_string={'q': q})
+        assert response.status_code == 400
+    assert client.get('/api/pokemon/search', headers=profesor_headers).status_code == 400
+
+def test_reconstruir_indice(aplicacion, client, profesor_headers):
+    _crear(aplicacion)
+    with aplicacion.app_context():
+        # Simula una BD creada antes de la búsqueda: sin tabla FTS ni triggers
+        db.session.execute(text('DROP TABLE pokemon_fts'))
+        db.session.commit()
+    
+        assert PokemonService().reconstruir_indice_busqueda() == 'pokemon_fts'
+    
+    assert _buscar(client, profesor_headers, 'cerebro') == ['Alakazam']
+
+def test_comando_reindex_busqueda(aplicacion):
+    resultado = aplicacion.test_cli_runner().invoke(args=['reindex-busqueda'])
+    assert resultado.exit_code == 0, resultado.output
+    assert 'pokemon_fts' in resultado.output
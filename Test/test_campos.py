@@ -0,0 +1,87 @@
+"""
+Pruebas de la selección de campos (?fields=): proyección en la consulta SQL y
+recorte del JSON en el listado, el detalle, el streaming y las capturas.
+"""
+import json
+import pytest
+from Test.conftest import contar_sql, crear_pokemons, sin_versiones
+from Utils.campos import parse_campos
+
+def _consultas_pokemon(sentencias):
+    return [s for s in sin_versiones(sentencias) if 'FROM pokemon' in s]
+
+def test_parse_campos():
+    assert parse_campos(None) is None
+    assert parse_campos(' ') is None
+    # Orden del modelo e id siempre incluido
+    assert parse_campos('tipo, nombre') == ('id', 'nombre', 'tipo')
+    assert parse_campos('id,hp,hp') == ('id', 'hp')
+    with pytest.raises(ValueError, match='password'):
+        parse_campos('nombre,password')
+
+def test_listado_con_campos(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        crear_pokemons(3, descripcion='x' * 1000)
+    completo = client.get('/api/pokemon', headers=profesor_headers)
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.get('/api/pokemon?fields=nombre,tipo', headers=profesor_headers)
+    
+    assert response.status_code == 200
+    pokemons = response.get_json()['pokemons']
+    assert [set(p) for p in pokemons] == [{'id', 'nombre', 'tipo'}] * 3
+    assert len(response.data) * 10 < len(completo.data)
+    # Solo se leen las columnas pedidas
+    consulta, = _consultas_pokemon(sentencias)
+    assert 'pokemon.nombre' in consulta
+    assert 'descripcion' not in consulta and 'nivel' not in consulta.split('WHERE')[0]
+
+def test_campos_y_listado_completo_no_comparten_cache(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    
+    for _ in range(2):
+        parcial = client.get('/api/pokemon?fields=nombre', headers=profesor_headers).get_json()
+        completo = client.get('/api/pokemon', headers=profesor_headers).get_json()
+        assert parcial['pokemons'] == [{'id': pokemon_id, 'nombre': 'Pokemon 0'}]
+        assert 'descripcion' in completo['pokemons'][0]
+        
+        detalle = client.get(f'/api/pokemon/{pokemon_id}?fields=hp', headers=profesor_headers).get_json()
+        assert detalle['pokemon'] == {'id': pokemon_id, 'hp': 100}
+        detalle = client.get(f'/api/pokemon/{pokemon_id}', headers=profesor_headers).get_json()
+        assert len(detalle['pokemon']) == 8
+
+def test_streaming_con_campos(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        crear_pokemons(3)
+    
+    response = client.get('/api/pokemon?stream=1&fields=nivel', headers=profesor_headers)
+    
+    datos = json.loads(response.get_data(as_text=True))
+    assert [set(p) for p in datos['pokemons']] == [{'id', 'nivel'}] * 3
+
+def test_capturas_con_campos(aplicacion, client, profesor_headers, trainer_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers,
+                json={'trainer_email': 'ash@pokemon.com', 'apodo': 'Chispitas'})
+    
+    with contar_sql(aplicacion) as sentencias:
+        captura, = client.get('/api/pokemon?fields=nombre,tipo', headers=trainer_headers).get_json()['pokemons_capturados']
+    assert captura['apodo'] == 'Chispitas'
+    assert captura['pokemon'] == {'id': pokemon_id, 'nombre': 'Pokemon 0', 'tipo': 'Fuego/Volador'}
+    assert not [s for s in sin_versiones(sentencias) if 'descripcion' in s]
+    
+    captura = client.get(f'/api/pokemon/{pokemon_id}?fields=tipo', headers=trainer_headers).get_json()['pokemon']
+    assert captura['pokemon'] == {'id': pokemon_id, 'tipo': 'Fuego/Volador'}
+    
+    response = client.get('/api/pokemon?stream=1&fields=nombre', headers=trainer_headers)
+    captura, = json.loads(response.get_data(as_text=True))['pokemons_capturados']
+    assert captura['pokemon'] == {'id': pokemon_id, 'nombre': 'Pokemon 0'}
+
+def test_campo_desconocido_responde_400(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    
+    assert client.get('/api/pokemon?fields=nombre,secreto', headers=profesor_headers).status_code == 400
+    assert client.get(f'/api/pokemon/{pokemon_id}?fields=secreto', headers=profesor_headers).status_code == 400
@@ -0,0 +1,58 @@
+"""
+Pruebas de que la colección del entrenador se lee con un número fijo de
+sentencias SQL, sin importar cuántas capturas tenga (sin N+1).
+"""
+from Config.DataBase import db
+from Models.PokemonCapturado import PokemonCapturado
+from Models.Usuario import Usuario
+from Test.conftest import contar_sql, crear_pokemons, sin_versiones
+
+def _capturar(aplicacion, email, n):
+    with aplicacion.app_context():
+        usuario = Usuario.query.filter_by(email=email).first()
+        ids = crear_pokemons(n)
+        for pokemon_id in ids:
+            db.session.add(PokemonCapturado(usuario_id=usuario.id, pokemon_id=pokemon_id, apodo='Apodo'))
+        db.session.commit()
+        return ids
+
+def _sentencias_listado(aplicacion, client, headers):
+    with contar_sql(aplicacion) as sentencias:
+        response = client.get('/api/pokemon', query_string={'limit': 500}, headers=headers)
+    assert response.status_code == 200
+    return len(sin_versiones(sentencias)), len(response.get_json()['pokemons_capturados'])
+
+def test_listado_con_numero_fijo_de_sentencias(aplicacion, client, trainer_headers):
+    client.get('/auth/me', headers=trainer_headers)
+    _capturar(aplicacion, 'ash@pokemon.com', 3)
+    pocas, total_pocas = _sentencias_listado(aplicacion, client, trainer_headers)
+    
+    _capturar(aplicacion, 'ash@pokemon.com', 120)
+    muchas, total_muchas = _sentencias_listado(aplicacion, client, trainer_headers)
+    
+    assert (total_pocas, total_muchas) == (3, 123)
+    assert pocas == muchas == 1
+
+def test_detalle_y_liberacion_usan_una_consulta(aplicacion, client, trainer_headers):
+    client.get('/auth/me', headers=trainer_headers)
+    pokemon_id = _capturar(aplicacion, 'ash@pokemon.com', 2)[0]
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.get(f'/api/pokemon/{pokemon_id}', headers=trainer_headers)
+    assert response.status_code == 200
+    assert response.get_json()['pokemon']['pokemon']['id'] == pokemon_id
+    assert len(sin_versiones(sentencias)) == 1
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.delete(f'/api/pokemon/{pokemon_id}', headers=trainer_headers)
+    assert response.status_code == 200
+    assert response.get_json()['pokemon_liberado'] == 'Pokemon 0'
+    selects = [s for s in sin_versiones(sentencias) if s.lstrip().upper().startswith('SELECT')]
+    assert len(selects) == 1
+
+def test_detalle_de_pokemon_inexistente_o_no_capturado(aplicacion, client, trainer_headers):
+    with aplicacion.app_context():
+        ajeno = crear_pokemons(1)[0]
+    
+    assert client.get(f'/api/pokemon/{ajeno}', headers=trainer_headers).status_code == 403
+    assert client.get('/api/pokemon/9999', headers=trainer_headers).status_code == 404
@@ -0,0 +1,120 @@
+"""
+Pruebas de la compresión de respuestas: negociación con Accept-Encoding,
+umbral de tamaño, streaming incremental y reutilización de variantes.
+"""
+import gzip
+import json
+import zlib
+from flask import Flask, Response
+from Test.conftest import crear_pokemons
+from Utils.cache import TTLCache
+from Utils.compresion import Compresion, codificaciones_disponibles, comprimir, variantes_cache
+
+GZIP = {'Accept-Encoding': 'gzip'}
+
+def _app_minima(**opciones):
+    app = Flask(__name__)
+    app.after_request(Compresion(cache=TTLCache(maxsize=8, ttl=None), **opciones))
+    
+    @app.route('/texto/<int:n>')
+    def texto(n):
+        return Response('a' * n, mimetype='text/plain')
+    
+    @app.route('/binario')
+    def binario():
+        return Response(b'\x00' * 5000, mimetype='application/octet-stream')
+    
+    @app.route('/stream')
+    def stream():
+        return Response((json.dumps({'i': i}) + '\n' for i in range(1000)), mimetype='application/json')
+    
+    return app
+
+def test_negociacion_y_umbral():
+    client = _app_minima(min_size=100).test_client()
+    
+    response = client.get('/texto/5000', headers=GZIP)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert int(response.headers['Content-Length']) == len(response.data) < 100
+    assert gzip.decompress(response.data) == b'a' * 5000
+    
+    # Sin Accept-Encoding, con q=0 o por debajo del umbral: sin comprimir
+    for headers, n in (({}, 5000), ({'Accept-Encoding': 'gzip;q=0, identity'}, 5000), (GZIP, 50)):
+        response = client.get(f'/texto/{n}', headers=headers)
+        assert 'Content-Encoding' not in response.headers
+        assert response.data == b'a' * n
+    
+    # Tipos no comprimibles
+    assert 'Content-Encoding' not in client.get('/binario', headers=GZIP).headers
+
+def test_codificaciones_no_instaladas_se_ignoran():
+    assert codificaciones_disponibles(['desconocida', 'gzip']) == ['gzip']
+    client = _app_minima(algoritmos=['desconocida', 'gzip']).test_client()
+    
+    response = client.get('/texto/5000', headers={'Accept-Encoding': 'desconocida, gzip;q=0.5'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+def test_streaming_incremental():
+    client = _app_minima().test_client()
+    
+    response = client.get('/stream', headers=GZIP)
+    
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    trozos = list(response.response)
+    # Cada trozo del generador sale ya comprimido y descomprimible por separado
+    assert len(trozos) > 1000
+    descompresor = zlib.decompressobj(31)
+    primero = descompresor.decompress(trozos[0])
+    assert primero == b'{"i": 0}\n'
+    resto = b''.join(descompresor.decompress(t) for t in trozos[1:])
+    assert (primero + resto).decode().splitlines()[-1] == '{"i": 999}'
+
+def test_listado_comprimido_y_etag(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        crear_pokemons(50)
+    sin_comprimir = client.get('/api/pokemon', headers=profesor_headers)
+    
+    response = client.get('/api/pokemon', headers={**profesor_headers, **GZIP})
+    
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(response.data) * 5 < len(sin_comprimir.data)
+    assert json.loads(gzip.decompress(response.data)) == sin_comprimir.get_json()
+    # El ETag pasa a débil y sigue valiendo para If-None-Match
+    etag = response.headers['ETag']
+    assert etag == 'W/' + sin_comprimir.headers['ETag']
+    response = client.get('/api/pokemon', headers={**profesor_headers, **GZIP, 'If-None-Match': etag})
+    assert response.status_code == 304
+    # Mismo Vary que el 200, para que una caché intermedia no mezcle variantes
+    assert response.headers['Vary'] == sin_comprimir.headers['Vary'] == 'Authorization, Accept-Encoding'
+
+def test_variantes_comprimidas_se_reutilizan(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        ids = crear_pokemons(50)
+    headers = {**profesor_headers, **GZIP}
+    
+    primera = client.get('/api/pokemon', headers=headers)
+    segunda = client.get('/api/pokemon', headers=headers)
+    
+    assert primera.data == segunda.data
+    assert variantes_cache.stats()['hits'] == 1
+    assert variantes_cache.stats()['size'] == 1
+    
+    # Otra versión del catálogo es otro cuerpo: nueva variante
+    client.put(f'/api/pokemon/{ids[0]}', headers=profesor_headers, json={'nivel': 99})
+    tercera = client.get('/api/pokemon', headers=headers)
+    assert json.loads(gzip.decompress(tercera.data))['pokemons'][0]['nivel'] == 99
+    assert variantes_cache.stats()['size'] == 2
+
+def test_listado_en_streaming_comprimido(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        crear_pokemons(30)
+    
+    response = client.get('/api/pokemon?stream=1', headers={**profesor_headers, **GZIP})
+    
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert len(json.loads(gzip.decompress(response.data))['pokemons']) == 30
+
+def test_comprimir_gzip():
+    assert gzip.decompress(comprimir('gzip', b'hola' * 100, 6)) == b'hola' * 100
@@ -0,0 +1,98 @@
+"""
+Pruebas de las estadísticas agregadas (GET /api/pokemon/stats): cálculo con
+agregados SQL, memorización entre escrituras y variante del trainer.
+"""
+from Config.DataBase import db
+from Models.Pokemon import Pokemon
+from Test.conftest import contar_sql, crear_pokemons, sin_versiones
+
+CATALOGO = [
+    # nombre, tipo, nivel, poder_ataque, hp
+    ('Charizard', 'Fuego/Volador', 36, 84.0, 78),
+    ('Charmander', 'Fuego', 5, 52.0, 39),
+    ('Pidgeot', 'Normal/Volador', 38, 80.0, 83),
+    ('Mewtwo', 'Psíquico', 70, 110.0, 106),
+]
+
+def _crear(aplicacion, catalogo=CATALOGO):
+    with aplicacion.app_context():
+        ids = []
+        for nombre, tipo, nivel, poder_ataque, hp in catalogo:
+            ids += crear_pokemons(1, tipo=tipo, nivel=nivel, poder_ataque=poder_ataque, hp=hp)
+            db.session.get(Pokemon, ids[-1]).nombre = nombre
+        db.session.commit()
+        return ids
+
+def _estadisticas(client, headers):
+    response = client.get('/api/pokemon/stats', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()['estadisticas']
+
+def test_estadisticas_del_catalogo(aplicacion, client, profesor_headers):
+    _crear(aplicacion)
+    
+    estadisticas = _estadisticas(client, profesor_headers)
+    
+    assert estadisticas['total'] == 4
+    assert estadisticas['por_tipo'] == [
+        {'tipo': 'fuego', 'total': 2}, {'tipo': 'volador', 'total': 2},
+        {'tipo': 'normal', 'total': 1}, {'tipo': 'psiquico', 'total': 1},
+    ]
+    assert estadisticas['nivel'] == {
+        'min': 5, 'max': 70, 'media': 37.25,
+        'distribucion': [
+            {'desde': 0, 'hasta': 10, 'total': 1},
+            {'desde': 30, 'hasta': 40, 'total': 2},
+            {'desde': 70, 'hasta': 80, 'total': 1},
+        ]
+    }
+    assert estadisticas['poder_ataque']['media'] == 81.5
+    assert [i['desde'] for i in estadisticas['poder_ataque']['distribucion']] == [50, 80, 110]
+    assert estadisticas['hp']['max'] == 106
+
+def test_catalogo_vacio(client, profesor_headers):
+    estadisticas = _estadisticas(client, profesor_headers)
+    
+    assert estadisticas['total'] == 0
+    assert estadisticas['por_tipo'] == []
+    assert estadisticas['nivel'] == {'min': None, 'max': None, 'media': None, 'distribucion': []}
+
+def test_memorizadas_hasta_la_siguiente_escritura(aplicacion, client, profesor_headers):
+    ids = _crear(aplicacion)
+    _estadisticas(client, profesor_headers)
+    
+    # Sin escrituras, solo se leen los contadores de versión
+    with contar_sql(aplicacion) as sentencias:
+        assert _estadisticas(client, profesor_headers)['total'] == 4
+    assert not [s for s in sin_versiones(sentencias) if 'pokemon' in s]
+    
+    assert client.delete(f'/api/pokemon/{ids[1]}', headers=profesor_headers).status_code == 200
+    estadisticas = _estadisticas(client, profesor_headers)
+    assert estadisticas['total'] == 3
+    assert {'tipo': 'fuego', 'total': 1} in estadisticas['por_tipo']
+
+def test_estadisticas_del_trainer(aplicacion, client, profesor_headers, trainer_headers):
+    ids = _crear(aplicacion)
+    assert _estadisticas(client, trainer_headers)['total'] == 0
+    
+    for pokemon_id in ids[:2]:
+        response = client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers,
+                               json={'trainer_email': 'ash@pokemon.com'})
+        assert response.status_code == 201
+    
+    response = client.get('/api/pokemon/stats', headers=trainer_headers)
+    assert response.get_json()['entrenador'] == 'Ash Ketchum'
+    estadisticas = response.get_json()['estadisticas']
+    assert estadisticas['total'] == 2
+    assert estadisticas['por_tipo'] == [{'tipo': 'fuego', 'total': 2}, {'tipo': 'volador', 'total': 1}]
+    assert estadisticas['nivel']['media'] == 20.5
+    
+    # Las estadísticas del catálogo no cambian con las asignaciones
+    assert _estadisticas(client, profesor_headers)['total'] == 4
+
+def test_etag_y_304(aplicacion, client, profesor_headers):
+    _crear(aplicacion)
+    etag = client.get('/api/pokemon/stats', headers=profesor_headers).headers['ETag']
+    
+    response = client.get('/api/pokemon/stats', headers={**profesor_headers, 'If-None-Match': etag})
+    assert response.status_code == 304
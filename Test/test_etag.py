@@ -0,0 +1,61 @@
+"""
+Pruebas de ETag / If-None-Match en las lecturas del catálogo y de la colección.
+"""
+from Test.conftest import contar_sql, crear_pokemons
+
+def _etag(client, url, headers):
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200
+    assert 'Authorization' in response.headers['Vary']
+    return response.headers['ETag']
+
+def test_304_sin_consultar_los_datos(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        crear_pokemons(3)
+    etag = _etag(client, '/api/pokemon', profesor_headers)
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.get('/api/pokemon', headers={**profesor_headers, 'If-None-Match': etag})
+    
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert len(sentencias) == 1
+    assert 'version_datos' in sentencias[0]
+
+def test_escrituras_del_catalogo_cambian_el_etag(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    etag = _etag(client, f'/api/pokemon/{pokemon_id}', profesor_headers)
+    
+    client.put(f'/api/pokemon/{pokemon_id}', headers=profesor_headers, json={'nivel': 50})
+    
+    response = client.get(f'/api/pokemon/{pokemon_id}', headers={**profesor_headers, 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.get_json()['pokemon']['nivel'] == 50
+    assert response.headers['ETag'] != etag
+
+def test_asignar_y_liberar_cambian_el_etag_del_trainer(aplicacion, client, profesor_headers, trainer_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    etag_vacia = _etag(client, '/api/pokemon', trainer_headers)
+    
+    client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers,
+                json={'trainer_email': 'ash@pokemon.com'})
+    etag_con_captura = _etag(client, '/api/pokemon', trainer_headers)
+    assert etag_con_captura != etag_vacia
+    
+    # Otra colección no afecta al ETag de este trainer
+    client.post('/api/pokemon/asignar', headers=profesor_headers,
+                json=[{'pokemon_id': pokemon_id, 'trainer_email': 'misty@pokemon.com'}])
+    assert client.get('/api/pokemon', headers={**trainer_headers, 'If-None-Match': etag_con_captura}).status_code == 304
+    
+    client.delete(f'/api/pokemon/{pokemon_id}', headers=trainer_headers)
+    assert _etag(client, '/api/pokemon', trainer_headers) not in (etag_vacia, etag_con_captura)
+
+def test_etag_distinto_por_usuario(aplicacion, client, profesor_headers, trainer_headers):
+    etag_profesor = _etag(client, '/api/pokemon', profesor_headers)
+    
+    response = client.get('/api/pokemon', headers={**trainer_headers, 'If-None-Match': etag_profesor})
+    
+    assert response.status_code == 200
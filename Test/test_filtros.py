@@ -0,0 +1,113 @@
+"""
+Pruebas de los filtros del listado (tipo, nombre y rangos) y de la tabla de
+tipos normalizados pokemon_tipo.
+"""
+from sqlalchemy import select
+from Config.DataBase import db
+from Models.Pokemon import Pokemon
+from Models.PokemonTipo import PokemonTipo
+from Test.conftest import crear_pokemons
+
+def _crear(aplicacion, *pokemons):
+    """Crea pokémons con (nombre, tipo, nivel, hp) y retorna sus ids."""
+    with aplicacion.app_context():
+        ids = []
+        for nombre, tipo, nivel, hp in pokemons:
+            ids += crear_pokemons(1, tipo=tipo, nivel=nivel, hp=hp)
+            db.session.get(Pokemon, ids[-1]).nombre = nombre
+        db.session.commit()
+        return ids
+
+def _nombres(response):
+    assert response.status_code == 200, response.get_json()
+    datos = response.get_json()
+    if 'pokemons' in datos:
+        return [p['nombre'] for p in datos['pokemons']]
+    return [c['pokemon']['nombre'] for c in datos['pokemons_capturados']]
+
+CATALOGO = [
+    ('Charizard', 'Fuego/Volador', 36, 78),
+    ('Pidgeot', 'Normal/Volador', 36, 83),
+    ('Charmander', 'Fuego', 5, 39),
+    ('Mewtwo', 'Psíquico', 70, 106),
+    ('Pikachu', 'Eléctrico', 25, 35),
+]
+
+def test_tipos_normalizados_al_crear_y_actualizar(aplicacion):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1, tipo='Fuego / Volador')[0]
+        tipos = lambda: sorted(db.session.execute(
+            select(PokemonTipo.tipo).where(PokemonTipo.pokemon_id == pokemon_id)).scalars())
+        assert tipos() == ['fuego', 'volador']
+        
+        db.session.get(Pokemon, pokemon_id).tipo = 'Psíquico/Fuego'
+        db.session.commit()
+        assert tipos() == ['fuego', 'psiquico']
+        
+        db.session.delete(db.session.get(Pokemon, pokemon_id))
+        db.session.commit()
+        assert tipos() == []
+
+def test_filtro_por_tipo_individual(aplicacion, client, profesor_headers):
+    _crear(aplicacion, *CATALOGO)
+    
+    assert _nombres(client.get('/api/pokemon?tipo=Volador', headers=profesor_headers)) == ['Charizard', 'Pidgeot']
+    assert _nombres(client.get('/api/pokemon?tipo=fuego', headers=profesor_headers)) == ['Charizard', 'Charmander']
+    assert _nombres(client.get('/api/pokemon?tipo=psiquico', headers=profesor_headers)) == ['Mewtwo']
+
+def test_filtros_por_rango_y_prefijo(aplicacion, client, profesor_headers):
+    _crear(aplicacion, *CATALOGO)
+    
+    assert _nombres(client.get('/api/pokemon?tipo=fuego&nivel_min=30', headers=profesor_headers)) == ['Charizard']
+    assert _nombres(client.get('/api/pokemon?nivel_min=25&nivel_max=36', headers=profesor_headers)) == [
+        'Charizard', 'Pidgeot', 'Pikachu']
+    assert _nombres(client.get('/api/pokemon?hp_min=80', headers=profesor_headers)) == ['Pidgeot', 'Mewtwo']
+    assert _nombres(client.get('/api/pokemon?nombre=char', headers=profesor_headers)) == ['Charizard', 'Charmander']
+    assert _nombres(client.get('/api/pokemon?nombre=%25', headers=profesor_headers)) == []
+
+def test_filtro_paginado_por_cursor(aplicacion, client, profesor_headers):
+    _crear(aplicacion, *CATALOGO * 3)
+    
+    nombres, cursor = [], ''
+    while cursor is not None:
+        response = client.get(f'/api/pokemon?tipo=volador&limit=2&cursor={cursor}', headers=profesor_headers)
+        nombres += _nombres(response)
+        cursor = response.get_json()['paginacion']['next_cursor']
+    
+    assert nombres == ['Charizard', 'Pidgeot'] * 3
+
+def test_filtros_invalidos_responden_400(client, profesor_headers):
+    for query in ('nivel_min=alto', 'poder_ataque_max=x', 'nivel_min=50&nivel_max=10'):
+        response = client.get(f'/api/pokemon?{query}', headers=profesor_headers)
+        assert response.status_code == 400, query
+
+def test_trainer_filtra_su_coleccion(aplicacion, client, profesor_headers, trainer_headers):
+    ids = _crear(aplicacion, *CATALOGO)
+    for pokemon_id in ids[:3]:
+        client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers,
+                    json={'trainer_email': 'ash@pokemon.com'})
+    
+    assert _nombres(client.get('/api/pokemon?tipo=fuego', headers=trainer_headers)) == ['Charizard', 'Charmander']
+    assert _nombres(client.get('/api/pokemon?tipo=volador&nivel_max=30', headers=trainer_headers)) == []
+    assert _nombres(client.get('/api/pokemon?tipo=psiquico', headers=trainer_headers)) == []
+
+def test_carga_en_bloque_rellena_los_tipos(aplicacion, client, profesor_headers):
+    pokemons = [{'nombre': f'P{i}', 'tipo': 'Agua/Hielo' if i % 2 else 'Agua', 'nivel': 10,
+                 'poder_ataque': 1.0, 'poder_defensa': 1.0, 'hp': 10} for i in range(10)]
+    assert client.post('/api/pokemon/bulk', json=pokemons, headers=profesor_headers).status_code == 201
+    
+    assert len(_nombres(client.get('/api/pokemon?tipo=agua', headers=profesor_headers))) == 10
+    assert _nombres(client.get('/api/pokemon?tipo=hielo', headers=profesor_headers)) == [
+        f'P{i}' for i in range(1, 10, 2)]
+
+def test_reindex_tipos_regenera_la_tabla(aplicacion):
+    with aplicacion.app_context():
+        crear_pokemons(3, tipo='Roca/Tierra')
+        db.session.execute(PokemonTipo.__table__.delete())
+        db.session.commit()
+    
+    resultado = aplicacion.test_cli_runner().invoke(args=['reindex-tipos'])
+    
+    assert resultado.exit_code == 0, resultado.output
+    with aplicacion.app_context():
+        assert db.session.query(PokemonTipo).count() == 6
@@ -0,0 +1,54 @@
+"""
+Pruebas de los fragmentos JSON precodificados por pokémon.
+"""
+from flask import jsonify
+from Models.Pokemon import Pokemon
+from Services.PokemonService import fragmentos_cache
+from Utils.json_fragmentos import JSONCrudo, codificar, respuesta_json
+from Test.conftest import crear_pokemons
+
+def test_respuesta_identica_a_jsonify(aplicacion):
+    datos = {'nombre': 'Ñandú "raro"', 'lista': [1, 2.5, None], 'texto': '\x00fragmento-0:1'}
+    with aplicacion.test_request_context():
+        esperado = jsonify({'rol': 'profesor', 'pokemons': [datos, datos], 'total': 2}).get_data()
+        fragmento = JSONCrudo(codificar(datos))
+        obtenido = respuesta_json({'rol': 'profesor', 'pokemons': [fragmento, fragmento], 'total': 2}).get_data()
+    assert obtenido == esperado
+
+def test_listado_reutiliza_los_fragmentos(aplicacion, client, profesor_headers, monkeypatch):
+    with aplicacion.app_context():
+        crear_pokemons(5)
+    primera = client.get('/api/pokemon', headers=profesor_headers)
+    assert fragmentos_cache.stats()['size'] == 5
+    
+    def sin_to_dict(self):
+        raise AssertionError('to_dict no debería llamarse con los fragmentos en caché')
+    monkeypatch.setattr(Pokemon, 'to_dict', sin_to_dict)
+    
+    segunda = client.get(f'/api/pokemon/{primera.get_json()["pokemons"][0]["id"]}', headers=profesor_headers)
+    assert segunda.status_code == 200
+    assert segunda.get_json()['pokemon'] == primera.get_json()['pokemons'][0]
+
+def test_capturas_con_fragmento_del_pokemon(aplicacion, client, profesor_headers, trainer_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers,
+                json={'trainer_email': 'ash@pokemon.com', 'apodo': 'Fueguito'})
+    
+    captura = client.get(f'/api/pokemon/{pokemon_id}', headers=trainer_headers).get_json()['pokemon']
+    
+    assert captura['apodo'] == 'Fueguito'
+    assert captura['pokemon']['id'] == pokemon_id
+    assert set(captura) == {'id', 'pokemon', 'apodo', 'fecha_captura'}
+
+def test_actualizar_regenera_el_fragmento(aplicacion, client, profesor_headers, trainer_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    client.post(f'/api/pokemon/{pokemon_id}/asignar', headers=profesor_headers,
+                json={'trainer_email': 'ash@pokemon.com'})
+    client.get('/api/pokemon', headers=trainer_headers)
+    
+    client.put(f'/api/pokemon/{pokemon_id}', headers=profesor_headers, json={'nombre': 'Renombrado'})
+    
+    capturas = client.get('/api/pokemon', headers=trainer_headers).get_json()['pokemons_capturados']
+    assert capturas[0]['pokemon']['nombre'] == 'Renombrado'
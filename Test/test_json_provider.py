@@ -0,0 +1,53 @@
+"""
+Pruebas de que el proveedor JSON rápido produce los mismos bytes que el de Flask.
+"""
+import uuid
+from datetime import datetime, date
+from decimal import Decimal
+import pytest
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from Utils.json_provider import FastJSONProvider, orjson
+
+CASOS = [
+    {'tipo': 'Psíquico', 'nombre': 'Mr. Mime 🎭', 'descripcion': 'Línea 1\nLínea\t2 \x01 "citas" \\ /'},
+    {'pokemons': [{'id': 1, 'poder_ataque': 84.5, 'hp': 266, 'descripcion': None}], 'total': 1, 'activo': True},
+    {'fecha_captura': datetime(2024, 3, 1, 12, 30, 5, 123456).isoformat(), 'fecha': datetime(2024, 3, 1, 12, 30)},
+    {'dia': date(2024, 3, 1), 'precio': Decimal('10.50'), 'uuid': uuid.UUID(int=7)},
+    {'grande': 2 ** 70, 'vacios': [[], {}], 'z': 1, 'a': {'y': 2, 'b': 3}},
+    {1: 'clave entera'},
+    ['\u2028', '\ud7ff', '\ue000', '\U0001f525', 'ñ' * 3],
+    {'barras': 'C:\\xe9\\U0001f525 é \\\\x41', 'emoji': '🔥'},
+]
+
+@pytest.fixture(params=[False, True], ids=['stdlib', 'orjson'])
+def proveedores(request):
+    if request.param and orjson is None:
+        pytest.skip('orjson no está instalado')
+    app = Flask(__name__)
+    return DefaultJSONProvider(app), FastJSONProvider(app, usar_orjson=request.param)
+
+@pytest.mark.parametrize('valor', CASOS)
+@pytest.mark.parametrize('argumentos', [{'separators': (',', ':')}, {'indent': 2}, {}])
+def test_mismos_bytes_que_flask(proveedores, valor, argumentos):
+    flask_json, rapido = proveedores
+    assert rapido.dumps(valor, **argumentos) == flask_json.dumps(valor, **argumentos)
+
+def test_respuestas_de_la_api_identicas(aplicacion, client, profesor_headers):
+    respuesta = client.post('/api/pokemon', headers=profesor_headers, json={
+        'nombre': 'Alakazam', 'tipo': 'Psíquico', 'nivel': 40, 'poder_ataque': 50,
+        'poder_defensa': 45.5, 'hp': 120, 'descripcion': 'Cuchara ñ'
+    })
+    assert b'Ps\\u00edquico' in respuesta.data
+    
+    pokemon_id = respuesta.get_json()['pokemon']['id']
+    obtenida = client.get(f'/api/pokemon/{pokemon_id}', headers=profesor_headers)
+    with aplicacion.test_request_context():
+        esperado = DefaultJSONProvider(aplicacion).response(obtenida.get_json()).get_data()
+    assert obtenida.data == esperado
+
+def test_loads(proveedores):
+    flask_json, rapido = proveedores
+    for texto in ('{"tipo": "Ps\\u00edquico", "n": [1, 2.5, null]}', b'[NaN]'):
+        resultado = rapido.loads(texto)
+        assert repr(resultado) == repr(flask_json.loads(texto))
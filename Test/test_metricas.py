@@ -0,0 +1,98 @@
+"""
+Pruebas de las métricas para Prometheus (/metrics): histogramas por ruta,
+contadores por estado, consultas SQL por petición y agregación entre hilos.
+"""
+import threading
+from Test.conftest import crear_pokemons
+from Utils.metricas import RegistroMetricas
+
+def _muestras(texto):
+    """{'nombre{etiquetas}': valor} de las líneas que no son comentarios."""
+    muestras = {}
+    for linea in texto.splitlines():
+        if linea and not linea.startswith('#'):
+            nombre, valor = linea.rsplit(' ', 1)
+            muestras[nombre] = float(valor)
+    return muestras
+
+def test_histograma_y_formato():
+    registro = RegistroMetricas(latencia=[0.1, 1], consultas=[1], tiempo_sql=[0.01])
+    etiquetas = ('pokemon', '/api/pokemon', 'GET')
+    registro.observar_peticion(etiquetas, 200, 0.05, 2, 0.002)
+    registro.observar_peticion(etiquetas, 200, 0.1, 0, 0.0)
+    registro.observar_peticion(etiquetas, 404, 3.0, 1, 0.02)
+    
+    texto = registro.exportar()
+    muestras = _muestras(texto)
+    
+    assert '# TYPE apipokemon_http_request_duration_seconds histogram' in texto
+    base = 'blueprint="pokemon",route="/api/pokemon",method="GET"'
+    duracion = 'apipokemon_http_request_duration_seconds'
+    # Buckets acumulados; el límite es inclusivo (0.1 cae en le="0.1")
+    assert muestras[f'{duracion}_bucket{{{base},le="0.1"}}'] == 2
+    assert muestras[f'{duracion}_bucket{{{base},le="1.0"}}'] == 2
+    assert muestras[f'{duracion}_bucket{{{base},le="+Inf"}}'] == 3
+    assert muestras[f'{duracion}_count{{{base}}}'] == 3
+    assert abs(muestras[f'{duracion}_sum{{{base}}}'] - 3.15) < 1e-9
+    assert muestras[f'apipokemon_db_statements_per_request_bucket{{{base},le="1.0"}}'] == 2
+    assert muestras[f'apipokemon_db_statements_per_request_sum{{{base}}}'] == 3
+    assert muestras[f'apipokemon_http_responses_total{{{base},status="200"}}'] == 2
+    assert muestras[f'apipokemon_http_responses_total{{{base},status="404"}}'] == 1
+
+def test_escapa_etiquetas():
+    registro = RegistroMetricas()
+    registro.observar_peticion(('', '/a"b\\c', 'GET'), 200, 0.01, 0, 0.0)
+    
+    assert 'route="/a\\"b\\\\c"' in registro.exportar()
+
+def test_agrega_hilos_vivos_y_terminados():
+    registro = RegistroMetricas()
+    etiquetas = ('', '/x', 'GET')
+    
+    def trabajar():
+        for _ in range(100):
+            registro.observar_peticion(etiquetas, 200, 0.01, 1, 0.001)
+    
+    hilos = [threading.Thread(target=trabajar) for _ in range(4)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    registro.observar_peticion(etiquetas, 200, 0.01, 1, 0.001)
+    
+    clave = 'apipokemon_http_responses_total{blueprint="",route="/x",method="GET",status="200"}'
+    assert _muestras(registro.exportar())[clave] == 401
+    # Los almacenes de los hilos terminados se consolidan y no se pierden
+    assert len(registro._almacenes) == 1
+    assert _muestras(registro.exportar())[clave] == 401
+
+def test_endpoint_metrics(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        crear_pokemons(5)
+    client.get('/api/pokemon', headers=profesor_headers)
+    client.get('/api/pokemon?stream=1', headers=profesor_headers)
+    client.get('/no-existe')
+    
+    response = client.get('/metrics')
+    
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    muestras = _muestras(response.get_data(as_text=True))
+    listado = 'blueprint="pokemon",route="/api/pokemon",method="GET"'
+    assert muestras[f'apipokemon_http_responses_total{{{listado},status="200"}}'] == 2
+    assert muestras[f'apipokemon_http_request_duration_seconds_count{{{listado}}}'] == 2
+    # Las sentencias del streaming se cuentan aunque se ejecuten al enviar el cuerpo
+    assert muestras[f'apipokemon_db_statements_per_request_sum{{{listado}}}'] >= 3
+    assert muestras[f'apipokemon_db_statement_seconds_per_request_sum{{{listado}}}'] > 0
+    login = 'blueprint="auth",route="/auth/login",method="POST"'
+    assert muestras[f'apipokemon_http_responses_total{{{login},status="200"}}'] == 1
+    assert muestras['apipokemon_http_responses_total{blueprint="",route="<sin_ruta>",method="GET",status="404"}'] == 1
+
+def test_token_de_metricas(aplicacion, client):
+    aplicacion.config['METRICS_TOKEN'] = 'secreto'
+    try:
+        assert client.get('/metrics').status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer otro'}).status_code == 401
+        assert client.get('/metrics', headers={'Authorization': 'Bearer secreto'}).status_code == 200
+    finally:
+        del aplicacion.config['METRICS_TOKEN']
@@ -0,0 +1,58 @@
+"""
+Pruebas de la paginación por cursor de GET /api/pokemon.
+"""
+from Config.DataBase import db
+from Config.pagination import PAGE_SIZE_MAX
+from Models.PokemonCapturado import PokemonCapturado
+from Models.Usuario import Usuario
+from Test.conftest import crear_pokemons
+
+def _recorrer(client, headers, clave, limit):
+    ids, cursor, paginas = [], None, 0
+    while True:
+        params = {'limit': limit}
+        if cursor:
+            params['cursor'] = cursor
+        response = client.get('/api/pokemon', query_string=params, headers=headers)
+        assert response.status_code == 200
+        datos = response.get_json()
+        ids.extend(item['id'] for item in datos[clave])
+        paginas += 1
+        cursor = datos['paginacion']['next_cursor']
+        if not cursor:
+            return ids, paginas
+
+def test_profesor_recorre_el_catalogo_por_paginas(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        esperados = crear_pokemons(25)
+    
+    ids, paginas = _recorrer(client, profesor_headers, 'pokemons', 10)
+    
+    assert ids == esperados
+    assert paginas == 3
+
+def test_trainer_recorre_su_coleccion_por_paginas(aplicacion, client, trainer_headers):
+    with aplicacion.app_context():
+        pokemon_ids = crear_pokemons(7)
+        ash = Usuario.query.filter_by(email='ash@pokemon.com').first()
+        misty = Usuario.query.filter_by(email='misty@pokemon.com').first()
+        for pokemon_id in pokemon_ids:
+            db.session.add(PokemonCapturado(usuario_id=ash.id, pokemon_id=pokemon_id))
+            db.session.add(PokemonCapturado(usuario_id=misty.id, pokemon_id=pokemon_id))
+        db.session.commit()
+        esperados = [c.id for c in PokemonCapturado.query.filter_by(usuario_id=ash.id).order_by(PokemonCapturado.id)]
+    
+    ids, paginas = _recorrer(client, trainer_headers, 'pokemons_capturados', 3)
+    
+    assert ids == esperados
+    assert paginas == 3
+
+def test_limite_se_recorta_al_maximo(aplicacion, client, profesor_headers):
+    response = client.get('/api/pokemon', query_string={'limit': PAGE_SIZE_MAX * 10}, headers=profesor_headers)
+    
+    assert response.get_json()['paginacion']['limit'] == PAGE_SIZE_MAX
+
+def test_parametros_invalidos(client, profesor_headers):
+    for params in ({'limit': 0}, {'limit': 'abc'}, {'cursor': 'no-es-un-cursor'}):
+        response = client.get('/api/pokemon', query_string=params, headers=profesor_headers)
+        assert response.status_code == 400
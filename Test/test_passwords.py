@@ -0,0 +1,74 @@
+"""
+Pruebas del hash de contraseñas configurable y del rehash en el login.
+"""
+import threading
+import pytest
+from werkzeug.security import generate_password_hash
+from Config.DataBase import db
+from Models.Usuario import Usuario
+from Utils.passwords import PasswordHasher, VerificacionSaturada, metodo_hash, password_hasher
+
+def test_metodo_hash_segun_algoritmo_y_coste():
+    assert metodo_hash('scrypt') == 'scrypt:32768:8:1'
+    assert metodo_hash('scrypt', 16384) == 'scrypt:16384:8:1'
+    assert metodo_hash('pbkdf2', 600000) == 'pbkdf2:sha256:600000'
+    with pytest.raises(ValueError):
+        metodo_hash('md5')
+
+def test_hash_con_el_metodo_configurado():
+    hasher = PasswordHasher(metodo='pbkdf2:sha256:1000', workers=1, cola=0)
+    
+    password_hash = hasher.hash('secreto')
+    
+    assert password_hash.startswith('pbkdf2:sha256:1000$')
+    assert hasher.verificar(password_hash, 'secreto')
+    assert not hasher.verificar(password_hash, 'otro')
+    assert not hasher.necesita_rehash(password_hash)
+    assert hasher.necesita_rehash(generate_password_hash('secreto', method='pbkdf2:sha256:2000'))
+
+def test_ejecutor_lleno_rechaza_al_instante():
+    hasher = PasswordHasher(metodo='pbkdf2:sha256:1000', workers=1, cola=0)
+    liberar = threading.Event()
+    hasher._ejecutor.submit(liberar.wait)
+    assert hasher._plazas.acquire(blocking=False)  # plaza ocupada por la tarea anterior
+    
+    with pytest.raises(VerificacionSaturada):
+        hasher.verificar(hasher.hash('x'), 'x')
+    
+    liberar.set()
+    hasher._plazas.release()
+    assert hasher.verificar(hasher.hash('x'), 'x')
+    assert hasher.stats()['rechazadas'] == 1
+
+def test_login_recalcula_hash_antiguo(client, aplicacion):
+    with aplicacion.app_context():
+        usuario = Usuario.query.filter_by(email='ash@pokemon.com').first()
+        usuario.password_hash = generate_password_hash('ash123', method='pbkdf2:sha256:1000')
+        db.session.commit()
+    
+    response = client.post('/auth/login', json={'email': 'ash@pokemon.com', 'password': 'ash123'})
+    
+    assert response.status_code == 200
+    with aplicacion.app_context():
+        usuario = Usuario.query.filter_by(email='ash@pokemon.com').first()
+        assert usuario.password_hash.startswith(password_hasher.metodo + '$')
+        assert usuario.check_password('ash123')
+
+def test_login_sin_rehash_si_el_hash_esta_al_dia(client, aplicacion):
+    with aplicacion.app_context():
+        anterior = Usuario.query.filter_by(email='ash@pokemon.com').first().password_hash
+    
+    assert client.post('/auth/login', json={'email': 'ash@pokemon.com', 'password': 'ash123'}).status_code == 200
+    
+    with aplicacion.app_context():
+        assert Usuario.query.filter_by(email='ash@pokemon.com').first().password_hash == anterior
+
+def test_login_saturado_responde_503(client, monkeypatch):
+    def saturado(password_hash, password):
+        raise VerificacionSaturada()
+    monkeypatch.setattr(password_hasher, 'verificar', saturado)
+    
+    response = client.post('/auth/login', json={'email': 'ash@pokemon.com', 'password': 'ash123'})
+    
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
@@ -0,0 +1,60 @@
+"""
+Pruebas de la caché del catálogo en PokemonService.
+"""
+from Config.DataBase import db
+from Models.Pokemon import Pokemon
+from Repositories.VersionRepository import VersionRepository, CLAVE_CATALOGO
+from Services.PokemonService import PokemonService, pokemon_cache, listados_cache, fragmentos_cache
+from Test.conftest import contar_sql, crear_pokemons, sin_versiones
+
+def test_lecturas_repetidas_no_consultan_el_catalogo(aplicacion, client, profesor_headers):
+    client.get('/auth/me', headers=profesor_headers)
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    client.get(f'/api/pokemon/{pokemon_id}', headers=profesor_headers)
+    client.get('/api/pokemon', headers=profesor_headers)
+    
+    with contar_sql(aplicacion) as sentencias:
+        assert client.get(f'/api/pokemon/{pokemon_id}', headers=profesor_headers).status_code == 200
+        assert client.get('/api/pokemon', headers=profesor_headers).status_code == 200
+    
+    assert sin_versiones(sentencias) == []
+    assert listados_cache.stats()['hits'] == 1
+    assert fragmentos_cache.stats()['hits'] >= 1
+
+def test_escrituras_del_servicio_invalidan(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+    client.get(f'/api/pokemon/{pokemon_id}', headers=profesor_headers)
+    
+    client.put(f'/api/pokemon/{pokemon_id}', headers=profesor_headers, json={'nivel': 77})
+    assert client.get(f'/api/pokemon/{pokemon_id}', headers=profesor_headers).get_json()['pokemon']['nivel'] == 77
+    
+    client.delete(f'/api/pokemon/{pokemon_id}', headers=profesor_headers)
+    assert client.get(f'/api/pokemon/{pokemon_id}', headers=profesor_headers).status_code == 404
+
+def test_escritura_de_otro_worker_cambia_la_version(aplicacion):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+        service = PokemonService(cache_activa=True)
+        assert service.get_pokemon_by_id(pokemon_id)['nivel'] == 30
+        
+        # Otro proceso actualiza la fila: no toca esta caché, solo la versión
+        db.session.get(Pokemon, pokemon_id).nivel = 20
+        VersionRepository().incrementar([CLAVE_CATALOGO])
+        db.session.commit()
+        
+        assert service.get_pokemon_by_id(pokemon_id)['nivel'] == 20
+
+def test_cache_desactivada(aplicacion):
+    with aplicacion.app_context():
+        pokemon_id = crear_pokemons(1)[0]
+        service = PokemonService(cache_activa=False)
+        service.get_pokemon_by_id(pokemon_id)
+        
+        with contar_sql(aplicacion) as sentencias:
+            service.get_pokemon_by_id(pokemon_id)
+            service.get_all_pokemons()
+    
+    assert len(sentencias) == 2
+    assert pokemon_cache.stats()['size'] == 0
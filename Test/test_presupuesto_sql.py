@@ -0,0 +1,128 @@
+"""
+Pruebas de la auditoría de SQL: presupuesto de sentencias por ruta y
+detección de N+1. Además, Test/conftest.py falla cualquier prueba cuyas
+peticiones superen el presupuesto de su ruta o repitan sentencias.
+"""
+import logging
+from Config.DataBase import db
+from Models.PokemonCapturado import PokemonCapturado
+from Models.Usuario import Usuario
+from Test.conftest import crear_pokemons
+from Utils.auditoria_sql import AuditoriaSQL, auditar_sql, forma_sentencia
+from Utils.authz import epoch_registry
+from Utils.decorators import usuario_cache
+from Controllers.AuthController import revocation_store
+from Services.PokemonService import pokemon_cache, listados_cache, fragmentos_cache, estadisticas_cache
+
+def _capturar(aplicacion, email, ids):
+    with aplicacion.app_context():
+        usuario = Usuario.query.filter_by(email=email).first()
+        for pokemon_id in ids:
+            db.session.add(PokemonCapturado(usuario_id=usuario.id, pokemon_id=pokemon_id, apodo='Apodo'))
+        db.session.commit()
+
+def _crear(aplicacion, n):
+    with aplicacion.app_context():
+        return crear_pokemons(n)
+
+def _en_frio():
+    """Peor caso: cachés vacías y sincronizaciones de épocas y revocaciones pendientes."""
+    for cache in (usuario_cache, pokemon_cache, listados_cache, fragmentos_cache, estadisticas_cache):
+        cache.clear()
+    epoch_registry.reset()
+    revocation_store.reset()
+
+def test_forma_sentencia():
+    assert forma_sentencia("SELECT *\n  FROM pokemon WHERE id IN (?, ?, ?) AND nombre = 'Pika''chu' LIMIT 10") == \
+        'SELECT * FROM pokemon WHERE id IN (?, ...) AND nombre = ? LIMIT ?'
+    assert forma_sentencia('SELECT pokemon_1.id FROM pokemon AS pokemon_1 WHERE id IN (%s, %s)') == \
+        'SELECT pokemon_1.id FROM pokemon AS pokemon_1 WHERE id IN (?, ...)'
+
+def test_detecta_n_mas_1_de_carga_perezosa(aplicacion):
+    _capturar(aplicacion, 'ash@pokemon.com', _crear(aplicacion, 6))
+    
+    with aplicacion.app_context():
+        with auditar_sql() as informe:
+            # Sin cargar la relación: un SELECT de pokemon por captura
+            [captura.to_dict() for captura in PokemonCapturado.query.all()]
+    
+    assert informe.total == 7
+    [(forma, veces, origenes)] = informe.repetidas(umbral=5)
+    assert veces == 6 and 'FROM pokemon' in forma
+    assert 'Models/PokemonCapturado.py' in origenes[0][0] and '(to_dict)' in origenes[0][0]
+    
+    infraccion = AuditoriaSQL(umbral_n_mas_1=5).evaluar('GET /prueba', informe)
+    assert 'posible N+1: 6 x SELECT' in AuditoriaSQL.describir(infraccion)
+
+def test_rutas_dentro_de_presupuesto(aplicacion, client, profesor_headers, trainer_headers):
+    ids = _crear(aplicacion, 40)
+    _capturar(aplicacion, 'ash@pokemon.com', ids[:20])
+    refresh = client.post('/auth/login', json={'email': 'misty@pokemon.com', 'password': 'misty123'}).get_json()
+    refresh_headers = {'Authorization': f"Bearer {refresh['refresh_token']}"}
+    peticiones = [
+        ('GET', '/api/pokemon', profesor_headers, None),
+        ('GET', '/api/pokemon?stream=1', profesor_headers, None),
+        ('GET', '/api/pokemon?tipo=fuego&nivel_min=10&fields=id,nombre', profesor_headers, None),
+        ('GET', '/api/pokemon', trainer_headers, None),
+        ('GET', '/api/pokemon?stream=1', trainer_headers, None),
+        ('GET', f'/api/pokemon/{ids[0]}', profesor_headers, None),
+        ('GET', f'/api/pokemon/{ids[0]}', trainer_headers, None),
+        ('GET', '/api/pokemon/search?q=pokemon', profesor_headers, None),
+        ('GET', '/api/pokemon/search?q=pokemon', trainer_headers, None),
+        ('GET', '/api/pokemon/stats', profesor_headers, None),
+        ('GET', '/api/pokemon/stats', trainer_headers, None),
+        ('POST', '/api/pokemon', profesor_headers, {
+            'nombre': 'Nuevo', 'tipo': 'Agua', 'nivel': 5, 'poder_ataque': 10, 'poder_defensa': 10, 'hp': 20
+        }),
+        ('POST', '/api/pokemon/bulk', profesor_headers, [
+            {'nombre': f'Bloque {i}', 'tipo': 'Roca', 'nivel': 1, 'poder_ataque': 1, 'poder_defensa': 1, 'hp': 1}
+            for i in range(50)
+        ]),
+        ('PUT', f'/api/pokemon/{ids[30]}', profesor_headers, {'nivel': 50, 'tipo': 'Agua/Hielo'}),
+        ('POST', f'/api/pokemon/{ids[31]}/asignar', profesor_headers, {'trainer_email': 'misty@pokemon.com'}),
+        ('POST', '/api/pokemon/asignar', profesor_headers, [
+            {'pokemon_id': pokemon_id, 'trainer_email': 'misty@pokemon.com'} for pokemon_id in ids[32:38]
+        ]),
+        ('DELETE', f'/api/pokemon/{ids[1]}', trainer_headers, None),
+        ('DELETE', f'/api/pokemon/{ids[39]}', profesor_headers, None),
+        ('GET', '/auth/me', trainer_headers, None),
+        ('POST', '/auth/register', profesor_headers, {
+            'email': 'nuevo@pokemon.com', 'nombre': 'Nuevo', 'password': 'nuevo123', 'rol': 'trainer'
+        }),
+        ('POST', '/auth/login', {}, {'email': 'ash@pokemon.com', 'password': 'ash123'}),
+        ('POST', '/auth/refresh', refresh_headers, None),
+        ('POST', '/auth/logout', trainer_headers, None),
+    ]
+    
+    for metodo, url, headers, cuerpo in peticiones:
+        _en_frio()
+        with auditar_sql() as informe:
+            response = client.open(url, method=metodo, headers=headers, json=cuerpo)
+            response.get_data()
+        assert response.status_code < 400, (metodo, url, response.get_json())
+        
+        regla = aplicacion.url_map.bind('').match(url.split('?')[0], method=metodo, return_rule=True)[0]
+        presupuesto = aplicacion.view_functions[regla.endpoint].presupuesto_sql
+        if presupuesto is not None:
+            assert informe.total <= presupuesto, (metodo, url, [f for f, _, _ in informe.sentencias])
+
+def test_rutas_de_la_api_declaran_presupuesto(aplicacion):
+    sin_presupuesto = [
+        regla.rule for regla in aplicacion.url_map.iter_rules()
+        if regla.endpoint.split('.')[0] in ('pokemon', 'auth')
+        and not hasattr(aplicacion.view_functions[regla.endpoint], 'presupuesto_sql')
+    ]
+    assert sin_presupuesto == []
+
+def test_aviso_al_superar_el_presupuesto(aplicacion, client, profesor_headers, caplog, monkeypatch):
+    auditoria = aplicacion.extensions['auditoria_sql']
+    monkeypatch.setattr(aplicacion.view_functions['pokemon.get_all_pokemons'], 'presupuesto_sql', 0)
+    
+    with caplog.at_level(logging.WARNING, logger='Utils.auditoria_sql'):
+        client.get('/api/pokemon', headers=profesor_headers)
+    
+    [infraccion] = auditoria.infracciones
+    assert infraccion['ruta'] == 'GET /api/pokemon' and infraccion['presupuesto'] == 0
+    assert 'SQL en GET /api/pokemon' in caplog.text and 'presupuesto 0' in caplog.text
+    # La infracción es intencionada: que no la cuente Test/conftest.py
+    auditoria.reset()
@@ -0,0 +1,92 @@
+"""
+Pruebas del limitador de intentos de login (token bucket por email e IP).
+"""
+from Controllers.AuthController import login_limiter
+from Utils.passwords import password_hasher
+from Utils.ratelimit import MemoryRateLimiter, SQLiteRateLimiter, Regla
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self):
+        return self.ahora
+
+REGLAS = {'email': Regla(3, 10), 'ip': Regla(5, 1)}
+
+def test_rafaga_y_recarga():
+    reloj = Reloj()
+    limiter = MemoryRateLimiter(reglas=REGLAS, reloj=reloj)
+    claves = [('email', 'ash@pokemon.com')]
+    
+    assert [limiter.intentar(claves) for _ in range(3)] == [0, 0, 0]
+    assert limiter.intentar(claves) == 10
+    
+    reloj.ahora += 4
+    assert limiter.intentar(claves) == 6
+    reloj.ahora += 6
+    assert limiter.intentar(claves) == 0
+    assert limiter.stats()['rechazados'] == 2
+
+def test_rechazo_no_consume_de_las_demas_claves():
+    limiter = MemoryRateLimiter(reglas=REGLAS, reloj=Reloj())
+    for _ in range(3):
+        limiter.intentar([('email', 'ash@pokemon.com'), ('ip', '10.0.0.1')])
+    
+    assert limiter.intentar([('email', 'ash@pokemon.com'), ('ip', '10.0.0.1')]) > 0
+    # La IP conserva sus dos intentos: el rechazo por email no los gastó
+    assert limiter.intentar([('email', 'misty@pokemon.com'), ('ip', '10.0.0.1')]) == 0
+    assert limiter.intentar([('email', 'brock@pokemon.com'), ('ip', '10.0.0.1')]) == 0
+    assert limiter.intentar([('email', 'oak@pokemon.com'), ('ip', '10.0.0.1')]) > 0
+
+def test_claves_inactivas_se_purgan():
+    reloj = Reloj()
+    limiter = MemoryRateLimiter(reglas=REGLAS, reloj=reloj)
+    for i in range(100):
+        limiter.intentar([('ip', f'10.0.0.{i}')])
+    assert limiter.stats()['claves_activas'] == 100
+    
+    reloj.ahora += 1  # un intento de 5 se recupera en 1 segundo
+    limiter.intentar([('email', 'ash@pokemon.com')])
+    
+    assert limiter.stats()['claves_activas'] == 1
+
+def test_maximo_de_claves():
+    limiter = MemoryRateLimiter(reglas=REGLAS, max_claves=10, reloj=Reloj())
+    for i in range(50):
+        limiter.intentar([('ip', f'10.0.0.{i}')])
+    assert limiter.stats()['claves_activas'] == 10
+
+def test_almacen_sqlite_compartido_entre_workers(tmp_path):
+    reloj = Reloj()
+    ruta = str(tmp_path / 'login_rate.db')
+    worker_a = SQLiteRateLimiter(ruta, reglas=REGLAS, reloj=reloj)
+    worker_b = SQLiteRateLimiter(ruta, reglas=REGLAS, reloj=reloj)
+    claves = [('email', 'ash@pokemon.com')]
+    
+    assert worker_a.intentar(claves) == 0
+    assert worker_b.intentar(claves) == 0
+    assert worker_a.intentar(claves) == 0
+    assert worker_b.intentar(claves) == 10
+    assert worker_a.stats()['claves_activas'] == 1
+    
+    reloj.ahora += 30
+    assert worker_a.intentar(claves) == 0
+
+def test_login_limitado_antes_de_verificar(client, monkeypatch):
+    monkeypatch.setattr(login_limiter, 'reglas', {'email': Regla(2, 60), 'ip': Regla(100, 1)})
+    verificaciones = []
+    verificar = password_hasher.verificar
+    monkeypatch.setattr(password_hasher, 'verificar',
+                        lambda *args: verificaciones.append(1) or verificar(*args))
+    
+    for _ in range(2):
+        response = client.post('/auth/login', json={'email': 'ash@pokemon.com', 'password': 'mal'})
+        assert response.status_code == 401
+    response = client.post('/auth/login', json={'email': 'ash@pokemon.com', 'password': 'ash123'})
+    
+    assert response.status_code == 429
+    assert 55 <= int(response.headers['Retry-After']) <= 60
+    assert len(verificaciones) == 2
+    # Otro usuario desde la misma IP sigue pudiendo entrar
+    assert client.post('/auth/login', json={'email': 'misty@pokemon.com', 'password': 'misty123'}).status_code == 200
@@ -0,0 +1,89 @@
+"""
+Pruebas del logout con el almacén persistente de tokens revocados.
+"""
+from datetime import datetime, timedelta
+import pytest
+from Controllers.AuthController import revocation_store
+from Models.TokenRevocado import TokenRevocado
+from Utils.revocation import BloomFilter, MemoryRevocationStore, SQLRevocationStore
+from Test.conftest import contar_sql
+
+def test_logout_revoca_el_token(client, trainer_headers):
+    assert client.get('/auth/me', headers=trainer_headers).status_code == 200
+    
+    assert client.post('/auth/logout', headers=trainer_headers).status_code == 200
+    
+    response = client.get('/auth/me', headers=trainer_headers)
+    assert response.status_code == 401
+
+@pytest.mark.skipif(not isinstance(revocation_store, SQLRevocationStore), reason='REVOCATION_STORE=memory')
+def test_token_no_revocado_no_consulta_la_bd(aplicacion, client, trainer_headers):
+    client.get('/auth/me', headers=trainer_headers)
+    
+    with contar_sql(aplicacion) as sentencias:
+        assert client.get('/auth/me', headers=trainer_headers).status_code == 200
+    
+    assert not any('tokens_revocados' in s for s in sentencias)
+    assert revocation_store.stats()['consultas_evitadas'] >= 2
+
+def test_revocacion_se_comparte_entre_workers(aplicacion):
+    expira = datetime.utcnow() + timedelta(minutes=30)
+    worker_a = SQLRevocationStore(intervalo_sync=0)
+    worker_b = SQLRevocationStore(intervalo_sync=0)
+    
+    with aplicacion.app_context():
+        assert not worker_b.esta_revocado('jti-1')
+        worker_a.revocar('jti-1', expira)
+        assert worker_b.esta_revocado('jti-1')
+
+def test_purga_de_tokens_expirados(aplicacion):
+    store = SQLRevocationStore(intervalo_purga=0)
+    
+    with aplicacion.app_context():
+        store.revocar('caducado', datetime.utcnow() - timedelta(seconds=1))
+        store.revocar('vigente', datetime.utcnow() + timedelta(minutes=5))
+        
+        assert [t.jti for t in TokenRevocado.query.all()] == ['vigente']
+        assert store.esta_revocado('vigente')
+        assert not store.esta_revocado('caducado')
+
+def test_logout_repetido_con_el_mismo_token(aplicacion):
+    store = SQLRevocationStore()
+    expira = datetime.utcnow() + timedelta(minutes=30)
+    
+    with aplicacion.app_context():
+        store.revocar('jti-doble', expira)
+        store.revocar('jti-doble', expira)
+        
+        assert store.esta_revocado('jti-doble')
+        assert TokenRevocado.query.count() == 1
+
+def test_almacen_en_memoria():
+    store = MemoryRevocationStore(intervalo_purga=0)
+    store.revocar('caducado', datetime.utcnow() - timedelta(seconds=1))
+    store.revocar('abc', datetime.utcnow() + timedelta(minutes=5))
+    
+    assert store.esta_revocado('abc')
+    assert not store.esta_revocado('xyz')
+    assert store.stats()['revocados'] == 1
+    
+    store.reset()
+    assert not store.esta_revocado('abc')
+
+def test_almacen_en_memoria_purga_por_intervalo():
+    store = MemoryRevocationStore(intervalo_purga=3600)
+    store.revocar('caducado', datetime.utcnow() - timedelta(seconds=1))
+    store.revocar('abc', datetime.utcnow() + timedelta(minutes=5))
+    
+    # Hasta que pasa el intervalo no se recorre el diccionario
+    assert store.stats()['revocados'] == 2
+
+def test_filtro_de_bloom_sin_falsos_negativos():
+    bloom = BloomFilter(capacidad=1000, tasa_error=0.01)
+    claves = [f'jti-{i}' for i in range(1000)]
+    for clave in claves:
+        bloom.add(clave)
+    
+    assert all(clave in bloom for clave in claves)
+    falsos_positivos = sum(f'otro-{i}' in bloom for i in range(10000))
+    assert falsos_positivos < 300
@@ -0,0 +1,74 @@
+"""
+Pruebas del perfil de rendimiento de SQLite y del engine de solo lectura.
+"""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from Config.DataBase import db, engine_lectura, crear_esquema, pragmas_sqlite, SQLITE_BUSY_TIMEOUT_MS
+from Models.Usuario import Usuario
+from Services.PokemonService import pokemon_cache, listados_cache, fragmentos_cache
+from Test.conftest import crear_pokemons, login
+from Utils.pool_stats import estadisticas_pool
+from app import create_app
+
+@pytest.fixture
+def app_archivo(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{tmp_path / 'local.db'}",
+        'SQLITE_READONLY_READS': True,
+        'TESTING': True
+    })
+    crear_esquema(app)
+    with app.app_context():
+        usuario = Usuario(email='profesor@universidad.edu', nombre='Profesor Oak', rol='profesor')
+        usuario.set_password('profesor123')
+        db.session.add(usuario)
+        db.session.commit()
+    for cache in (pokemon_cache, listados_cache, fragmentos_cache):
+        cache.clear()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+        engine_lectura().dispose()
+
+def _pragma(conexion, nombre):
+    return conexion.execute(text(f'PRAGMA {nombre}')).scalar()
+
+def test_perfil_aplicado_en_cada_conexion(app_archivo):
+    with app_archivo.app_context(), db.engine.connect() as conexion:
+        assert _pragma(conexion, 'journal_mode') == 'wal'
+        assert _pragma(conexion, 'synchronous') == 1  # NORMAL
+        assert _pragma(conexion, 'busy_timeout') == SQLITE_BUSY_TIMEOUT_MS
+        assert _pragma(conexion, 'temp_store') == 2  # MEMORY
+        assert _pragma(conexion, 'cache_size') < 0
+        assert _pragma(conexion, 'query_only') == 0
+
+def test_perfil_desactivable():
+    assert pragmas_sqlite(perfil=False) == []
+    assert pragmas_sqlite(solo_lectura=True, perfil=False) == ['PRAGMA query_only=ON']
+
+def test_engine_de_lectura_rechaza_escrituras(app_archivo):
+    with app_archivo.app_context():
+        with engine_lectura().connect() as conexion:
+            assert _pragma(conexion, 'query_only') == 1
+            with pytest.raises(OperationalError):
+                conexion.execute(text("DELETE FROM pokemon"))
+
+def test_endpoints_de_lectura_usan_el_engine_de_lectura(app_archivo):
+    with app_archivo.app_context():
+        crear_pokemons(3)
+    with app_archivo.test_client() as client:
+        headers = login(client, 'profesor@universidad.edu', 'profesor123')
+        
+        response = client.get('/api/pokemon', headers=headers)
+        
+        assert response.status_code == 200
+        assert len(response.get_json()['pokemons']) == 3
+    with app_archivo.app_context():
+        assert estadisticas_pool(engine_lectura())['checkouts'] >= 1
+
+def test_sin_engine_de_lectura_en_memoria():
+    app = create_app({'SQLALCHEMY_DATABASE_URI': 'sqlite://', 'SQLITE_READONLY_READS': True})
+    with app.app_context():
+        assert engine_lectura() is None
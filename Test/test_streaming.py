@@ -0,0 +1,64 @@
+"""
+Pruebas del listado en streaming (GET /api/pokemon?stream=1).
+"""
+import json
+import pytest
+from flask import Flask, jsonify
+from Config.DataBase import db
+from Models.PokemonCapturado import PokemonCapturado
+from Models.Usuario import Usuario
+from Utils.json_provider import crear_json_provider
+from Utils.streaming import generar_json_lista
+from Test.conftest import crear_pokemons
+
+def test_generador_produce_json_valido_por_trozos():
+    app = Flask(__name__)
+    with app.app_context():
+        for n in (0, 1, 5, 7):
+            trozos = list(generar_json_lista({'rol': 'profesor'}, 'items', ({'n': i} for i in range(n)),
+                                             clave_total='total', tam_lote=3))
+            datos = json.loads(''.join(trozos))
+            assert datos == {'rol': 'profesor', 'items': [{'n': i} for i in range(n)], 'total': n}
+            assert len(trozos) == 2 + (n + 2) // 3
+
+def test_documento_identico_al_de_jsonify():
+    app = Flask(__name__)
+    app.json = crear_json_provider(app)
+    with app.app_context():
+        for envoltorio, clave, clave_total in (({'rol': 'profesor'}, 'pokemons', 'total'),
+                                               ({'rol': 'trainer', 'entrenador': 'Ash'},
+                                                'pokemons_capturados', 'total_capturados')):
+            items = [{'nombre': f'P{i}', 'id': i} for i in range(5)]
+            trozos = ''.join(generar_json_lista(envoltorio, clave, iter(items), clave_total, tam_lote=2))
+            esperado = jsonify({**envoltorio, clave: items, clave_total: len(items)}).get_data(as_text=True)
+            assert trozos == esperado
+        
+        with pytest.raises(ValueError):
+            list(generar_json_lista({}, 'items', iter([]), clave_total='cuenta'))
+
+def test_profesor_recibe_el_catalogo_completo(aplicacion, client, profesor_headers):
+    with aplicacion.app_context():
+        ids = crear_pokemons(30)
+    
+    response = client.get('/api/pokemon', query_string={'stream': '1'}, headers=profesor_headers)
+    
+    assert response.status_code == 200
+    assert response.is_streamed
+    datos = json.loads(response.get_data())
+    assert datos['total'] == 30
+    assert [p['id'] for p in datos['pokemons']] == ids
+    assert datos['pokemons'][0]['descripcion'] == 'Pokémon de prueba'
+
+def test_trainer_recibe_su_coleccion(aplicacion, client, trainer_headers):
+    with aplicacion.app_context():
+        ash = Usuario.query.filter_by(email='ash@pokemon.com').first()
+        for pokemon_id in crear_pokemons(4):
+            db.session.add(PokemonCapturado(usuario_id=ash.id, pokemon_id=pokemon_id))
+        db.session.commit()
+    
+    response = client.get('/api/pokemon?stream=true', headers=trainer_headers)
+    
+    datos = json.loads(response.get_data())
+    assert datos['entrenador'] == 'Ash Ketchum'
+    assert datos['total_capturados'] == 4
+    assert all('pokemon' in captura for captura in datos['pokemons_capturados'])
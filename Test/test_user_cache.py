@@ -0,0 +1,97 @@
+"""
+Pruebas de la resolución del usuario actual una sola vez por petición
+y de la caché de usuarios del proceso.
+"""
+from datetime import datetime
+from Config.DataBase import db
+from Models.AuthzEpoch import AuthzEpoch
+from Models.Usuario import Usuario
+from Utils.authz import epoch_registry
+from Utils.decorators import usuario_cache
+from Test.conftest import contar_sql
+
+def _selects_usuarios(sentencias):
+    return [s for s in sentencias if s.lstrip().upper().startswith('SELECT') and 'FROM usuarios' in s]
+
+def test_escritura_de_profesor_carga_usuario_una_vez(aplicacion, client, profesor_headers):
+    usuario_cache.clear()
+    pokemon = {'nombre': 'Pikachu', 'tipo': 'Eléctrico', 'nivel': 25,
+               'poder_ataque': 55.5, 'poder_defensa': 40.0, 'hp': 100}
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.post('/api/pokemon', json=pokemon, headers=profesor_headers)
+    
+    assert response.status_code == 201
+    assert len(_selects_usuarios(sentencias)) == 1
+
+def test_peticiones_siguientes_usan_la_cache(aplicacion, client, profesor_headers):
+    client.get('/auth/me', headers=profesor_headers)
+    
+    with contar_sql(aplicacion) as sentencias:
+        response = client.get('/auth/me', headers=profesor_headers)
+    
+    assert response.status_code == 200
+    assert response.get_json()['usuario']['email'] == 'profesor@universidad.edu'
+    assert _selects_usuarios(sentencias) == []
+    assert usuario_cache.stats()['hits'] >= 1
+
+def test_cambio_de_rol_invalida_la_cache(aplicacion, client, trainer_headers):
+    assert client.get('/auth/me', headers=trainer_headers).get_json()['usuario']['rol'] == 'trainer'
+    
+    with aplicacion.app_context():
+        usuario = Usuario.query.filter_by(email='ash@pokemon.com').first()
+        usuario.rol = 'profesor'
+        db.session.commit()
+    
+    assert client.get('/auth/me', headers=trainer_headers).get_json()['usuario']['rol'] == 'profesor'
+
+def test_cambio_de_rol_en_otro_worker(aplicacion, client, trainer_headers):
+    assert client.get('/auth/me', headers=trainer_headers).get_json()['usuario']['rol'] == 'trainer'
+    
+    with aplicacion.app_context():
+        # Lo que confirma otro worker: la fila y la época, sin eventos en este proceso
+        db.session.execute(Usuario.__table__.update()
+                           .where(Usuario.__table__.c.email == 'ash@pokemon.com').values(rol='profesor'))
+        db.session.execute(AuthzEpoch.__table__.insert().values(
+            email='ash@pokemon.com', epoch=epoch_registry.epoch('ash@pokemon.com') + 1,
+            actualizado=datetime.utcnow()))
+        db.session.commit()
+    
+    # Hasta la siguiente sincronización de épocas se sirve la copia cacheada
+    assert client.get('/auth/me', headers=trainer_headers).get_json()['usuario']['rol'] == 'trainer'
+    epoch_registry._proxima_sync = 0.0
+    assert client.get('/auth/me', headers=trainer_headers).get_json()['usuario']['rol'] == 'profesor'
+
+def test_invalidacion_tras_el_commit(aplicacion, client, trainer_headers):
+    client.get('/auth/me', headers=trainer_headers)
+    snapshot = usuario_cache.get('ash@pokemon.com')
+    
+    with aplicacion.app_context():
+        usuario = Usuario.query.filter_by(email='ash@pokemon.com').first()
+        usuario.activo = False
+        db.session.flush()
+        db.session.rollback()
+        # Sin commit la fila no cambia: la entrada sigue siendo válida
+        assert usuario_cache.get('ash@pokemon.com') == snapshot
+        
+        usuario.activo = False
+        db.session.flush()
+        # Otra petición lee la fila anterior entre el flush y el commit
+        usuario_cache.set('ash@pokemon.com', snapshot)
+        db.session.commit()
+        assert usuario_cache.get('ash@pokemon.com') is None
+
+def test_registro_invalida_la_cache(aplicacion, client, profesor_headers):
+    usuario_cache.set('nuevo@pokemon.com', {'email': 'obsoleto'})
+    response = client.post('/auth/register', headers=profesor_headers, json={
+        'email': 'nuevo@pokemon.com', 'nombre': 'Nuevo', 'password': 'nuevo123', 'rol': 'trainer'
+    })
+    
+    assert response.status_code == 201
+    assert usuario_cache.get('nuevo@pokemon.com') is None
+
+def test_estadisticas_exponen_contadores(client, profesor_headers):
+    response = client.get('/sistema/estadisticas', headers=profesor_headers)
+    
+    assert response.status_code == 200
+    assert {'hits', 'misses', 'evictions', 'size'} <= set(response.get_json()['cache_usuarios'])
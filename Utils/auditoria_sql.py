@@ -0,0 +1,216 @@
+"""
+Auditoría de las sentencias SQL de cada petición: presupuestos por ruta y
+detección de posibles N+1.
+
+Con SQL_AUDIT=log (por defecto en desarrollo) se guardan todas las sentencias
+de la petición con su forma normalizada (sin literales y con las listas IN
+colapsadas) y las llamadas del proyecto que las emitieron. Al terminar la
+petición se escribe un warning en el log si:
+
+- la ruta declara un presupuesto con @presupuesto_sql(n) y lo supera;
+- la misma forma de sentencia se repite SQL_AUDIT_N_PLUS_1 veces o más, el
+  rastro típico de una relación cargada de forma perezosa dentro de un bucle.
+
+Las infracciones quedan además en AuditoriaSQL.infracciones, que es lo que
+comprueban las pruebas (ver Test/conftest.py). auditar_sql() audita un bloque
+de código fuera de una petición.
+"""
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from flask import current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from Config.auditoria_sql import SQL_AUDIT, SQL_AUDIT_N_PLUS_1, SQL_AUDIT_STACK_DEPTH
+
+logger = logging.getLogger(__name__)
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+_ESTE_ARCHIVO = os.path.abspath(__file__)
+
+_ESPACIOS = re.compile(r'\s+')
+_LITERALES = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+# Listas de parámetros (qmark de SQLite o format de MySQL), p. ej. IN (?, ?, ?)
+_LISTAS = re.compile(r'\(\s*(?:\?|%s)(?:\s*,\s*(?:\?|%s))+\s*\)')
+
+def forma_sentencia(sql):
+    """Forma normalizada de una sentencia: sin literales y con las listas IN colapsadas."""
+    forma = _LITERALES.sub('?', _ESPACIOS.sub(' ', sql).strip())
+    return _LISTAS.sub('(?, ...)', forma)
+
+def _origen(profundidad):
+    """Llamadas del proyecto más cercanas a la sentencia, como 'archivo:línea (función)'."""
+    llamadas = []
+    frame = sys._getframe(1)
+    while frame is not None and len(llamadas) < profundidad:
+        archivo = frame.f_code.co_filename
+        if archivo.startswith(_RAIZ) and archivo != _ESTE_ARCHIVO and 'site-packages' not in archivo:
+            llamadas.append(f'{archivo[len(_RAIZ):]}:{frame.f_lineno} ({frame.f_code.co_name})')
+        frame = frame.f_back
+    return tuple(llamadas)
+
+class InformeSQL:
+    """Sentencias emitidas durante una petición o un bloque auditado."""
+    
+    def __init__(self, profundidad=SQL_AUDIT_STACK_DEPTH):
+        self.profundidad = profundidad
+        self.sentencias = []  # (forma, segundos, origen)
+    
+    @property
+    def total(self):
+        return len(self.sentencias)
+    
+    @property
+    def segundos(self):
+        return sum(segundos for _, segundos, _ in self.sentencias)
+    
+    def formas(self):
+        """Número de veces que se emitió cada forma de sentencia."""
+        return Counter(forma for forma, _, _ in self.sentencias)
+    
+    def repetidas(self, umbral=SQL_AUDIT_N_PLUS_1):
+        """
+        Formas emitidas `umbral` veces o más (posibles N+1), de más a menos
+        repetida: lista de (forma, veces, orígenes distintos).
+        """
+        resultado = []
+        for forma, veces in self.formas().most_common():
+            if veces < umbral:
+                break
+            origenes = list(dict.fromkeys(origen for f, _, origen in self.sentencias if f == forma))
+            resultado.append((forma, veces, origenes))
+        return resultado
+
+# Informes abiertos en este hilo (una petición y, dentro, bloques de auditar_sql)
+_activos = threading.local()
+
+def _informes_activos():
+    informes = getattr(_activos, 'informes', None)
+    if informes is None:
+        informes = _activos.informes = []
+    return informes
+
+def _antes_de_sentencia(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_activos, 'informes', None):
+        conn.info['auditoria_inicio'] = time.perf_counter()
+
+def _despues_de_sentencia(conn, cursor, statement, parameters, context, executemany):
+    informes = getattr(_activos, 'informes', None)
+    inicio = conn.info.pop('auditoria_inicio', None)
+    if not informes or inicio is None:
+        return
+    segundos = time.perf_counter() - inicio
+    forma = forma_sentencia(statement)
+    origen = _origen(max(informe.profundidad for informe in informes))
+    for informe in informes:
+        informe.sentencias.append((forma, segundos, origen[:informe.profundidad]))
+
+def _instrumentar_sql():
+    # A nivel de clase: cubre todos los engines (también el de solo lectura)
+    if not event.contains(Engine, 'before_cursor_execute', _antes_de_sentencia):
+        event.listen(Engine, 'before_cursor_execute', _antes_de_sentencia)
+        event.listen(Engine, 'after_cursor_execute', _despues_de_sentencia)
+
+@contextmanager
+def auditar_sql(profundidad=SQL_AUDIT_STACK_DEPTH):
+    """Audita las sentencias SQL que emite este hilo dentro del bloque."""
+    _instrumentar_sql()
+    informe = InformeSQL(profundidad)
+    _informes_activos().append(informe)
+    try:
+        yield informe
+    finally:
+        _informes_activos().remove(informe)
+
+def presupuesto_sql(maximo=None, n_mas_1=True):
+    """
+    Declara el máximo de sentencias SQL de una ruta, contando todas las de la
+    petición (carga del usuario, contadores de versión...). Va justo debajo de
+    @route. n_mas_1=False no avisa de las sentencias repetidas en rutas que
+    las repiten a propósito (p. ej. inserción en bloques).
+    """
+    def wrapper(fn):
+        fn.presupuesto_sql = maximo
+        fn.auditar_n_mas_1 = n_mas_1
+        return fn
+    return wrapper
+
+class AuditoriaSQL:
+    """
+    Auditoría por petición (hooks before_request y teardown_request; en las
+    respuestas en streaming incluye las sentencias del envío del cuerpo).
+    """
+    
+    def __init__(self, umbral_n_mas_1=SQL_AUDIT_N_PLUS_1, profundidad=SQL_AUDIT_STACK_DEPTH,
+                 max_infracciones=100):
+        self.umbral_n_mas_1 = umbral_n_mas_1
+        self.profundidad = profundidad
+        self.infracciones = deque(maxlen=max_infracciones)
+    
+    def inicio_peticion(self):
+        informe = g.auditoria_sql = InformeSQL(self.profundidad)
+        _informes_activos().append(informe)
+    
+    def fin_peticion(self, excepcion=None):
+        informe = g.pop('auditoria_sql', None)
+        if informe is None:
+            return
+        _informes_activos().remove(informe)
+        
+        regla = request.url_rule
+        vista = current_app.view_functions.get(request.endpoint)
+        infraccion = self.evaluar(f'{request.method} {regla.rule if regla else request.path}', informe,
+                                  getattr(vista, 'presupuesto_sql', None),
+                                  getattr(vista, 'auditar_n_mas_1', True))
+        if infraccion:
+            self.infracciones.append(infraccion)
+            logger.warning(self.describir(infraccion))
+    
+    def evaluar(self, ruta, informe, presupuesto=None, n_mas_1=True):
+        """Retorna la infracción de la petición (dict) o None si está dentro de lo esperado."""
+        excedido = presupuesto is not None and informe.total > presupuesto
+        repetidas = informe.repetidas(self.umbral_n_mas_1) if n_mas_1 else []
+        if not excedido and not repetidas:
+            return None
+        return {
+            'ruta': ruta,
+            'sentencias': informe.total,
+            'segundos': informe.segundos,
+            'presupuesto': presupuesto,
+            'n_mas_1': repetidas
+        }
+    
+    @staticmethod
+    def describir(infraccion):
+        """Texto del warning, con los orígenes de las sentencias repetidas."""
+        lineas = [f"⚠ SQL en {infraccion['ruta']}: {infraccion['sentencias']} sentencias "
+                  f"({infraccion['segundos'] * 1000:.1f} ms)"
+                  + (f", presupuesto {infraccion['presupuesto']}" if infraccion['presupuesto'] is not None else '')]
+        for forma, veces, origenes in infraccion['n_mas_1']:
+            lineas.append(f'  posible N+1: {veces} x {forma[:200]}')
+            for origen in origenes:
+                lineas.append(f"    desde {' <- '.join(origen) or '(fuera del proyecto)'}")
+        return '\n'.join(lineas)
+    
+    def reset(self):
+        """Olvida las infracciones registradas (para pruebas)."""
+        self.infracciones.clear()
+
+def init_auditoria_sql(app, auditoria=None):
+    """
+    Registra la auditoría de SQL por petición si SQL_AUDIT=log.
+    Retorna la auditoría o None si está desactivada.
+    """
+    if app.config.get('SQL_AUDIT', SQL_AUDIT) != 'log':
+        return None
+    _instrumentar_sql()
+    auditoria = auditoria or AuditoriaSQL()
+    app.before_request(auditoria.inicio_peticion)
+    app.teardown_request(auditoria.fin_peticion)
+    app.extensions['auditoria_sql'] = auditoria
+    return auditoria
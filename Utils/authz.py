@@ -0,0 +1,138 @@
+"""
+Autorización basada en los claims del JWT.
+
+En modo 'claims' el rol se lee directamente del token verificado, sin consultar
+la base de datos. Para que un cambio de rol o una desactivación tengan efecto
+inmediato, cada token lleva la "época de autorización" del usuario y se compara
+con la época conocida por el proceso.
+
+El registro de épocas vive en memoria y se sincroniza con la tabla
+`authz_epoch` como mucho una vez cada AUTHZ_EPOCH_SYNC_SECONDS, de modo que el
+coste por petición es cero consultas aunque haya varios workers.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from flask import current_app, jsonify
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import object_session
+from Config.DataBase import db
+from Config.jwt import AUTHZ_EPOCH_SYNC_SECONDS
+from Models.AuthzEpoch import AuthzEpoch
+from Models.Usuario import Usuario
+from Utils.transaccion import tras_commit
+
+# Atributos del usuario que afectan a la autorización
+CAMPOS_AUTORIZACION = ('rol', 'activo')
+
+_tabla_epoch = AuthzEpoch.__table__
+
+class EpochRegistry:
+    """Épocas de autorización conocidas por el proceso (email -> época)."""
+
+    def __init__(self, intervalo_sync=AUTHZ_EPOCH_SYNC_SECONDS):
+        self.intervalo_sync = intervalo_sync
+        self._epochs = {}
+        self._lock = threading.Lock()
+        self._proxima_sync = 0.0
+        self._sincronizado_hasta = None
+
+    def epoch(self, email):
+        """Época vigente del usuario (0 si nunca ha cambiado)."""
+        self.sincronizar_si_toca()
+        return self._epochs.get(email, 0)
+
+    def actualizar(self, email, epoch):
+        """Registra una época sin retroceder nunca a un valor anterior."""
+        with self._lock:
+            if epoch > self._epochs.get(email, 0):
+                self._epochs[email] = epoch
+
+    def sincronizar_si_toca(self):
+        """Relee de la BD las épocas modificadas desde la última sincronización."""
+        ahora = time.monotonic()
+        if ahora < self._proxima_sync:
+            return
+        with self._lock:
+            if ahora < self._proxima_sync:
+                return
+            self._proxima_sync = ahora + self.intervalo_sync
+            desde = self._sincronizado_hasta
+            self._sincronizado_hasta = datetime.utcnow()
+
+        consulta = select(_tabla_epoch.c.email, _tabla_epoch.c.epoch)
+        if desde is not None:
+            # Margen para cubrir relojes desfasados entre workers
+            consulta = consulta.where(
+                _tabla_epoch.c.actualizado >= desde - timedelta(seconds=self.intervalo_sync)
+            )
+        for email, epoch in db.session.execute(consulta):
+            self.actualizar(email, epoch)
+
+    def reset(self):
+        """Olvida todas las épocas y fuerza una sincronización completa."""
+        with self._lock:
+            self._epochs.clear()
+            self._proxima_sync = 0.0
+            self._sincronizado_hasta = None
+
+epoch_registry = EpochRegistry()
+
+def obtener_epoch(email):
+    """Lee de la BD la época actual de un usuario (se usa al emitir tokens)."""
+    epoch = db.session.execute(
+        select(_tabla_epoch.c.epoch).where(_tabla_epoch.c.email == email)
+    ).scalar()
+    return epoch or 0
+
+def verificar_epoch_token(jwt_header, jwt_data):
+    """
+    Callback `token_verification_loader` de JWTManager.
+    En modo 'claims' rechaza los access tokens emitidos antes del último cambio
+    de rol o de estado del usuario. Los refresh tokens no se comprueban aquí:
+    /auth/refresh ya consulta la BD y emite un token con los datos nuevos.
+    """
+    if current_app.config.get('AUTHZ_MODE') != 'claims' or jwt_data.get('type') != 'access':
+        return True
+    identidad = jwt_data[current_app.config['JWT_IDENTITY_CLAIM']]
+    return jwt_data.get('epoch', 0) >= epoch_registry.epoch(identidad)
+
+def token_obsoleto(jwt_header, jwt_data):
+    """Callback `token_verification_failed_loader`: respuesta para tokens obsoletos."""
+    return jsonify({
+        'error': 'Token obsoleto',
+        'mensaje': 'Tus permisos han cambiado, vuelve a iniciar sesión'
+    }), 401
+
+def _incrementar_epoch(connection, usuario):
+    """
+    Incrementa la época del usuario dentro de la transacción en curso. El
+    registro del proceso se actualiza solo tras el commit: si la transacción
+    se deshace, la BD conserva la época anterior y el registro no debe
+    adelantarse (rechazaría los tokens nuevos, emitidos con la de la BD).
+    """
+    email = usuario.email
+    ahora = datetime.utcnow()
+    resultado = connection.execute(
+        _tabla_epoch.update()
+        .where(_tabla_epoch.c.email == email)
+        .values(epoch=_tabla_epoch.c.epoch + 1, actualizado=ahora)
+    )
+    if resultado.rowcount == 0:
+        connection.execute(_tabla_epoch.insert().values(email=email, epoch=1, actualizado=ahora))
+    epoch = connection.execute(
+        select(_tabla_epoch.c.epoch).where(_tabla_epoch.c.email == email)
+    ).scalar()
+    tras_commit(object_session(usuario), epoch_registry.actualizar, email, epoch)
+
+@event.listens_for(Usuario, 'after_update')
+def _epoch_tras_cambio(mapper, connection, usuario):
+    """Un cambio de rol o de estado invalida los tokens ya emitidos."""
+    estado = inspect(usuario)
+    if any(estado.attrs[campo].history.has_changes() for campo in CAMPOS_AUTORIZACION):
+        _incrementar_epoch(connection, usuario)
+
+@event.listens_for(Usuario, 'after_delete')
+def _epoch_tras_baja(mapper, connection, usuario):
+    """Un usuario eliminado no debe poder seguir usando sus tokens."""
+    _incrementar_epoch(connection, usuario)
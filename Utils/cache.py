@@ -0,0 +1,86 @@
+"""
+Caché en memoria con política LRU y expiración por tiempo (TTL).
+Es compartida por todos los hilos del proceso y lleva contadores de aciertos,
+fallos y desalojos para poder medir cuántas consultas a la BD nos ahorra.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+_SIN_VALOR = object()
+
+class TTLCache:
+    """
+    Caché LRU acotada en tamaño cuyas entradas caducan tras `ttl` segundos.
+    Con `ttl=None` las entradas solo salen por desalojo o invalidación.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, reloj=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._reloj = reloj
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, clave, default=None):
+        """Retorna el valor cacheado o `default`, actualizando los contadores."""
+        with self._lock:
+            entrada = self._datos.get(clave, _SIN_VALOR)
+            if entrada is not _SIN_VALOR:
+                valor, expira = entrada
+                if expira is None or expira > self._reloj():
+                    self._datos.move_to_end(clave)
+                    self.hits += 1
+                    return valor
+                del self._datos[clave]
+            self.misses += 1
+            return default
+
+    def set(self, clave, valor):
+        """Guarda un valor, desalojando el menos usado si se supera `maxsize`."""
+        if self.maxsize <= 0:
+            return
+        expira = self._reloj() + self.ttl if self.ttl else None
+        with self._lock:
+            self._datos[clave] = (valor, expira)
+            self._datos.move_to_end(clave)
+            while len(self._datos) > self.maxsize:
+                self._datos.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, clave):
+        """Elimina una entrada concreta (si existe)."""
+        with self._lock:
+            self._datos.pop(clave, None)
+
+    def clear(self):
+        """Vacía la caché sin reiniciar los contadores."""
+        with self._lock:
+            self._datos.clear()
+
+    def reset_stats(self):
+        """Reinicia los contadores de aciertos, fallos y desalojos."""
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Retorna un diccionario con el estado actual de la caché."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / total, 4) if total else 0.0,
+                'size': len(self._datos),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl
+            }
+
+    def __len__(self):
+        return len(self._datos)
@@ -0,0 +1,29 @@
+"""
+Selección de campos de los pokémons (sparse fieldsets) recibida como query param.
+
+    fields=nombre,tipo               solo esos campos (el id se incluye siempre)
+
+La selección se aplica en la consulta (load_only: solo se leen esas columnas,
+p. ej. sin la descripción) y en el JSON. En las capturas del trainer se aplica
+al pokémon anidado; los datos de la captura se mantienen completos.
+"""
+
+# Campos de Pokemon.to_dict(), en el orden en que se serializan
+CAMPOS_POKEMON = ('id', 'nombre', 'tipo', 'nivel', 'poder_ataque', 'poder_defensa', 'hp', 'descripcion')
+
+def parse_campos(valor):
+    """
+    Lee el parámetro fields. Retorna None si no se pidió ninguna selección o
+    una tupla con los campos en el orden de CAMPOS_POKEMON, apta como parte de
+    una clave de caché. Lanza ValueError si algún campo no existe.
+    """
+    if valor is None or not valor.strip():
+        return None
+    
+    pedidos = {campo.strip() for campo in valor.split(',') if campo.strip()}
+    desconocidos = pedidos - set(CAMPOS_POKEMON)
+    if desconocidos:
+        raise ValueError(f"Campos no válidos en fields: {', '.join(sorted(desconocidos))}")
+    
+    pedidos.add('id')
+    return tuple(campo for campo in CAMPOS_POKEMON if campo in pedidos)
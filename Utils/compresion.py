@@ -0,0 +1,178 @@
+"""
+Compresión de respuestas negociada con Accept-Encoding.
+
+- gzip siempre; brotli ("br") y zstd si están instalados los paquetes
+  opcionales brotli y zstandard. Entre las que acepta el cliente con la
+  misma calidad gana el orden de COMPRESSION_ALGORITHMS.
+- Las respuestas por debajo de COMPRESSION_MIN_SIZE se envían tal cual.
+- Las respuestas en streaming se comprimen trozo a trozo: cada trozo sale
+  comprimido en cuanto se genera, sin esperar al final del documento.
+- El resultado de comprimir una respuesta con ETag (páginas del catálogo,
+  estadísticas...) se guarda por (codificación, resumen del cuerpo) y se
+  reutiliza mientras el contenido no cambie, sin volver a comprimir.
+
+Al comprimir, el ETag pasa a débil (como hace nginx): sigue sirviendo para
+If-None-Match, que ya compara en modo débil (ver Utils/etag.py), pero no
+promete los mismos bytes que la variante sin comprimir.
+"""
+import hashlib
+import zlib
+from flask import request
+from Utils.cache import TTLCache
+from Config.compresion import (
+    COMPRESSION_ENABLED, COMPRESSION_ALGORITHMS, COMPRESSION_MIN_SIZE, COMPRESSION_GZIP_LEVEL,
+    COMPRESSION_BROTLI_LEVEL, COMPRESSION_ZSTD_LEVEL, COMPRESSION_MIMETYPES, COMPRESSION_CACHE_MAXSIZE
+)
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depende del entorno
+    zstandard = None
+
+class CompresorGzip:
+    """Compresor gzip incremental: cada trozo se vacía (Z_SYNC_FLUSH) para enviarlo ya."""
+    
+    def __init__(self, nivel):
+        self._zlib = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+    
+    def trozo(self, datos):
+        return self._zlib.compress(datos) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+    
+    def final(self):
+        return self._zlib.flush()
+
+class CompresorBrotli:
+    def __init__(self, nivel):
+        self._brotli = brotli.Compressor(quality=nivel)
+    
+    def trozo(self, datos):
+        return self._brotli.process(datos) + self._brotli.flush()
+    
+    def final(self):
+        return self._brotli.finish()
+
+class CompresorZstd:
+    def __init__(self, nivel):
+        self._zstd = zstandard.ZstdCompressor(level=nivel).compressobj()
+    
+    def trozo(self, datos):
+        return self._zstd.compress(datos) + self._zstd.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    
+    def final(self):
+        return self._zstd.flush()
+
+def comprimir(codificacion, datos, nivel):
+    """Comprime `datos` de una vez con la codificación indicada."""
+    if codificacion == 'gzip':
+        # wbits=31: formato gzip (cabecera y CRC), no zlib
+        compresor = zlib.compressobj(nivel, zlib.DEFLATED, 31)
+        return compresor.compress(datos) + compresor.flush()
+    if codificacion == 'br':
+        return brotli.compress(datos, quality=nivel)
+    if codificacion == 'zstd':
+        return zstandard.ZstdCompressor(level=nivel).compress(datos)
+    raise ValueError(f"Codificación no soportada: {codificacion}")
+
+# Codificación -> (clase del compresor incremental, disponible)
+COMPRESORES = {
+    'gzip': (CompresorGzip, True),
+    'br': (CompresorBrotli, brotli is not None),
+    'zstd': (CompresorZstd, zstandard is not None),
+}
+
+def codificaciones_disponibles(preferencia=COMPRESSION_ALGORITHMS):
+    """Codificaciones de `preferencia` soportadas en este entorno, en ese orden."""
+    return [c for c in preferencia if c in COMPRESORES and COMPRESORES[c][1]]
+
+# Variantes comprimidas de respuestas con ETag, clave (codificación, nivel, resumen)
+variantes_cache = TTLCache(maxsize=COMPRESSION_CACHE_MAXSIZE, ttl=None)
+
+class Compresion:
+    """
+    Middleware de compresión (hook after_request). Los valores por defecto
+    vienen de Config/compresion.py; `init_compresion` lo registra en la app.
+    """
+    
+    def __init__(self, algoritmos=COMPRESSION_ALGORITHMS, min_size=COMPRESSION_MIN_SIZE,
+                 niveles=None, mimetypes=COMPRESSION_MIMETYPES, cache=variantes_cache):
+        self.codificaciones = codificaciones_disponibles(algoritmos)
+        self.min_size = min_size
+        self.niveles = {
+            'gzip': COMPRESSION_GZIP_LEVEL,
+            'br': COMPRESSION_BROTLI_LEVEL,
+            'zstd': COMPRESSION_ZSTD_LEVEL,
+            **(niveles or {})
+        }
+        self.mimetypes = mimetypes
+        self.cache = cache
+    
+    def _comprimible(self, respuesta):
+        return (respuesta.status_code >= 200 and respuesta.status_code not in (204, 206, 304)
+                and respuesta.mimetype in self.mimetypes
+                and 'Content-Encoding' not in respuesta.headers
+                and not respuesta.cache_control.no_transform)
+    
+    def __call__(self, respuesta):
+        if not self.codificaciones or request.method == 'HEAD' or not self._comprimible(respuesta):
+            return respuesta
+        
+        # La representación depende de Accept-Encoding aunque esta vez no se comprima
+        respuesta.vary.add('Accept-Encoding')
+        codificacion = request.accept_encodings.best_match(self.codificaciones)
+        if codificacion is None:
+            return respuesta
+        
+        if respuesta.is_streamed:
+            respuesta.response = self._comprimir_stream(respuesta.response, codificacion)
+            respuesta.headers.pop('Content-Length', None)
+        else:
+            datos = respuesta.get_data()
+            if len(datos) < self.min_size:
+                return respuesta
+            respuesta.set_data(self._comprimir(codificacion, datos, reutilizable='ETag' in respuesta.headers))
+        
+        respuesta.headers['Content-Encoding'] = codificacion
+        etag, debil = respuesta.get_etag()
+        if etag and not debil:
+            respuesta.set_etag(etag, weak=True)
+        return respuesta
+    
+    def _comprimir(self, codificacion, datos, reutilizable):
+        nivel = self.niveles[codificacion]
+        if not reutilizable:
+            return comprimir(codificacion, datos, nivel)
+        clave = (codificacion, nivel, hashlib.blake2b(datos, digest_size=16).digest())
+        comprimido = self.cache.get(clave)
+        if comprimido is None:
+            comprimido = comprimir(codificacion, datos, nivel)
+            self.cache.set(clave, comprimido)
+        return comprimido
+    
+    def _comprimir_stream(self, trozos, codificacion):
+        compresor = COMPRESORES[codificacion][0](self.niveles[codificacion])
+        try:
+            for trozo in trozos:
+                if isinstance(trozo, str):
+                    trozo = trozo.encode()
+                if trozo:
+                    yield compresor.trozo(trozo)
+            yield compresor.final()
+        finally:
+            # Cierra el iterable original (libera el contexto y el cursor de la BD)
+            cerrar = getattr(trozos, 'close', None)
+            if cerrar is not None:
+                cerrar()
+
+def init_compresion(app, compresion=None):
+    """Registra la compresión de respuestas en la app si está activada."""
+    if not app.config.get('COMPRESSION_ENABLED', COMPRESSION_ENABLED):
+        return None
+    compresion = compresion or Compresion()
+    app.after_request(compresion)
+    app.extensions['compresion'] = compresion
+    return compresion
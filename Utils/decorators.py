@@ -2,9 +2,99 @@
 Decoradores personalizados para proteger rutas según roles de usuario.
 """
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask import current_app, jsonify, g
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached, object_session
+from Config.cache import USER_CACHE_MAXSIZE, USER_CACHE_TTL
+from Config.DataBase import db
 from Models.Usuario import Usuario
+from Utils.authz import epoch_registry
+from Utils.cache import TTLCache
+from Utils.transaccion import tras_commit
+
+# Caché de usuarios compartida por todo el proceso (clave: email del JWT).
+# Guarda una copia de las columnas, no el objeto ORM, para no arrastrar
+# instancias de una sesión a otra, junto con la época de autorización del
+# usuario al leerla: los cambios de rol o de estado hechos en otro worker
+# adelantan la época (ver Utils/authz.py) y dejan la copia obsoleta.
+usuario_cache = TTLCache(maxsize=USER_CACHE_MAXSIZE, ttl=USER_CACHE_TTL)
+
+_COLUMNAS_USUARIO = [columna.key for columna in inspect(Usuario).column_attrs]
+
+def _cargar_usuario(email):
+    """
+    Carga un usuario pasando primero por la caché del proceso.
+    Retorna una instancia desacoplada de la sesión con todas sus columnas
+    cargadas: así un commit posterior del handler no la expira ni provoca
+    otro SELECT. Es de solo lectura; para modificarla hay que consultarla.
+    
+    La copia cacheada se descarta si la época del usuario es posterior a la
+    de la copia, así que un cambio de rol hecho en otro worker se ve como
+    mucho AUTHZ_EPOCH_SYNC_SECONDS después.
+    """
+    # La época se lee antes que la fila: si cambia entre medias, la copia
+    # queda con la época anterior y se relee en la siguiente petición
+    epoch = epoch_registry.epoch(email)
+    entrada = usuario_cache.get(email)
+    if entrada is not None and entrada[0] >= epoch:
+        snapshot = entrada[1]
+    else:
+        usuario = Usuario.query.filter_by(email=email).first()
+        if not usuario:
+            return None
+        snapshot = {clave: getattr(usuario, clave) for clave in _COLUMNAS_USUARIO}
+        usuario_cache.set(email, (epoch, snapshot))
+    
+    usuario = Usuario(**snapshot)
+    make_transient_to_detached(usuario)
+    return usuario
+
+def resolver_usuario_actual():
+    """
+    Resuelve el usuario del token JWT una sola vez por petición.
+    El resultado (incluido None) se guarda en `flask.g` para que los
+    decoradores y el handler compartan la misma instancia.
+    """
+    if 'usuario_actual' not in g:
+        verify_jwt_in_request()
+        g.usuario_actual = _cargar_usuario(get_jwt_identity())
+    return g.usuario_actual
+
+def resolver_rol_actual():
+    """
+    Retorna el rol del usuario autenticado (o None si no existe).
+    En modo AUTHZ_MODE='claims' se toma del token ya verificado, cuya época de
+    autorización comprueba JWTManager, sin tocar la BD. Los tokens antiguos
+    que no llevan los claims necesarios se resuelven consultando al usuario.
+    """
+    if current_app.config.get('AUTHZ_MODE') == 'claims':
+        verify_jwt_in_request()
+        claims = get_jwt()
+        if 'rol' in claims and 'epoch' in claims:
+            return claims['rol']
+    
+    usuario = resolver_usuario_actual()
+    return usuario.rol if usuario else None
+
+def invalidar_usuario_cache(email):
+    """Elimina un usuario de la caché (por ejemplo tras registrarlo o modificarlo)."""
+    if email:
+        usuario_cache.invalidate(email)
+
+@event.listens_for(Usuario, 'after_insert')
+@event.listens_for(Usuario, 'after_update')
+@event.listens_for(Usuario, 'after_delete')
+def _invalidar_tras_escritura(mapper, connection, usuario):
+    """
+    Cualquier alta, cambio (rol, activo, email...) o baja invalida la caché.
+    Se invalida tras el commit: durante el flush otra petición aún puede leer
+    la fila anterior y volver a cachearla.
+    """
+    emails = [usuario.email, *(inspect(usuario).attrs.email.history.deleted or ())]
+    session = object_session(usuario)
+    for email in emails:
+        tras_commit(session, invalidar_usuario_cache, email)
 
 def profesor_required():
     """
@@ -14,18 +104,15 @@ def profesor_required():
     def wrapper(fn):
         @wraps(fn)
         def decorator(*args, **kwargs):
-            verify_jwt_in_request()
-            email = get_jwt_identity()
-            
-            usuario = Usuario.query.filter_by(email=email).first()
+            rol = resolver_rol_actual()
             
-            if not usuario:
+            if not rol:
                 return jsonify({
                     'error': 'Usuario no encontrado',
                     'mensaje': 'Tu sesión ha expirado o el usuario no existe'
                 }), 404
             
-            if usuario.rol != 'profesor':
+            if rol != 'profesor':
                 return jsonify({
                     'error': 'Acceso denegado',
                     'mensaje': 'Solo los profesores tienen acceso a esta funcionalidad'
@@ -43,18 +130,15 @@ def trainer_or_profesor_required():
     def wrapper(fn):
         @wraps(fn)
         def decorator(*args, **kwargs):
-            verify_jwt_in_request()
-            email = get_jwt_identity()
+            rol = resolver_rol_actual()
             
-            usuario = Usuario.query.filter_by(email=email).first()
-            
-            if not usuario:
+            if not rol:
                 return jsonify({
                     'error': 'Usuario no encontrado',
                     'mensaje': 'Tu sesión ha expirado o el usuario no existe'
                 }), 404
             
-            if usuario.rol not in ['profesor', 'trainer']:
+            if rol not in ['profesor', 'trainer']:
                 return jsonify({
                     'error': 'Acceso denegado',
                     'mensaje': 'No tienes permisos para acceder a esta funcionalidad'
@@ -64,14 +148,29 @@ def trainer_or_profesor_required():
         return decorator
     return wrapper
 
+def solo_lectura():
+    """
+    Decorador para endpoints que solo leen: sus consultas van por el engine de
+    solo lectura (SQLite en archivo) si está activo; si no, por el habitual.
+    Debe ir antes de @jwt_required() para que la carga del usuario también lo use.
+    """
+    def wrapper(fn):
+        @wraps(fn)
+        def decorator(*args, **kwargs):
+            db.session.info['solo_lectura'] = True
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                db.session.info.pop('solo_lectura', None)
+        return decorator
+    return wrapper
+
 def get_current_user():
     """
     Obtiene el usuario actual desde el token JWT.
     Retorna el objeto Usuario o None si no existe.
     """
     try:
-        verify_jwt_in_request()
-        email = get_jwt_identity()
-        return Usuario.query.filter_by(email=email).first()
+        return resolver_usuario_actual()
     except:
         return None
@@ -0,0 +1,33 @@
+"""
+Peticiones condicionales con ETag.
+
+La comprobación de If-None-Match se hace antes de consultar y serializar los
+datos, de modo que un cliente con la versión vigente recibe un 304 vacío.
+Las respuestas dependen del usuario del token, así que se marcan como privadas
+y varían según la cabecera Authorization (y Accept-Encoding si la compresión
+está activa: un 304 debe llevar el mismo Vary que el 200 que valida).
+"""
+from flask import current_app, make_response, request
+
+def _cabeceras_cache(respuesta, etag):
+    respuesta.set_etag(etag)
+    respuesta.vary.add('Authorization')
+    compresion = current_app.extensions.get('compresion')
+    if compresion is not None and compresion.codificaciones:
+        respuesta.vary.add('Accept-Encoding')
+    respuesta.cache_control.private = True
+    respuesta.cache_control.no_cache = True
+    return respuesta
+
+def no_modificado(etag):
+    """Retorna una respuesta 304 si el cliente ya tiene `etag`; si no, None."""
+    if etag and request.if_none_match.contains_weak(etag):
+        return _cabeceras_cache(make_response('', 304), etag)
+    return None
+
+def con_etag(respuesta, etag):
+    """Añade el ETag y las cabeceras de caché a una respuesta 200."""
+    respuesta = make_response(respuesta)
+    if etag:
+        _cabeceras_cache(respuesta, etag)
+    return respuesta
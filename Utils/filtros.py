@@ -0,0 +1,53 @@
+"""
+Filtros del listado de pokémons recibidos como query params.
+
+    tipo=volador                     uno de los tipos del pokémon (sin acentos ni mayúsculas)
+    nombre=pika                      prefijo del nombre (sin distinguir mayúsculas)
+    nivel_min=30&nivel_max=50        rangos inclusivos; también poder_ataque_*,
+                                     poder_defensa_* y hp_*
+
+parse_filtros() retorna un diccionario solo con los filtros recibidos, ya
+convertidos y normalizados, apto como parte de una clave de caché.
+"""
+from Utils.texto import normalizar
+
+# Campo numérico -> tipo de sus límites
+RANGOS = {
+    'nivel': int,
+    'poder_ataque': float,
+    'poder_defensa': float,
+    'hp': int,
+}
+
+def parse_filtros(args):
+    """Lee los filtros de los query params. Lanza ValueError si alguno no es válido."""
+    filtros = {}
+    
+    tipo = args.get('tipo', '').strip()
+    if tipo:
+        filtros['tipo'] = normalizar(tipo)
+    
+    nombre = args.get('nombre', '').strip()
+    if nombre:
+        filtros['nombre'] = nombre
+    
+    for campo, conversor in RANGOS.items():
+        for sufijo in ('min', 'max'):
+            parametro = f'{campo}_{sufijo}'
+            valor = args.get(parametro, '').strip()
+            if not valor:
+                continue
+            try:
+                filtros[parametro] = conversor(valor)
+            except ValueError:
+                tipo_esperado = 'un número entero' if conversor is int else 'un número'
+                raise ValueError(f"El parámetro {parametro} debe ser {tipo_esperado}")
+        minimo, maximo = filtros.get(f'{campo}_min'), filtros.get(f'{campo}_max')
+        if minimo is not None and maximo is not None and minimo > maximo:
+            raise ValueError(f"{campo}_min no puede ser mayor que {campo}_max")
+    
+    return filtros
+
+def clave_filtros(filtros):
+    """Representación hashable y estable de los filtros (para claves de caché)."""
+    return tuple(sorted((filtros or {}).items()))
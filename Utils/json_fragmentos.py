@@ -0,0 +1,60 @@
+"""
+Fragmentos de JSON ya codificados.
+
+Un JSONCrudo guarda el texto JSON de un valor (p. ej. un pokémon) para poder
+reutilizarlo entre peticiones sin volver a construir el diccionario ni a
+codificarlo. Al responder, cada fragmento se sustituye por una marca única,
+se codifica solo el envoltorio (pocos bytes) con el proveedor JSON de la app
+y después las marcas se reemplazan por los fragmentos en una sola pasada.
+"""
+import re
+import secrets
+from flask import current_app
+
+# Marca aleatoria por proceso: ningún dato de usuario puede imitarla
+_TOKEN = secrets.token_hex(8)
+_MARCA = f'\x00fragmento-{_TOKEN}:'
+# Así queda la marca una vez codificada (el carácter nulo siempre se escapa)
+_PATRON = re.compile(rf'"\\u0000fragmento-{_TOKEN}:(\d+)"')
+
+class JSONCrudo:
+    """Texto JSON ya codificado que se inserta tal cual en la respuesta."""
+    __slots__ = ('texto',)
+    
+    def __init__(self, texto):
+        self.texto = texto
+    
+    def __repr__(self):
+        return f'<JSONCrudo {self.texto[:40]}>'
+
+def codificar(valor):
+    """Codifica `valor` en el formato compacto que usa jsonify en producción."""
+    return current_app.json.dumps(valor, separators=(',', ':'))
+
+def _sustituir(valor, fragmentos):
+    if isinstance(valor, JSONCrudo):
+        fragmentos.append(valor.texto)
+        return f'{_MARCA}{len(fragmentos) - 1}'
+    if isinstance(valor, dict):
+        return {clave: _sustituir(v, fragmentos) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_sustituir(v, fragmentos) for v in valor]
+    return valor
+
+def dumps_con_fragmentos(valor):
+    """Codifica `valor` (compacto) insertando el texto de los JSONCrudo que contenga."""
+    fragmentos = []
+    texto = codificar(_sustituir(valor, fragmentos))
+    if not fragmentos:
+        return texto
+    return _PATRON.sub(lambda m: fragmentos[int(m.group(1))], texto)
+
+def respuesta_json(valor):
+    """Equivalente a jsonify(valor) que admite JSONCrudo en cualquier nivel."""
+    fragmentos = []
+    respuesta = current_app.json.response(_sustituir(valor, fragmentos))
+    if fragmentos:
+        respuesta.set_data(_PATRON.sub(
+            lambda m: fragmentos[int(m.group(1))], respuesta.get_data(as_text=True)
+        ))
+    return respuesta
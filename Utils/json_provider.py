@@ -0,0 +1,129 @@
+"""
+Proveedor JSON de Flask con codificador rápido opcional (orjson).
+
+Produce exactamente los mismos bytes que el proveedor por defecto de Flask:
+- claves ordenadas (sort_keys) y formato compacto o con indent=2, según pida
+  jsonify;
+- caracteres no ASCII escapados como \\uXXXX (ensure_ascii), así que
+  "Psíquico" sale como "Ps\\u00edquico", igual que antes;
+- fechas, Decimal, UUID y dataclasses convertidos con el mismo `default` de
+  Flask (las fechas de los modelos ya llegan como texto con isoformat()).
+
+Cuando orjson no puede reproducir ese formato (otros separadores, claves no
+textuales, enteros de más de 64 bits...) se usa la librería estándar. Única
+diferencia conocida: los float en notación exponencial (< 1e-4 o >= 1e16) y
+NaN/Infinity se escriben distinto; la API no genera esos valores.
+"""
+import re
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+# Secuencias que deja encode('ascii', 'backslashreplace') y que json.dumps
+# escribe de otra forma. Las barras escapadas (dos seguidas) se consumen como
+# pareja para no confundir una barra literal seguida de 'x' con un escape.
+_BARRAS = re.compile(rb'\\(?:\\|x([0-9a-f]{2})|U([0-9a-f]{8}))')
+
+def _corregir_escape(coincidencia):
+    latin, astral = coincidencia.groups()
+    if latin is not None:
+        return b'\\u00' + latin
+    if astral is not None:
+        # Fuera del plano básico json.dumps usa un par sustituto
+        codigo = int(astral, 16) - 0x10000
+        return b'\\u%04x\\u%04x' % (0xd800 | (codigo >> 10), 0xdc00 | (codigo & 0x3ff))
+    return coincidencia.group()
+
+def escapar_no_ascii(datos):
+    """
+    Convierte la salida UTF-8 de orjson en la de json.dumps(ensure_ascii=True).
+    Se hace en C con backslashreplace y solo se recurre a la expresión regular
+    si el documento contiene barras invertidas literales o caracteres astrales.
+    """
+    if datos.isascii():
+        return datos
+    escapado = datos.decode().encode('ascii', 'backslashreplace')
+    if b'\\\\' not in escapado and b'\\U' not in escapado:
+        return escapado.replace(b'\\x', b'\\u00')
+    return _BARRAS.sub(_corregir_escape, escapado)
+
+class FastJSONProvider(DefaultJSONProvider):
+    """DefaultJSONProvider que codifica con orjson cuando el resultado es idéntico."""
+
+    def __init__(self, app, usar_orjson=None):
+        super().__init__(app)
+        if usar_orjson is None:
+            usar_orjson = orjson is not None
+        self.usar_orjson = usar_orjson and orjson is not None
+
+    def _opciones_orjson(self, kwargs):
+        """Traduce los argumentos de json.dumps a opciones de orjson (None si no hay equivalente)."""
+        kwargs = dict(kwargs)
+        separadores = kwargs.pop('separators', None)
+        indent = kwargs.pop('indent', None)
+        if kwargs:
+            return None
+        opciones = orjson.OPT_PASSTHROUGH_DATETIME
+        if indent is None:
+            # Sin indent, json.dumps separa con ', ' y ': ' (orjson no sabe)
+            if tuple(separadores or ()) != (',', ':'):
+                return None
+        elif indent == 2 and separadores in (None, (',', ': ')):
+            opciones |= orjson.OPT_INDENT_2
+        else:
+            return None
+        if self.sort_keys:
+            opciones |= orjson.OPT_SORT_KEYS
+        return opciones
+
+    def _dumps_orjson(self, obj, kwargs):
+        """Bytes idénticos a los de json.dumps, o None si orjson no puede producirlos."""
+        if not self.usar_orjson:
+            return None
+        opciones = self._opciones_orjson(kwargs)
+        if opciones is None:
+            return None
+        try:
+            datos = orjson.dumps(obj, default=self.default, option=opciones)
+        except TypeError:
+            # orjson.JSONEncodeError: lo resuelve (o lo explica) la librería estándar
+            return None
+        return escapar_no_ascii(datos) if self.ensure_ascii else datos
+
+    def dumps(self, obj, **kwargs):
+        datos = self._dumps_orjson(obj, kwargs)
+        if datos is None:
+            return super().dumps(obj, **kwargs)
+        return datos.decode()
+
+    def response(self, *args, **kwargs):
+        """Como DefaultJSONProvider.response, pero sin pasar por str con orjson."""
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            dump_args = {'indent': 2}
+        else:
+            dump_args = {'separators': (',', ':')}
+        datos = self._dumps_orjson(obj, dump_args)
+        if datos is None:
+            return super().response(obj)
+        return self._app.response_class(datos + b'\n', mimetype=self.mimetype)
+
+    def loads(self, s, **kwargs):
+        if self.usar_orjson and not kwargs:
+            try:
+                return orjson.loads(s)
+            except orjson.JSONDecodeError:
+                # NaN, Infinity y demás extensiones que acepta json.loads
+                pass
+        return super().loads(s, **kwargs)
+
+def crear_json_provider(app, tipo='auto'):
+    """Crea el proveedor JSON configurado en JSON_PROVIDER ('auto', 'orjson' o 'stdlib')."""
+    if tipo not in ('auto', 'orjson', 'stdlib'):
+        raise ValueError(f"JSON_PROVIDER no válido: {tipo}")
+    if tipo == 'orjson' and orjson is None:
+        print("⚠️  JSON_PROVIDER=orjson pero orjson no está instalado, se usa la librería estándar")
+    return FastJSONProvider(app, usar_orjson=tipo != 'stdlib')
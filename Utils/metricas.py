@@ -0,0 +1,218 @@
+"""
+Métricas de peticiones HTTP y de consultas SQL en formato de texto de Prometheus.
+
+Por cada petición se registran, con las etiquetas blueprint, route (la regla
+de la URL, p. ej. /api/pokemon/<int:pokemon_id>) y method:
+
+- apipokemon_http_request_duration_seconds: histograma de latencia;
+- apipokemon_http_responses_total: respuestas por código de estado;
+- apipokemon_db_statements_per_request y apipokemon_db_statement_seconds_per_request:
+  histogramas del número de sentencias SQL y de su tiempo total por petición,
+  medidos con los eventos before/after_cursor_execute de SQLAlchemy.
+
+La petición se cierra en teardown_request, así que en las respuestas en
+streaming la latencia y las consultas incluyen el envío del cuerpo.
+
+Para no añadir contención, cada hilo escribe en sus propios contadores (sin
+lock) y solo al exportar se suman los de todos los hilos. Los de hilos que ya
+terminaron se acumulan aparte para no perderlos ni guardarlos indefinidamente.
+"""
+import threading
+import time
+from bisect import bisect_left
+from flask import g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from Config.metricas import (
+    METRICS_ENABLED, METRICS_LATENCY_BUCKETS, METRICS_DB_QUERIES_BUCKETS, METRICS_DB_TIME_BUCKETS
+)
+
+PREFIJO = 'apipokemon'
+
+ETIQUETAS_RUTA = ('blueprint', 'route', 'method')
+
+# Histograma -> texto de ayuda (sus límites están en RegistroMetricas.limites)
+HISTOGRAMAS = {
+    'http_request_duration_seconds': 'Duración de las peticiones HTTP en segundos',
+    'db_statements_per_request': 'Sentencias SQL ejecutadas por petición',
+    'db_statement_seconds_per_request': 'Tiempo total de las sentencias SQL por petición, en segundos',
+}
+
+def _observar(tabla, clave, limites, valor):
+    # Lista con un contador por bucket (el último es +Inf) y la suma al final
+    histograma = tabla.get(clave)
+    if histograma is None:
+        histograma = tabla[clave] = [0] * (len(limites) + 2)
+    histograma[bisect_left(limites, valor)] += 1
+    histograma[-1] += valor
+
+def _sumar(destino, origen):
+    for clave, valores in list(origen.items()):
+        actual = destino.get(clave)
+        if actual is None:
+            destino[clave] = list(valores) if isinstance(valores, list) else valores
+        elif isinstance(valores, list):
+            destino[clave] = [a + b for a, b in zip(actual, valores)]
+        else:
+            destino[clave] = actual + valores
+
+def _nuevo_almacen():
+    return {nombre: {} for nombre in (*HISTOGRAMAS, 'http_responses_total')}
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _etiquetas(nombres, valores, extra=''):
+    pares = [f'{nombre}="{_escapar(valor)}"' for nombre, valor in zip(nombres, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}'
+
+def _numero(valor):
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+class RegistroMetricas:
+    """Contadores por hilo de las peticiones, agregados solo al exportar."""
+    
+    def __init__(self, latencia=METRICS_LATENCY_BUCKETS, consultas=METRICS_DB_QUERIES_BUCKETS,
+                 tiempo_sql=METRICS_DB_TIME_BUCKETS):
+        self.limites = {
+            'http_request_duration_seconds': sorted(map(float, latencia)),
+            'db_statements_per_request': sorted(map(float, consultas)),
+            'db_statement_seconds_per_request': sorted(map(float, tiempo_sql)),
+        }
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._almacenes = []  # (hilo, almacén) de cada hilo que ha registrado algo
+        self._retirados = _nuevo_almacen()
+    
+    def _almacen(self):
+        almacen = getattr(self._local, 'almacen', None)
+        if almacen is None:
+            almacen = self._local.almacen = _nuevo_almacen()
+            # El lock solo se toma la primera vez que un hilo registra algo
+            with self._lock:
+                self._almacenes.append((threading.current_thread(), almacen))
+        return almacen
+    
+    def observar_peticion(self, etiquetas, estado, segundos, sentencias, segundos_sql):
+        """Registra una petición terminada. `etiquetas` = (blueprint, route, method)."""
+        almacen = self._almacen()
+        _observar(almacen['http_request_duration_seconds'], etiquetas,
+                  self.limites['http_request_duration_seconds'], segundos)
+        _observar(almacen['db_statements_per_request'], etiquetas,
+                  self.limites['db_statements_per_request'], sentencias)
+        _observar(almacen['db_statement_seconds_per_request'], etiquetas,
+                  self.limites['db_statement_seconds_per_request'], segundos_sql)
+        respuestas = almacen['http_responses_total']
+        clave = (*etiquetas, estado)
+        respuestas[clave] = respuestas.get(clave, 0) + 1
+    
+    def agregar(self):
+        """Suma los contadores de todos los hilos (los de hilos terminados se consolidan)."""
+        total = _nuevo_almacen()
+        with self._lock:
+            vivos = []
+            for hilo, almacen in self._almacenes:
+                if hilo.is_alive():
+                    vivos.append((hilo, almacen))
+                else:
+                    for nombre in almacen:
+                        _sumar(self._retirados[nombre], almacen[nombre])
+            self._almacenes = vivos
+            for nombre in total:
+                _sumar(total[nombre], self._retirados[nombre])
+            for _, almacen in vivos:
+                for nombre in total:
+                    _sumar(total[nombre], almacen[nombre])
+        return total
+    
+    def exportar(self):
+        """Texto de exposición de Prometheus (versión 0.0.4)."""
+        total = self.agregar()
+        lineas = []
+        for nombre, ayuda in HISTOGRAMAS.items():
+            metrica = f'{PREFIJO}_{nombre}'
+            lineas += [f'# HELP {metrica} {ayuda}', f'# TYPE {metrica} histogram']
+            limites = self.limites[nombre]
+            for etiquetas, histograma in sorted(total[nombre].items()):
+                acumulado = 0
+                for limite, cuenta in zip([*limites, '+Inf'], histograma[:-1]):
+                    acumulado += cuenta
+                    le = 'le="+Inf"' if limite == '+Inf' else f'le="{_numero(limite)}"'
+                    lineas.append(f'{metrica}_bucket{_etiquetas(ETIQUETAS_RUTA, etiquetas, le)} {acumulado}')
+                lineas.append(f'{metrica}_sum{_etiquetas(ETIQUETAS_RUTA, etiquetas)} {_numero(histograma[-1])}')
+                lineas.append(f'{metrica}_count{_etiquetas(ETIQUETAS_RUTA, etiquetas)} {acumulado}')
+        
+        metrica = f'{PREFIJO}_http_responses_total'
+        lineas += [f'# HELP {metrica} Respuestas HTTP por código de estado', f'# TYPE {metrica} counter']
+        for etiquetas, cuenta in sorted(total['http_responses_total'].items()):
+            lineas.append(f'{metrica}{_etiquetas((*ETIQUETAS_RUTA, "status"), etiquetas)} {cuenta}')
+        return '\n'.join(lineas) + '\n'
+    
+    def reset(self):
+        """Vacía todos los contadores (para pruebas)."""
+        with self._lock:
+            for _, almacen in self._almacenes:
+                for tabla in almacen.values():
+                    tabla.clear()
+            self._retirados = _nuevo_almacen()
+
+registro_metricas = RegistroMetricas()
+
+# Sentencias SQL de la petición en curso en este hilo: [número, segundos]
+_peticion_sql = threading.local()
+
+def _antes_de_sentencia(conn, cursor, statement, parameters, context, executemany):
+    conn.info['metricas_inicio'] = time.perf_counter()
+
+def _despues_de_sentencia(conn, cursor, statement, parameters, context, executemany):
+    contadores = getattr(_peticion_sql, 'contadores', None)
+    inicio = conn.info.pop('metricas_inicio', None)
+    if contadores is not None and inicio is not None:
+        contadores[0] += 1
+        contadores[1] += time.perf_counter() - inicio
+
+def _instrumentar_sql():
+    # A nivel de clase: cubre todos los engines (también el de solo lectura)
+    if not event.contains(Engine, 'before_cursor_execute', _antes_de_sentencia):
+        event.listen(Engine, 'before_cursor_execute', _antes_de_sentencia)
+        event.listen(Engine, 'after_cursor_execute', _despues_de_sentencia)
+
+def _inicio_peticion():
+    g.metricas_inicio = time.perf_counter()
+    _peticion_sql.contadores = [0, 0.0]
+
+def _guardar_estado(respuesta):
+    g.metricas_estado = respuesta.status_code
+    return respuesta
+
+def _fin_peticion(registro):
+    def fin_peticion(excepcion=None):
+        inicio = g.pop('metricas_inicio', None)
+        contadores = getattr(_peticion_sql, 'contadores', None)
+        _peticion_sql.contadores = None
+        if inicio is None:
+            return
+        regla = request.url_rule
+        etiquetas = (request.blueprint or '', regla.rule if regla else '<sin_ruta>', request.method)
+        estado = g.pop('metricas_estado', 500 if excepcion else 200)
+        sentencias, segundos_sql = contadores or (0, 0.0)
+        registro.observar_peticion(etiquetas, estado, time.perf_counter() - inicio, sentencias, segundos_sql)
+    return fin_peticion
+
+def init_metricas(app, registro=registro_metricas):
+    """
+    Registra la medición de peticiones y consultas SQL en la app si está
+    activada. Debe llamarse antes que los demás hooks para que su
+    after_request sea el último en ejecutarse (incluye p. ej. la compresión).
+    Retorna el registro o None si las métricas están desactivadas.
+    """
+    if not app.config.get('METRICS_ENABLED', METRICS_ENABLED):
+        return None
+    _instrumentar_sql()
+    app.before_request(_inicio_peticion)
+    app.after_request(_guardar_estado)
+    app.teardown_request(_fin_peticion(registro))
+    app.extensions['metricas'] = registro
+    return registro
@@ -0,0 +1,64 @@
+"""
+Utilidades para la paginación por cursor (keyset) de los listados.
+
+El cursor es opaco para el cliente: codifica el último `id` entregado y la
+siguiente página se obtiene con `WHERE id > :ultimo_id ORDER BY id LIMIT n`,
+cuyo coste no depende de lo lejos que se pagine (a diferencia de OFFSET).
+"""
+import base64
+import json
+from Config.pagination import PAGE_SIZE_DEFAULT, PAGE_SIZE_MAX
+
+def parse_limit(valor):
+    """
+    Convierte el parámetro `limit` en un tamaño de página válido.
+    Lanza ValueError si no es un entero positivo; los valores mayores que
+    PAGE_SIZE_MAX se recortan a ese máximo.
+    """
+    if valor is None or valor == '':
+        return PAGE_SIZE_DEFAULT
+    try:
+        limit = int(valor)
+    except (TypeError, ValueError):
+        raise ValueError("El parámetro limit debe ser un número entero")
+    if limit <= 0:
+        raise ValueError("El parámetro limit debe ser positivo")
+    return min(limit, PAGE_SIZE_MAX)
+
+def encode_cursor(ultimo_id):
+    """Codifica el último id entregado como un cursor opaco."""
+    if ultimo_id is None:
+        return None
+    datos = json.dumps({'id': ultimo_id}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(datos).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decodifica un cursor recibido del cliente y retorna el último id entregado.
+    Sin cursor retorna 0 (primera página). Lanza ValueError si es inválido.
+    """
+    if not cursor:
+        return 0
+    try:
+        relleno = '=' * (-len(cursor) % 4)
+        datos = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+        ultimo_id = datos['id']
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("El cursor de paginación no es válido")
+    if not isinstance(ultimo_id, int) or isinstance(ultimo_id, bool) or ultimo_id < 0:
+        raise ValueError("El cursor de paginación no es válido")
+    return ultimo_id
+
+def parse_paginacion(args):
+    """Lee `limit` y `cursor` de los query params. Retorna (ultimo_id, limit)."""
+    return decode_cursor(args.get('cursor')), parse_limit(args.get('limit'))
+
+def cortar_pagina(filas, limit):
+    """
+    Recibe hasta `limit + 1` filas ordenadas por id y retorna la página y el
+    cursor siguiente (None si no quedan más filas).
+    """
+    if len(filas) > limit:
+        filas = filas[:limit]
+        return filas, encode_cursor(filas[-1].id)
+    return filas, None
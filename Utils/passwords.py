@@ -0,0 +1,72 @@
+"""
+Hash y verificación de contraseñas.
+
+El método de hash (algoritmo y coste) sale de Config/passwords.py. Los hashes
+guardados con otros parámetros se detectan con necesita_rehash() para
+recalcularlos en el login, cuando se conoce la contraseña en claro.
+
+La verificación, la parte cara del login, corre en un ejecutor acotado:
+como mucho PASSWORD_HASH_WORKERS a la vez (hashlib libera el GIL, así que
+usan varios núcleos) y PASSWORD_HASH_QUEUE esperando. Con el ejecutor lleno
+verificar() lanza VerificacionSaturada al instante, de modo que una avalancha de
+logins no deja sin CPU ni sin hilos al resto de rutas.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from werkzeug.security import generate_password_hash, check_password_hash
+from Config.passwords import (
+    PASSWORD_HASH_ALGORITHM, PASSWORD_HASH_COST, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE
+)
+
+# Coste por defecto de cada algoritmo (los de werkzeug 3.1)
+_COSTES_POR_DEFECTO = {'scrypt': 32768, 'pbkdf2': 1000000}
+
+def metodo_hash(algoritmo=PASSWORD_HASH_ALGORITHM, coste=PASSWORD_HASH_COST):
+    """
+    Método de werkzeug para el algoritmo y coste dados, escrito igual que el
+    prefijo de los hashes que genera ('scrypt:32768:8:1', 'pbkdf2:sha256:600000').
+    """
+    if algoritmo not in _COSTES_POR_DEFECTO:
+        raise ValueError(f"PASSWORD_HASH_ALGORITHM no válido: {algoritmo}")
+    coste = coste or _COSTES_POR_DEFECTO[algoritmo]
+    if algoritmo == 'scrypt':
+        return f"scrypt:{coste}:8:1"
+    return f"pbkdf2:sha256:{coste}"
+
+class VerificacionSaturada(Exception):
+    """El ejecutor de verificaciones está lleno."""
+
+class PasswordHasher:
+    """Genera hashes con el método configurado y verifica en un ejecutor acotado."""
+
+    def __init__(self, metodo=None, workers=PASSWORD_HASH_WORKERS, cola=PASSWORD_HASH_QUEUE):
+        self.metodo = metodo or metodo_hash()
+        self.workers = workers
+        self._ejecutor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+        self._plazas = threading.BoundedSemaphore(workers + cola)
+        self.rechazadas = 0
+
+    def hash(self, password):
+        return generate_password_hash(password, method=self.metodo)
+
+    def necesita_rehash(self, password_hash):
+        """True si el hash se generó con otro algoritmo o coste."""
+        return password_hash.split('$', 1)[0] != self.metodo
+
+    def verificar(self, password_hash, password):
+        """Verifica la contraseña en el ejecutor. Lanza VerificacionSaturada si está lleno."""
+        if not self._plazas.acquire(blocking=False):
+            self.rechazadas += 1
+            raise VerificacionSaturada()
+        try:
+            futuro = self._ejecutor.submit(check_password_hash, password_hash, password)
+        except BaseException:
+            self._plazas.release()
+            raise
+        futuro.add_done_callback(lambda _: self._plazas.release())
+        return futuro.result()
+
+    def stats(self):
+        return {'metodo': self.metodo, 'workers': self.workers, 'rechazadas': self.rechazadas}
+
+password_hasher = PasswordHasher()
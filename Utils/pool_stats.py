@@ -0,0 +1,126 @@
+"""
+Telemetría del pool de conexiones de SQLAlchemy.
+
+Los eventos del pool (connect, checkout, checkin, invalidate) llevan la cuenta
+de conexiones creadas, prestadas y en uso. La espera para obtener una conexión
+y los timeouts no tienen evento propio, así que se miden en QueuePoolInstrumentado,
+un QueuePool que cronometra cada préstamo. Con estos datos se dimensiona
+DB_POOL_SIZE / DB_MAX_OVERFLOW por worker.
+"""
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+class EstadisticasPool:
+    """Contadores de uso de un pool, compartidos por todos los hilos del proceso."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.conexiones_creadas = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidadas = 0
+        self.en_uso = 0
+        self.max_en_uso = 0
+        self.esperas = 0
+        self.tiempo_espera_total = 0.0
+        self.tiempo_espera_max = 0.0
+        self.timeouts = 0
+
+    def registrar_conexion(self, *args):
+        with self._lock:
+            self.conexiones_creadas += 1
+
+    def registrar_checkout(self, *args):
+        with self._lock:
+            self.checkouts += 1
+            self.en_uso += 1
+            self.max_en_uso = max(self.max_en_uso, self.en_uso)
+
+    def registrar_checkin(self, *args):
+        with self._lock:
+            self.checkins += 1
+            self.en_uso = max(0, self.en_uso - 1)
+
+    def registrar_invalidacion(self, *args):
+        with self._lock:
+            self.invalidadas += 1
+
+    def registrar_espera(self, segundos, timeout=False):
+        with self._lock:
+            self.esperas += 1
+            self.tiempo_espera_total += segundos
+            self.tiempo_espera_max = max(self.tiempo_espera_max, segundos)
+            if timeout:
+                self.timeouts += 1
+
+    def stats(self, pool=None):
+        """Retorna los contadores y, si se pasa el pool, su estado actual."""
+        with self._lock:
+            datos = {
+                'conexiones_creadas': self.conexiones_creadas,
+                'checkouts': self.checkouts,
+                'checkins': self.checkins,
+                'invalidadas': self.invalidadas,
+                'en_uso': self.en_uso,
+                'max_en_uso': self.max_en_uso,
+                'timeouts': self.timeouts,
+                'espera_media_ms': round(self.tiempo_espera_total / self.esperas * 1000, 3) if self.esperas else 0.0,
+                'espera_max_ms': round(self.tiempo_espera_max * 1000, 3)
+            }
+        if isinstance(pool, QueuePool):
+            datos.update({
+                'tipo': type(pool).__name__,
+                'tamano': pool.size(),
+                'prestadas': pool.checkedout(),
+                'disponibles': pool.checkedin(),
+                'overflow': pool.overflow()
+            })
+        elif pool is not None:
+            datos['tipo'] = type(pool).__name__
+        return datos
+
+class QueuePoolInstrumentado(QueuePool):
+    """QueuePool que mide cuánto se espera por cada conexión y cuántas esperas agotan el timeout."""
+
+    estadisticas = None
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexion = super()._do_get()
+        except PoolTimeoutError:
+            if self.estadisticas is not None:
+                self.estadisticas.registrar_espera(time.perf_counter() - inicio, timeout=True)
+            raise
+        if self.estadisticas is not None:
+            self.estadisticas.registrar_espera(time.perf_counter() - inicio)
+        return conexion
+
+    def recreate(self):
+        # Tras engine.dispose() el pool nuevo sigue sumando en los mismos contadores
+        nuevo = super().recreate()
+        nuevo.estadisticas = self.estadisticas
+        return nuevo
+
+def instrumentar_engine(engine):
+    """Registra los eventos del pool del engine (una sola vez) y retorna sus estadísticas."""
+    estadisticas = getattr(engine, 'estadisticas_pool', None)
+    if estadisticas is not None:
+        return estadisticas
+    estadisticas = EstadisticasPool()
+    engine.estadisticas_pool = estadisticas
+    if isinstance(engine.pool, QueuePoolInstrumentado):
+        engine.pool.estadisticas = estadisticas
+    event.listen(engine, 'connect', estadisticas.registrar_conexion)
+    event.listen(engine, 'checkout', estadisticas.registrar_checkout)
+    event.listen(engine, 'checkin', estadisticas.registrar_checkin)
+    event.listen(engine, 'invalidate', estadisticas.registrar_invalidacion)
+    return estadisticas
+
+def estadisticas_pool(engine):
+    """Estadísticas del pool de un engine instrumentado."""
+    estadisticas = getattr(engine, 'estadisticas_pool', None) or instrumentar_engine(engine)
+    return estadisticas.stats(engine.pool)
@@ -0,0 +1,181 @@
+"""
+Limitador de intentos de login con token buckets, por email y por IP.
+
+Cada clave tiene un bucket de `rafaga` intentos que recupera uno cada
+`intervalo` segundos. Un bucket que ha vuelto a llenarse equivale a no tener
+bucket, así que se borra: el estado ocupa memoria solo por las claves activas.
+
+- MemoryRateLimiter: OrderedDict del proceso ordenado por último uso; los
+  buckets llenos se purgan desde el principio en cada intento (O(1) amortizado).
+- SQLiteRateLimiter: tabla en un archivo SQLite local compartido por todos los
+  workers de la máquina; cada intento es una transacción BEGIN IMMEDIATE.
+"""
+import math
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from Config.ratelimit import (
+    LOGIN_RATE_STORE, LOGIN_RATE_SQLITE_PATH, LOGIN_RATE_MAX_KEYS,
+    LOGIN_RATE_EMAIL_BURST, LOGIN_RATE_EMAIL_INTERVAL, LOGIN_RATE_IP_BURST, LOGIN_RATE_IP_INTERVAL
+)
+
+class Regla:
+    """Tamaño de ráfaga e intervalo de recarga de un tipo de clave."""
+
+    def __init__(self, rafaga, intervalo):
+        self.rafaga = rafaga
+        self.intervalo = intervalo
+
+    def recargar(self, tokens, actualizado, ahora):
+        """Tokens disponibles tras recargar desde `actualizado` hasta `ahora`."""
+        return min(self.rafaga, tokens + (ahora - actualizado) / self.intervalo)
+
+    def segundos_hasta_lleno(self, tokens):
+        return (self.rafaga - tokens) * self.intervalo
+
+REGLAS_LOGIN = {
+    'email': Regla(LOGIN_RATE_EMAIL_BURST, LOGIN_RATE_EMAIL_INTERVAL),
+    'ip': Regla(LOGIN_RATE_IP_BURST, LOGIN_RATE_IP_INTERVAL),
+}
+
+class MemoryRateLimiter:
+    """Buckets en memoria del proceso (clave -> (tokens, actualizado, lleno_en))."""
+
+    def __init__(self, reglas=REGLAS_LOGIN, max_claves=LOGIN_RATE_MAX_KEYS, reloj=time.monotonic):
+        self.reglas = reglas
+        self.max_claves = max_claves
+        self._reloj = reloj
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._buckets = OrderedDict()
+        self.rechazados = 0
+
+    def intentar(self, claves):
+        """
+        Consume un intento de cada clave ((tipo, valor), ...). Retorna 0 si se
+        permite o los segundos que faltan para que todas tengan un intento.
+        """
+        ahora = self._reloj()
+        with self._lock:
+            self._purgar(ahora)
+            estados = []
+            espera = 0.0
+            for clave in claves:
+                regla = self.reglas[clave[0]]
+                tokens, actualizado, _ = self._buckets.get(clave, (regla.rafaga, ahora, ahora))
+                tokens = regla.recargar(tokens, actualizado, ahora)
+                if tokens < 1:
+                    espera = max(espera, (1 - tokens) * regla.intervalo)
+                estados.append((clave, regla, tokens))
+            if espera:
+                self.rechazados += 1
+                return espera
+            for clave, regla, tokens in estados:
+                tokens -= 1
+                self._buckets[clave] = (tokens, ahora, ahora + regla.segundos_hasta_lleno(tokens))
+                self._buckets.move_to_end(clave)
+            while len(self._buckets) > self.max_claves:
+                self._buckets.popitem(last=False)
+            return 0
+
+    def _purgar(self, ahora):
+        # Ordenados por último uso: se borra desde el más antiguo hasta el primero
+        # que aún no se ha llenado. Los que quedan detrás se usaron hace menos de
+        # un periodo de recarga completo, así que el tamaño sigue siendo O(claves activas)
+        while self._buckets:
+            clave, (_, _, lleno_en) = next(iter(self._buckets.items()))
+            if lleno_en > ahora:
+                break
+            del self._buckets[clave]
+
+    def stats(self):
+        return {'tipo': 'memory', 'claves_activas': len(self._buckets), 'rechazados': self.rechazados}
+
+class SQLiteRateLimiter:
+    """Buckets en una tabla SQLite compartida por los workers de la máquina."""
+
+    def __init__(self, ruta=LOGIN_RATE_SQLITE_PATH, reglas=REGLAS_LOGIN, intervalo_purga=60, reloj=time.time):
+        self.ruta = ruta
+        self.reglas = reglas
+        self.intervalo_purga = intervalo_purga
+        self._reloj = reloj
+        self._local = threading.local()
+        self._proxima_purga = 0.0
+        self.rechazados = 0
+        with self._conexion() as conexion:
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS buckets_login ("
+                "clave TEXT PRIMARY KEY, tokens REAL NOT NULL, actualizado REAL NOT NULL, lleno_en REAL NOT NULL)"
+            )
+            conexion.execute("CREATE INDEX IF NOT EXISTS ix_buckets_login_lleno_en ON buckets_login (lleno_en)")
+
+    def _conexion(self):
+        # Una conexión por hilo; las transacciones se abren a mano (isolation_level=None)
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            conexion = sqlite3.connect(self.ruta, timeout=5, isolation_level=None)
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA synchronous=NORMAL")
+            self._local.conexion = conexion
+        return conexion
+
+    def reset(self):
+        self._conexion().execute("DELETE FROM buckets_login")
+        self.rechazados = 0
+
+    def intentar(self, claves):
+        """Igual que MemoryRateLimiter.intentar, en una transacción compartida."""
+        ahora = self._reloj()
+        conexion = self._conexion()
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            if ahora >= self._proxima_purga:
+                self._proxima_purga = ahora + self.intervalo_purga
+                conexion.execute("DELETE FROM buckets_login WHERE lleno_en <= ?", (ahora,))
+            estados = []
+            espera = 0.0
+            for tipo, valor in claves:
+                regla = self.reglas[tipo]
+                clave = f"{tipo}:{valor}"
+                fila = conexion.execute(
+                    "SELECT tokens, actualizado FROM buckets_login WHERE clave = ?", (clave,)
+                ).fetchone()
+                tokens = regla.recargar(*fila, ahora) if fila else regla.rafaga
+                if tokens < 1:
+                    espera = max(espera, (1 - tokens) * regla.intervalo)
+                estados.append((clave, regla, tokens))
+            if not espera:
+                conexion.executemany(
+                    "INSERT OR REPLACE INTO buckets_login (clave, tokens, actualizado, lleno_en) VALUES (?, ?, ?, ?)",
+                    [(clave, tokens - 1, ahora, ahora + regla.segundos_hasta_lleno(tokens - 1))
+                     for clave, regla, tokens in estados]
+                )
+            conexion.execute("COMMIT")
+        except BaseException:
+            conexion.execute("ROLLBACK")
+            raise
+        if espera:
+            self.rechazados += 1
+        return espera
+
+    def stats(self):
+        claves = self._conexion().execute(
+            "SELECT COUNT(*) FROM buckets_login WHERE lleno_en > ?", (self._reloj(),)
+        ).fetchone()[0]
+        return {'tipo': 'sqlite', 'claves_activas': claves, 'rechazados': self.rechazados}
+
+def crear_rate_limiter(tipo=LOGIN_RATE_STORE):
+    """Crea el limitador configurado en LOGIN_RATE_STORE ('memory' o 'sqlite')."""
+    if tipo == 'memory':
+        return MemoryRateLimiter()
+    if tipo == 'sqlite':
+        return SQLiteRateLimiter()
+    raise ValueError(f"LOGIN_RATE_STORE no válido: {tipo}")
+
+def segundos_retry_after(espera):
+    """Valor entero para la cabecera Retry-After (nunca 0)."""
+    return max(1, math.ceil(espera))
@@ -0,0 +1,176 @@
+"""
+Almacenes de tokens revocados para el logout.
+
+- MemoryRevocationStore: diccionario en memoria (un solo proceso, se pierde al reiniciar).
+- SQLRevocationStore: tabla `tokens_revocados` compartida por todos los workers,
+  con purga de los tokens ya expirados.
+
+El almacén SQL tiene delante un filtro de Bloom en memoria: la respuesta
+habitual ("este token no está revocado") se da sin ninguna consulta. Solo los
+jti que el filtro marca como posibles se confirman contra la BD. Cada worker
+incorpora al filtro las revocaciones de los demás como mucho cada
+REVOCATION_SYNC_SECONDS.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from Config.DataBase import db
+from Config.jwt import (
+    REVOCATION_STORE, REVOCATION_SYNC_SECONDS, REVOCATION_PURGE_SECONDS, REVOCATION_BLOOM_CAPACITY
+)
+from Models.TokenRevocado import TokenRevocado
+
+_tabla = TokenRevocado.__table__
+
+class BloomFilter:
+    """Filtro de Bloom: sin falsos negativos y con una tasa de falsos positivos acotada."""
+
+    def __init__(self, capacidad=100000, tasa_error=0.001):
+        self.num_bits = max(8, math.ceil(-capacidad * math.log(tasa_error) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacidad * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._lock = threading.Lock()
+
+    def _posiciones(self, clave):
+        digest = hashlib.blake2b(clave.encode(), digest_size=16).digest()
+        a = int.from_bytes(digest[:8], 'little')
+        b = int.from_bytes(digest[8:], 'little') | 1
+        return [(a + i * b) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, clave):
+        with self._lock:
+            for posicion in self._posiciones(clave):
+                self._bits[posicion >> 3] |= 1 << (posicion & 7)
+
+    def __contains__(self, clave):
+        bits = self._bits
+        return all(bits[posicion >> 3] & (1 << (posicion & 7)) for posicion in self._posiciones(clave))
+
+class MemoryRevocationStore:
+    """Tokens revocados en memoria del proceso (jti -> expiración)."""
+
+    def __init__(self, intervalo_purga=REVOCATION_PURGE_SECONDS):
+        self.intervalo_purga = intervalo_purga
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Olvida todas las revocaciones."""
+        with self._lock:
+            self._revocados = {}
+            self._proxima_purga = time.monotonic() + self.intervalo_purga
+
+    def revocar(self, jti, exp):
+        with self._lock:
+            self._revocados[jti] = exp
+            # Recorrer el diccionario en cada logout sería O(n) bajo el lock
+            if time.monotonic() >= self._proxima_purga:
+                self._proxima_purga = time.monotonic() + self.intervalo_purga
+                self._purgar(datetime.utcnow())
+
+    def esta_revocado(self, jti):
+        return jti in self._revocados
+
+    def _purgar(self, ahora):
+        for jti in [jti for jti, exp in self._revocados.items() if exp <= ahora]:
+            del self._revocados[jti]
+
+    def stats(self):
+        return {'tipo': 'memory', 'revocados': len(self._revocados)}
+
+class SQLRevocationStore:
+    """Tokens revocados en la tabla `tokens_revocados`, con filtro de Bloom delante."""
+
+    def __init__(self, intervalo_sync=REVOCATION_SYNC_SECONDS, intervalo_purga=REVOCATION_PURGE_SECONDS,
+                 capacidad=REVOCATION_BLOOM_CAPACITY):
+        self.intervalo_sync = intervalo_sync
+        self.intervalo_purga = intervalo_purga
+        self.capacidad = capacidad
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Vacía el filtro y fuerza una recarga completa en la próxima consulta."""
+        with self._lock:
+            self._bloom = BloomFilter(self.capacidad)
+            self._proxima_sync = 0.0
+            self._sincronizado_hasta = None
+            self._proxima_purga = time.monotonic() + self.intervalo_purga
+        self.consultas_evitadas = 0
+        self.consultas_bd = 0
+
+    def revocar(self, jti, exp):
+        db.session.add(TokenRevocado(jti=jti, exp=exp))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # Dos logouts simultáneos con el mismo token: ya está revocado
+            db.session.rollback()
+            if db.session.execute(select(_tabla.c.jti).where(_tabla.c.jti == jti)).first() is None:
+                raise
+        self._bloom.add(jti)
+        self._purgar_si_toca()
+
+    def esta_revocado(self, jti):
+        self._sincronizar_si_toca()
+        if jti not in self._bloom:
+            self.consultas_evitadas += 1
+            return False
+        self.consultas_bd += 1
+        return db.session.execute(
+            select(_tabla.c.jti).where(_tabla.c.jti == jti, _tabla.c.exp > datetime.utcnow())
+        ).first() is not None
+
+    def _sincronizar_si_toca(self):
+        """Añade al filtro los jti revocados por otros workers desde la última sincronización."""
+        ahora = time.monotonic()
+        if ahora < self._proxima_sync:
+            return
+        with self._lock:
+            if ahora < self._proxima_sync:
+                return
+            self._proxima_sync = ahora + self.intervalo_sync
+            desde = self._sincronizado_hasta
+            self._sincronizado_hasta = datetime.utcnow()
+
+        consulta = select(_tabla.c.jti).where(_tabla.c.exp > datetime.utcnow())
+        if desde is not None:
+            # Margen para cubrir relojes desfasados entre workers
+            consulta = consulta.where(_tabla.c.revocado >= desde - timedelta(seconds=self.intervalo_sync))
+        for (jti,) in db.session.execute(consulta):
+            self._bloom.add(jti)
+
+    def _purgar_si_toca(self):
+        """Borra los tokens ya expirados y reconstruye el filtro sin ellos."""
+        if time.monotonic() < self._proxima_purga:
+            return
+        self._proxima_purga = time.monotonic() + self.intervalo_purga
+        db.session.execute(_tabla.delete().where(_tabla.c.exp <= datetime.utcnow()))
+        db.session.commit()
+        # El filtro nuevo se llena antes de sustituir al actual para que ninguna
+        # consulta concurrente vea un filtro vacío
+        bloom = BloomFilter(self.capacidad)
+        for (jti,) in db.session.execute(select(_tabla.c.jti)):
+            bloom.add(jti)
+        self._bloom = bloom
+        # Recoger en la próxima consulta lo revocado mientras se reconstruía
+        self._proxima_sync = 0.0
+
+    def stats(self):
+        return {
+            'tipo': 'sql',
+            'consultas_evitadas': self.consultas_evitadas,
+            'consultas_bd': self.consultas_bd
+        }
+
+def crear_revocation_store(tipo=REVOCATION_STORE):
+    """Crea el almacén configurado en REVOCATION_STORE ('sql' o 'memory')."""
+    if tipo == 'memory':
+        return MemoryRevocationStore()
+    if tipo == 'sql':
+        return SQLRevocationStore()
+    raise ValueError(f"REVOCATION_STORE no válido: {tipo}")
@@ -0,0 +1,55 @@
+"""
+Serialización JSON incremental para respuestas grandes.
+
+En lugar de construir la lista completa de diccionarios y codificarla de una
+vez, se emite el documento por trozos mientras se leen las filas de la BD:
+la memoria queda acotada por el tamaño de lote y el primer byte sale antes de
+leer la última fila.
+"""
+from flask import Response, current_app, stream_with_context
+
+def generar_json_lista(envoltorio, clave, items, clave_total=None, tam_lote=1000):
+    """
+    Genera el JSON de `envoltorio` con `clave` -> lista de `items` por trozos.
+    Si se indica `clave_total`, se añade el número de elementos emitidos (no
+    se conoce hasta terminar de recorrer las filas, así que debe ir después
+    de la lista). Con sort_keys las claves salen ordenadas como en jsonify,
+    de modo que el documento es idéntico al de la respuesta sin streaming.
+    """
+    proveedor = current_app.json
+    
+    def dumps(valor):
+        # Mismo formato compacto que jsonify en producción
+        return proveedor.dumps(valor, separators=(',', ':'))
+    
+    claves = [*envoltorio, clave] + ([clave_total] if clave_total else [])
+    if getattr(proveedor, 'sort_keys', False):
+        claves.sort()
+    posicion = claves.index(clave)
+    if clave_total and claves.index(clave_total) < posicion:
+        raise ValueError(f"'{clave_total}' debe ir después de '{clave}' en el documento")
+    
+    def miembro(k, total=None):
+        return f'{dumps(k)}:{total if k == clave_total else dumps(envoltorio[k])}'
+    
+    yield '{' + ''.join(miembro(k) + ',' for k in claves[:posicion]) + f'{dumps(clave)}:['
+    
+    total = 0
+    lote = []
+    for item in items:
+        lote.append(dumps(item))
+        total += 1
+        if len(lote) >= tam_lote:
+            yield (',' if total > len(lote) else '') + ','.join(lote)
+            lote = []
+    if lote:
+        yield (',' if total > len(lote) else '') + ','.join(lote)
+    
+    yield ']' + ''.join(',' + miembro(k, total) for k in claves[posicion + 1:]) + '}\n'
+
+def respuesta_json_stream(envoltorio, clave, items, clave_total=None, tam_lote=1000):
+    """Respuesta Flask que emite `generar_json_lista` manteniendo el contexto de la petición."""
+    return Response(
+        stream_with_context(generar_json_lista(envoltorio, clave, items, clave_total, tam_lote)),
+        mimetype='application/json'
+    )
@@ -0,0 +1,24 @@
+"""
+Normalización de textos para búsquedas y filtros: sin acentos, sin
+mayúsculas y sin espacios sobrantes ("Psíquico " -> "psiquico").
+"""
+import re
+import unicodedata
+
+def normalizar(texto):
+    """Texto en minúsculas y sin marcas diacríticas."""
+    descompuesto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).casefold().strip()
+
+def tipos_normalizados(tipo):
+    """
+    Tipos individuales de un tipo combinado ("Fuego/Volador" -> ['fuego', 'volador']),
+    normalizados, sin repetir y en el orden original.
+    """
+    return list(dict.fromkeys(
+        parte for parte in (normalizar(p) for p in re.split(r'[/,]', tipo or '')) if parte
+    ))
+
+def terminos_busqueda(consulta, maximo=8):
+    """Palabras normalizadas de una búsqueda libre ("Fuego, ¡Volador!" -> ['fuego', 'volador'])."""
+    return list(dict.fromkeys(re.findall(r'\w+', normalizar(consulta or ''))))[:maximo]
@@ -0,0 +1,25 @@
+"""
+Acciones diferidas hasta el commit de la sesión.
+
+Los eventos de mapper (after_update, after_delete...) se ejecutan durante el
+flush, antes del commit. Lo que otras peticiones pueden ver (cachés y
+registros en memoria del proceso) solo debe cambiar cuando la transacción se
+confirma, y no debe cambiar si se deshace.
+"""
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_CLAVE = 'tras_commit'
+
+def tras_commit(session, accion, *args):
+    """Ejecuta accion(*args) tras el próximo commit de `session`; se descarta si hay rollback."""
+    session.info.setdefault(_CLAVE, []).append((accion, args))
+
+@event.listens_for(Session, 'after_commit')
+def _ejecutar_pendientes(session):
+    for accion, args in session.info.pop(_CLAVE, ()):
+        accion(*args)
+
+@event.listens_for(Session, 'after_rollback')
+def _descartar_pendientes(session):
+    session.info.pop(_CLAVE, None)
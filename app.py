@@ -1,21 +1,20 @@
+import click
 from flask import Flask, jsonify
 from flask_jwt_extended import JWTManager
-from Config.DataBase import init_db
+from Config.DataBase import init_db, crear_esquema
 from Config.jwt import init_jwt
+from Config.json_provider import JSON_PROVIDER
+from Utils.json_provider import crear_json_provider
+from Utils.authz import verificar_epoch_token, token_obsoleto
+from Utils.compresion import init_compresion
+from Utils.metricas import init_metricas
+from Utils.auditoria_sql import init_auditoria_sql
 from Controllers.PokemonController import pokemon_blueprint
-from Controllers.AuthController import auth_blueprint
-
-app = Flask(__name__)
-
-# Inicializar JWT
-init_jwt(app)
-jwt = JWTManager(app)
-
-# Inicializar la base de datos
-init_db(app)
+from Controllers.AuthController import auth_blueprint, token_revocado
+from Controllers.SistemaController import sistema_blueprint
+from Controllers.MetricasController import metricas_blueprint
 
 # Ruta de bienvenida
-@app.route('/')
 def welcome():
     return jsonify({
         "mensaje": "¡Bienvenido a la API de Pokémon con Sistema de Roles! 🎓",
@@ -29,11 +28,18 @@ def welcome():
             "POST /auth/logout": "Cerrar sesión",
             # Rutas de Pokémon
             "GET /api/pokemon": "Obtener pokémons (según rol)",
+            "GET /api/pokemon/stats": "Estadísticas agregadas del catálogo o de la colección (según rol)",
+            "GET /api/pokemon/search?q=": "Búsqueda de texto en nombre y descripción (según rol)",
             "GET /api/pokemon/<id>": "Obtener un pokémon específico",
             "POST /api/pokemon": "Crear pokémon (SOLO PROFESOR)",
+            "POST /api/pokemon/bulk": "Crear pokémons en bloque, array JSON o NDJSON (SOLO PROFESOR)",
             "PUT /api/pokemon/<id>": "Actualizar pokémon (SOLO PROFESOR)",
             "DELETE /api/pokemon/<id>": "Eliminar pokémon (según rol)",
-            "POST /api/pokemon/<id>/asignar": "Asignar pokémon a trainer (SOLO PROFESOR)"
+            "POST /api/pokemon/<id>/asignar": "Asignar pokémon a trainer (SOLO PROFESOR)",
+            "POST /api/pokemon/asignar": "Asignar pokémons a trainers en lote (SOLO PROFESOR)",
+            # Rutas de Sistema
+            "GET /sistema/estadisticas": "Estadísticas internas del proceso (SOLO PROFESOR)",
+            "GET /metrics": "Métricas de latencia, estados y consultas SQL en formato Prometheus"
         },
         "roles": {
             "profesor": {
@@ -99,9 +105,71 @@ def welcome():
         }
     }), 200
 
-# Registrar los blueprints
-app.register_blueprint(auth_blueprint, url_prefix='/auth')
-app.register_blueprint(pokemon_blueprint, url_prefix='/api')
+def create_app(config=None):
+    """
+    Crea y configura la aplicación.
+    `config` sobrescribe valores de configuración (p. ej. SQLALCHEMY_DATABASE_URI
+    en pruebas, que evita elegir backend). Las tablas no se crean aquí: ver
+    crear_esquema() o `flask --app app init-db`.
+    """
+    app = Flask(__name__)
+    app.json = crear_json_provider(app, JSON_PROVIDER)
+    if config:
+        app.config.update(config)
+    
+    # Métricas de peticiones y consultas SQL (primero: mide también los demás hooks)
+    init_metricas(app)
+    
+    # Auditoría de SQL por petición: presupuestos por ruta y N+1 (SQL_AUDIT=log)
+    init_auditoria_sql(app)
+    
+    # Inicializar JWT
+    init_jwt(app)
+    jwt = JWTManager(app)
+    jwt.token_verification_loader(verificar_epoch_token)
+    jwt.token_verification_failed_loader(token_obsoleto)
+    jwt.token_in_blocklist_loader(token_revocado)
+    
+    # Inicializar la base de datos
+    init_db(app)
+    
+    # Compresión de respuestas según Accept-Encoding
+    init_compresion(app)
+    
+    app.add_url_rule('/', 'welcome', welcome)
+    
+    # Registrar los blueprints
+    app.register_blueprint(auth_blueprint, url_prefix='/auth')
+    app.register_blueprint(pokemon_blueprint, url_prefix='/api')
+    app.register_blueprint(sistema_blueprint, url_prefix='/sistema')
+    app.register_blueprint(metricas_blueprint)
+    
+    @app.cli.command('init-db')
+    def init_db_command():
+        """Crea las tablas que falten en la base de datos."""
+        crear_esquema(app)
+        click.echo('✓ Esquema creado')
+    
+    @app.cli.command('reindex-tipos')
+    def reindex_tipos_command():
+        """Regenera la tabla pokemon_tipo (filtro por tipo) desde pokemon.tipo."""
+        from Services.PokemonService import PokemonService
+        total = PokemonService().reconstruir_tipos()
+        click.echo(f'✓ Tipos regenerados para {total} pokémons')
+    
+    @app.cli.command('reindex-busqueda')
+    def reindex_busqueda_command():
+        """Crea o reconstruye el índice de texto completo (FTS5 / FULLTEXT)."""
+        from Services.PokemonService import PokemonService
+        indice = PokemonService().reconstruir_indice_busqueda()
+        click.echo(f'✓ Índice {indice} reconstruido' if indice else
+                   '⚠ Este backend no tiene índice de texto completo (se usa LIKE)')
+    
+    return app
+
+# Instancia por defecto (python app.py, gunicorn app:app, from app import app)
+app = create_app()
 
 if __name__ == '__main__':
-    app.run(debug=True)
\ No newline at end of file
+    crear_esquema(app)
+    app.run(debug=True)
@@ -5,18 +5,18 @@ Crea un profesor y un entrenador de ejemplo.
 Ejecutar: python init_users.py
 """
 from app import app
-from Config.DataBase import db
+from Config.DataBase import db, crear_esquema
 from Models.Usuario import Usuario
 
 def init_usuarios_prueba():
     """Crea usuarios de prueba si no existen."""
+    # Crear tablas si no existen (paso explícito, la app ya no lo hace al arrancar)
+    crear_esquema(app)
+    
     with app.app_context():
         print("=" * 60)
         print("🔧 INICIALIZANDO USUARIOS DE PRUEBA")
         print("=" * 60)
-        
-        # Crear tablas si no existen
-        db.create_all()
         print("\n✓ Tablas de base de datos verificadas\n")
         
         # Usuario 1: Profesor